@@ -0,0 +1,226 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter, sleep
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import ValidationError
+
+from src.agents.output_repair import get_output_repair_stats
+from src.utils.image_utils import ChartImage
+
+PRICE_DATA = {
+    "datetime": "2024-01-01 09:00:00",
+    "open": 3000.0,
+    "high": 3100.0,
+    "low": 2950.0,
+    "close": 3050.0,
+    "volume": 1200.0,
+}
+
+# (표 이름, LLM_OUTPUT_SCHEMA, 스텁이 minimum/maximum을 따르는지)
+# - unbounded: format에 fraction 범위가 없던 때 (비교 기준)
+# - plain/strict: 같은 범위가 $defs 안에 있느냐, 펼쳐져 있느냐의 차이
+SCENARIOS = (
+    ("unbounded", "plain", False),
+    ("plain", "plain", True),
+    ("strict", "strict", True),
+)
+
+
+class StubDecoder:
+    """
+    Ollama /api/chat 스텁이 쓰는 가짜 디코더
+    - 요청의 format 스키마를 llama.cpp처럼 따라감 ($ref는 로컬 $defs에서 찾아 그대로 적용)
+    - enum, minimum/maximum이 스키마에 있으면 항상 지킴 (생성 단계에서 막힘)
+    - 스키마에 범위가 없는 숫자는 모델이 error_rate 확률로 0~100 스케일로 생성
+    - bounds=False면 minimum/maximum을 보지 않음
+      (fraction 필드에 Field(ge=, le=)가 없어 format에 범위가 실리지 않던 때)
+    """
+
+    def __init__(self, error_rate: float, seed: int, bounds: bool = True):
+        self.error_rate = error_rate
+        self.bounds = bounds
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def generate(self, schema: Dict[str, Any]) -> str:
+        with self._lock:
+            value = self._sample(schema, schema.get("$defs", {}))
+        return json.dumps(value, ensure_ascii=False)
+
+    def _sample(self, node: Dict[str, Any], defs: Dict[str, Any]):
+        if "$ref" in node:
+            return self._sample(defs[node["$ref"].rsplit("/", 1)[-1]], defs)
+        if node.get("type") == "object":
+            return {
+                key: self._sample(value, defs)
+                for key, value in node["properties"].items()
+            }
+        if "enum" in node:
+            return self._random.choice(node["enum"])
+        if node.get("type") == "number":
+            bounded = self.bounds and "minimum" in node and "maximum" in node
+            if not bounded and self._random.random() < self.error_rate:
+                return float(self._random.randint(2, 100))
+            return round(self._random.random(), 2)
+        return "stub thoughts"
+
+
+def start_stub_server(decoder: StubDecoder, latency: float) -> tuple:
+    """(host, 요청 수 dict) 반환, 요청마다 latency초 대기"""
+    stats = {"requests": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def do_POST(self) -> None:
+            length = int(self.headers["Content-Length"])
+            body = json.loads(self.rfile.read(length))
+            stats["requests"] += 1
+            sleep(latency)
+            schema = body.get("format")
+            content = decoder.generate(schema) if isinstance(schema, dict) else "{}"
+            out = json.dumps(
+                {
+                    "model": body["model"],
+                    "created_at": "2024-01-01T00:00:00Z",
+                    "message": {"role": "assistant", "content": content},
+                    "done": True,
+                    "done_reason": "stop",
+                    "prompt_eval_count": 1,
+                    "eval_count": 1,
+                }
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(out)))
+            self.end_headers()
+            self.wfile.write(out)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}", stats
+
+
+async def _bench_agent(
+    name: str, decide: Callable[[], Any], decisions: int, stub_stats: Dict
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    failed = 0
+    requests = stub_stats["requests"]
+    for _ in range(decisions):
+        start = perf_counter()
+        try:
+            # 에이전트의 보정/재시도 로그는 표에 모아서 보여줌
+            with contextlib.redirect_stdout(io.StringIO()):
+                await decide()
+        except ValidationError:
+            # 재시도 루프가 없는 에이전트(TrendAnalyzer)는 검증 실패가 그대로 올라옴
+            failed += 1
+        latencies.append(perf_counter() - start)
+    stats = get_output_repair_stats().stats().get(name, {})
+    return {
+        "agent": name,
+        "decisions": decisions,
+        "requests": stub_stats["requests"] - requests,
+        "retry_rate": stats.get("retries", 0) / decisions,
+        "repaired": stats.get("repaired", 0),
+        "fallbacks": stats.get("fallbacks", 0),
+        "failed": failed,
+        "mean_ms": 1000 * float(np.mean(latencies)),
+        "p95_ms": 1000 * float(np.percentile(latencies, 95)),
+    }
+
+
+async def run_benchmark(
+    decisions: int, error_rate: float, latency: float, seed: int
+) -> pd.DataFrame:
+    # 에이전트 모듈은 환경 변수를 지정한 뒤 불러옴
+    from src.agents.client_pool import get_model_client_registry
+    from src.agents.macro.investment_rate_adjuster import InvestmentRateAdjuster
+    from src.agents.macro.trend_analyzer import TrendAnalyzer
+    from src.agents.micro.order_tactician import OrderTactician
+    from src.agents.micro.pulse_detector import PulseDetector
+    from src.portfoilo_manager import PortfolioManager
+
+    chart = ChartImage(rgba=np.zeros((64, 64, 4), dtype=np.uint8))
+    trend_report = {"trend": "상승장", "confidence": 0.5, "reason": ""}
+    macro_report = {
+        "trend_report": trend_report,
+        "limit_report": {"rate_limit": 0.5, "reason": ""},
+    }
+    pulse_report = {"pulse": "상승 돌파", "strength": 0.5, "reason": ""}
+
+    rows = []
+    for label, mode, bounds in SCENARIOS:
+        os.environ["LLM_OUTPUT_SCHEMA"] = mode
+        decoder = StubDecoder(error_rate, seed, bounds=bounds)
+        host, stub_stats = start_stub_server(decoder, latency)
+        os.environ["OLLAMA_HOST"] = host
+        get_output_repair_stats().clear()
+
+        trend_analyzer = TrendAnalyzer()
+        rate_adjuster = InvestmentRateAdjuster()
+        pulse_detector = PulseDetector()
+        order_tactician = OrderTactician()
+        agents = {
+            trend_analyzer.name: lambda: trend_analyzer.analyze(PRICE_DATA, chart),
+            rate_adjuster.name: lambda: rate_adjuster.adjust_rate_limit(
+                trend_report, PRICE_DATA
+            ),
+            pulse_detector.name: lambda: pulse_detector.detect(PRICE_DATA, chart),
+            order_tactician.name: lambda: order_tactician.decide(
+                macro_report, pulse_report
+            ),
+        }
+        portfolio = PortfolioManager("eth", 10_000_000)
+        portfolio.portfolio_ratio = {"cash": 0.6, "eth": 0.4}
+        with portfolio.activate():
+            for name, decide in agents.items():
+                row = await _bench_agent(name, decide, decisions, stub_stats)
+                rows.append({"schema": label, **row})
+        await get_model_client_registry().aclose()
+    return pd.DataFrame(rows)
+
+
+def main(argv: Optional[List[str]] = None) -> pd.DataFrame:
+    parser = argparse.ArgumentParser(
+        description="스텁 Ollama 서버로 출력 스키마별 재시도율·결정 지연 비교"
+    )
+    parser.add_argument("--decisions", type=int, default=200, help="에이전트별 결정 수")
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.1,
+        help="범위 제약이 없는 숫자를 스텁 모델이 틀리게 생성할 확률",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="스텁 요청 하나의 지연 (초)"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # 캐시를 거치지 않고 매번 스텁 서버를 호출
+    os.environ["LLM_CACHE_MODE"] = "off"
+    os.environ.pop("OLLAMA_HOSTS", None)
+    result = asyncio.run(
+        run_benchmark(args.decisions, args.error_rate, args.latency, args.seed)
+    )
+    print(result.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    return result
+
+
+if __name__ == "__main__":
+    main()
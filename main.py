@@ -1,24 +1,45 @@
+import argparse
 import json
 
-from src.trading_system import create_system
-
-
-def run_backtest(config: dict) -> dict:
-    app = create_system(**config)
-    return app.run()
+from src.backtest_runner import run_configs, summarize
 
 
 def main():
-    with open("config.json", "r", encoding="utf-8") as f:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="동시에 실행할 백테스트 수"
+    )
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=4,
+        help="모든 백테스트가 공유하는 LLM 동시 호출 수",
+    )
+    parser.add_argument("--results", default="data/results/backtest_results.jsonl")
+    parser.add_argument(
+        "--mode",
+        choices=["process", "loop"],
+        default="process",
+        help="process: 워커 프로세스별 실행 / loop: 이벤트 루프 하나에서 동시 실행",
+    )
+    args = parser.parse_args()
+
+    with open(args.config, "r", encoding="utf-8") as f:
         test_configs = json.load(f)
 
-    results = []
-    for cfg in test_configs:
-        perf = run_backtest(cfg)
-        results.append({**cfg, "performance": perf})
+    results = run_configs(
+        test_configs,
+        max_workers=args.workers,
+        llm_concurrency=args.llm_concurrency,
+        results_path=args.results,
+        mode=args.mode,
+    )
 
     print("==== All Results ====")
-    print(json.dumps(results, indent=2, ensure_ascii=False))
+    print(json.dumps(results, indent=2, ensure_ascii=False, default=float))
+    print("==== Summary ====")
+    print(summarize(results).to_string())
 
 
 if __name__ == "__main__":
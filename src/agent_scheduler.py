@@ -0,0 +1,81 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping
+
+
+class AgentScheduler:
+    """
+    - 틱별 에이전트 호출 의존성
+      1) price_data/chart(i) → TrendAnalyzer(i), PulseDetector(i): 포트폴리오와 무관
+      2) 1)의 결과 + 직전 틱까지의 포트폴리오 → InvestmentRateAdjuster / OrderTactician
+         → TradeExecutor
+    - 1)은 prefetch()로 앞으로 올 틱까지 미리 띄워 max_concurrency개까지 동시에 실행
+    - 2)는 TradingSystem이 result()를 기다린 뒤 틱 순서대로 실행
+    - max_concurrency=1이면 lookahead가 0이 되어 기존 순차 실행과 같은 순서
+    - completed()/restore()로 끝났지만 아직 쓰지 않은 결과를 체크포인트에 담아
+      재개 시 같은 호출을 다시 보내지 않음
+    """
+
+    def __init__(self, max_concurrency: int = 1, lookahead: int | None = None):
+        if max_concurrency < 1:
+            raise ValueError("[AgentScheduler] max_concurrency는 1 이상이어야 합니다.")
+        self.max_concurrency = max_concurrency
+        # 몇 틱 앞까지 미리 띄울지 (기본: 동시 실행 수의 2배, 순차 실행이면 0)
+        self.lookahead = (
+            lookahead
+            if lookahead is not None
+            else (0 if max_concurrency == 1 else 2 * max_concurrency)
+        )
+        self._semaphore: asyncio.Semaphore | None = None
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        # restore()로 되살린 결과 (작업 없이 바로 반환)
+        self._restored: Dict[Hashable, Any] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tasks or key in self._restored
+
+    def completed(self) -> Dict[Hashable, Any]:
+        """성공적으로 끝났지만 result()로 가져가지 않은 작업의 결과 (체크포인트용)"""
+        results = dict(self._restored)
+        for key, task in self._tasks.items():
+            if task.done() and not task.cancelled() and task.exception() is None:
+                results[key] = task.result()
+        return results
+
+    def restore(self, results: Mapping[Hashable, Any]) -> None:
+        """completed()로 저장한 결과를 끝난 작업처럼 등록 (같은 key는 예약하지 않음)"""
+        self._restored.update(results)
+
+    def prefetch(self, key: Hashable, job: Callable[[], Awaitable[Any]]) -> None:
+        """key 작업이 아직 없으면 job()을 동시 실행 한도 안에서 실행하도록 예약"""
+        if key in self:
+            return
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run():
+            async with self._semaphore:
+                return await job()
+
+        self._tasks[key] = asyncio.ensure_future(run())
+
+    async def result(
+        self, key: Hashable, job: Callable[[], Awaitable[Any]] | None = None
+    ) -> Any:
+        """key 작업의 결과 (예약되지 않았으면 job으로 바로 예약)"""
+        if key in self._restored:
+            return self._restored.pop(key)
+        if key not in self._tasks:
+            if job is None:
+                raise KeyError(f"[AgentScheduler] 예약되지 않은 작업입니다: {key}")
+            self.prefetch(key, job)
+        task = self._tasks.pop(key)
+        return await task
+
+    async def close(self) -> None:
+        """결과를 쓰지 않은 예약 작업 취소 (lookahead로 미리 띄운 마지막 틱 등)"""
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        self._restored.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Any, Callable, List
+
+
+class AgentPool:
+    """
+    - 같은 종류의 에이전트 인스턴스를 최대 size개까지 만들어 돌려 쓰는 풀
+    - AssistantAgent는 대화 상태를 가지므로 한 인스턴스에 동시 호출하면 안 됨
+    - pool.analyze(...)처럼 에이전트 메서드를 그대로 호출하면
+      비어 있는 인스턴스를 빌려 실행하고 반납
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 1):
+        if size < 1:
+            raise ValueError("[AgentPool] size는 1 이상이어야 합니다.")
+        self.factory = factory
+        self.size = size
+        self.agents: List[Any] = []
+        self._idle: "asyncio.Queue[Any] | None" = None
+
+    async def acquire(self) -> Any:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+        if self._idle.empty() and len(self.agents) < self.size:
+            agent = self.factory()
+            self.agents.append(agent)
+            return agent
+        return await self._idle.get()
+
+    def release(self, agent: Any) -> None:
+        self._idle.put_nowait(agent)
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            agent = await self.acquire()
+            try:
+                return await getattr(agent, name)(*args, **kwargs)
+            finally:
+                self.release(agent)
+
+        return call
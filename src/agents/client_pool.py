@@ -0,0 +1,313 @@
+import asyncio
+import contextlib
+import threading
+import weakref
+from os import getenv
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import httpx
+from autogen_core import CancellationToken
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelInfo,
+)
+from autogen_core.tools import Tool, ToolSchema
+from autogen_ext.models.ollama import OllamaChatCompletionClient
+from ollama import AsyncClient
+from pydantic import BaseModel
+
+from src.agents.client_wrapper import ChatCompletionClientWrapper
+from src.agents.llm_limiter import LLMConcurrencyLimiter
+from src.agents.llm_router import RoutedChatCompletionClient
+
+PROVIDERS = ("ollama",)
+
+
+def _env_float(name: str) -> Optional[float]:
+    value = getenv(name)
+    return float(value) if value else None
+
+
+def default_endpoint_options() -> Dict[str, Any]:
+    """
+    엔드포인트 설정 기본값 (환경 변수)
+    - LLM_ENDPOINT_CONCURRENCY: 엔드포인트 동시 요청 수 (기본 0 = 제한 없음)
+    - LLM_TIMEOUT: 요청 타임아웃 초 (기본 없음)
+    - LLM_MAX_CONNECTIONS: keep-alive 연결 풀 크기 (기본 16)
+    - LLM_KEEPALIVE_EXPIRY: 쉬는 연결을 유지할 초 (기본 60)
+    """
+    return {
+        "max_concurrency": int(getenv("LLM_ENDPOINT_CONCURRENCY", "0")),
+        "timeout": _env_float("LLM_TIMEOUT"),
+        "max_connections": int(getenv("LLM_MAX_CONNECTIONS", "16")),
+        "keepalive_expiry": float(getenv("LLM_KEEPALIVE_EXPIRY", "60")),
+    }
+
+
+def default_router_options() -> Dict[str, Any]:
+    """
+    라우터 설정 기본값 (환경 변수)
+    - LLM_HEDGE_PERCENTILE: 지연 시간이 이 분위를 넘기면 hedging (기본 0.95, off면 끔)
+    - LLM_HEDGE_MIN_SAMPLES: hedging 전에 모을 지연 시간 표본 수 (기본 20)
+    """
+    percentile = getenv("LLM_HEDGE_PERCENTILE", "0.95")
+    return {
+        "hedge_percentile": None if percentile in ("", "off") else float(percentile),
+        "min_samples": int(getenv("LLM_HEDGE_MIN_SAMPLES", "20")),
+    }
+
+
+def _ollama_client(
+    model: str, model_info: Optional[ModelInfo], host: Optional[str], options: Dict
+) -> ChatCompletionClient:
+    client = OllamaChatCompletionClient(model=model, host=host, model_info=model_info)
+    # autogen-ext는 ollama.AsyncClient에 host만 넘기고 클라이언트를 넘길 공개 인자가
+    # 없으므로 연결 풀/타임아웃을 지정한 클라이언트로 교체
+    # (requirements.txt의 autogen-ext 버전 기준, 내부 구조가 바뀌면 바로 실패)
+    if not isinstance(getattr(client, "_client", None), AsyncClient):
+        raise RuntimeError(
+            "[ModelClientRegistry] OllamaChatCompletionClient._client가 "
+            "ollama.AsyncClient가 아니라 연결 풀을 적용할 수 없습니다 "
+            "(autogen-ext 버전 확인)"
+        )
+    client._client = AsyncClient(
+        host=host,
+        timeout=options["timeout"],
+        limits=httpx.Limits(
+            max_connections=options["max_connections"],
+            max_keepalive_connections=options["max_connections"],
+            keepalive_expiry=options["keepalive_expiry"],
+        ),
+    )
+    return client
+
+
+class PooledChatCompletionClient(ChatCompletionClientWrapper):
+    """
+    (provider, model, endpoint)마다 하나씩, 모든 에이전트와 동시 실행이 공유하는 클라이언트
+    - 실제 HTTP 클라이언트(keep-alive 연결 풀)는 이벤트 루프마다 하나
+      (httpx 연결은 만든 루프에 묶이므로, 실행마다 asyncio.run을 새로 하는
+      워커 프로세스에서도 닫힌 루프의 연결을 다시 쓰지 않음)
+    - 엔드포인트 동시 요청 한도를 여기서 한 번에 적용 (프로세스 안의 모든 루프 공유)
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], ChatCompletionClient],
+        limiter: Optional[LLMConcurrencyLimiter] = None,
+    ):
+        self._factory = factory
+        self.limiter = limiter
+        self._clients: "weakref.WeakKeyDictionary[Any, ChatCompletionClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # 이벤트 루프 밖에서 쓰는 클라이언트 (count_tokens 등)
+        self._loopless: Optional[ChatCompletionClient] = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> ChatCompletionClient:  # type: ignore[override]
+        """현재 이벤트 루프의 클라이언트 (없으면 만듦)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._lock:
+            if loop is None:
+                if self._loopless is None:
+                    self._loopless = self._factory()
+                return self._loopless
+            client = self._clients.get(loop)
+            if client is None:
+                client = self._clients[loop] = self._factory()
+            return client
+
+    def _limit(self) -> Any:
+        return self.limiter if self.limiter is not None else contextlib.nullcontext()
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        async with self._limit():
+            return await self.client.create(
+                messages,
+                tools=tools,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        async def _generator() -> AsyncGenerator[Union[str, CreateResult], None]:
+            async with self._limit():
+                async for chunk in self.client.create_stream(
+                    messages,
+                    tools=tools,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                    cancellation_token=cancellation_token,
+                ):
+                    yield chunk
+
+        return _generator()
+
+    async def close(self) -> None:
+        """현재 이벤트 루프의 연결 풀을 닫음 (다음 호출 때 새로 만듦)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.close()
+
+
+class ModelClientRegistry:
+    """
+    - (provider, model, endpoint)별 PooledChatCompletionClient를 프로세스에 하나씩 둠
+    - endpoint는 host (None이면 OLLAMA_HOST 또는 ollama 기본 주소)
+    - 엔드포인트별 동시 요청 한도/타임아웃/연결 풀은 configure_endpoint()로 지정
+      (지정하지 않으면 환경 변수 기본값, 클라이언트를 처음 만들 때 적용)
+    - 여러 엔드포인트에 나눠 보낼 때는 router()
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, str, Optional[str]], Any] = {}
+        self._routers: Dict[Tuple[Any, ...], RoutedChatCompletionClient] = {}
+        self._endpoints: Dict[Optional[str], Dict[str, Any]] = {}
+        self._limiters: Dict[Optional[str], Optional[LLMConcurrencyLimiter]] = {}
+        self._lock = threading.Lock()
+
+    def configure_endpoint(self, host: Optional[str] = None, **options: Any) -> None:
+        """
+        엔드포인트 설정 (max_concurrency/timeout/max_connections/keepalive_expiry)
+        - 이미 만든 클라이언트에는 적용되지 않음
+        """
+        unknown = set(options) - set(default_endpoint_options())
+        if unknown:
+            raise ValueError(
+                f"[ModelClientRegistry] 알 수 없는 엔드포인트 설정입니다: {unknown}"
+            )
+        host = self._endpoint(host)
+        with self._lock:
+            self._endpoints[host] = {**self._endpoints.get(host, {}), **options}
+            self._limiters.pop(host, None)
+
+    def get(
+        self,
+        model: str,
+        model_info: Optional[ModelInfo] = None,
+        provider: str = "ollama",
+        host: Optional[str] = None,
+    ) -> PooledChatCompletionClient:
+        if provider not in PROVIDERS:
+            raise ValueError(
+                f"[ModelClientRegistry] 지원하지 않는 provider입니다: {provider}"
+            )
+        host = self._endpoint(host)
+        key = (provider, model, host)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                options = self._options(host)
+                client = PooledChatCompletionClient(
+                    lambda: _ollama_client(model, model_info, host, options),
+                    limiter=self._limiter(host, options),
+                )
+                self._clients[key] = client
+            return client
+
+    def router(
+        self,
+        model: str,
+        hosts: Sequence[str],
+        model_info: Optional[ModelInfo] = None,
+        provider: str = "ollama",
+        **options: Any,
+    ) -> RoutedChatCompletionClient:
+        """
+        같은 모델을 띄운 여러 엔드포인트(hosts)로 나눠 보내는 라우터
+        - (provider, model, hosts)마다 하나라서 지연 시간 통계를 모든 에이전트가 공유
+        - 엔드포인트별 클라이언트는 get()과 같은 풀/한도를 씀
+        - options: hedge_percentile/min_samples (기본값은 환경 변수)
+        """
+        hosts = tuple(self._endpoint(host) for host in hosts)
+        key = (provider, model, hosts)
+        clients = [self.get(model, model_info, provider, host) for host in hosts]
+        with self._lock:
+            router = self._routers.get(key)
+            if router is None:
+                router = RoutedChatCompletionClient(
+                    clients, **{**default_router_options(), **options}
+                )
+                self._routers[key] = router
+            return router
+
+    async def aclose(self) -> None:
+        """현재 이벤트 루프에서 연 연결 풀을 모두 닫음 (루프를 끝내기 전에 호출)"""
+        with self._lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            await client.close()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._routers.clear()
+            self._endpoints.clear()
+            self._limiters.clear()
+
+    def _options(self, host: Optional[str]) -> Dict[str, Any]:
+        return {**default_endpoint_options(), **self._endpoints.get(host, {})}
+
+    def _limiter(
+        self, host: Optional[str], options: Dict[str, Any]
+    ) -> Optional[LLMConcurrencyLimiter]:
+        """같은 엔드포인트의 모델들이 하나의 한도를 나눠 씀"""
+        if host not in self._limiters:
+            max_concurrency = options["max_concurrency"]
+            self._limiters[host] = (
+                LLMConcurrencyLimiter(threading.BoundedSemaphore(max_concurrency))
+                if max_concurrency
+                else None
+            )
+        return self._limiters[host]
+
+    @staticmethod
+    def _endpoint(host: Optional[str]) -> Optional[str]:
+        return host or getenv("OLLAMA_HOST") or None
+
+
+# 프로세스 전체에서 공유하는 레지스트리
+_registry = ModelClientRegistry()
+
+
+def get_model_client_registry() -> ModelClientRegistry:
+    return _registry
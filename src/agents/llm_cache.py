@@ -0,0 +1,233 @@
+import asyncio
+import hashlib
+import json
+import os
+from typing import Any, AsyncGenerator, Dict, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken, Image
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    SystemMessage,
+    UserMessage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from src.agents.client_wrapper import ChatCompletionClientWrapper
+
+# off: 캐시 미사용 / record: 항상 모델 호출 후 기록 /
+# replay: 캐시만 사용 (없으면 LLMCacheMiss) / record_missing: 없을 때만 모델 호출 후 기록
+LLM_CACHE_MODES = ("off", "record", "replay", "record_missing")
+
+
+class LLMCacheMiss(LookupError):
+    """
+    replay 모드에서 기록된 응답이 없을 때
+    - 에이전트의 ValueError 재시도 루프에 잡히지 않도록 LookupError를 상속
+    """
+
+
+def _digest(data: Union[str, bytes]) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def _serialize_message(message: LLMMessage) -> Dict[str, Any]:
+    """이미지는 해시로 바꿔 키에 포함 (base64 전체를 직렬화하지 않음)"""
+    if isinstance(message, UserMessage) and not isinstance(message.content, str):
+        data = message.model_dump(exclude={"content"})
+        data["content"] = [
+            {"image": _digest(part.to_base64())} if isinstance(part, Image) else part
+            for part in message.content
+        ]
+        return data
+    return message.model_dump(mode="json")
+
+
+class LLMResponseCache:
+    """
+    - 요청 키별 모델 응답(CreateResult)을 cache_dir/{에이전트}/{키 앞 2자리}/{키}.json 에 저장
+    - 여러 프로세스가 같은 디렉터리를 공유해도 되도록 임시 파일 후 교체
+    - 이벤트 루프에서는 aget()/aset()으로 루프를 막지 않고 읽고 저장
+    """
+
+    def __init__(self, cache_dir: str = "data/llm_cache"):
+        self.cache_dir = cache_dir
+
+    def get(self, agent_name: str, key: str) -> Optional[CreateResult]:
+        path = self._path(agent_name, key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+        result = CreateResult.model_validate(record["result"])
+        result.cached = True
+        return result
+
+    async def aget(self, agent_name: str, key: str) -> Optional[CreateResult]:
+        return await asyncio.to_thread(self.get, agent_name, key)
+
+    def set(
+        self,
+        agent_name: str,
+        key: str,
+        request: Dict[str, Any],
+        result: CreateResult,
+    ) -> None:
+        path = self._path(agent_name, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"request": request, "result": result.model_dump(mode="json")},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        os.replace(tmp_path, path)
+
+    async def aset(
+        self,
+        agent_name: str,
+        key: str,
+        request: Dict[str, Any],
+        result: CreateResult,
+    ) -> None:
+        await asyncio.to_thread(self.set, agent_name, key, request, result)
+
+    def _path(self, agent_name: str, key: str) -> str:
+        return os.path.join(self.cache_dir, agent_name, key[:2], f"{key}.json")
+
+
+class RecordReplayChatCompletionClient(ChatCompletionClientWrapper):
+    """
+    - 에이전트의 모델 클라이언트를 감싸 응답을 기록/재생
+    - 키: 에이전트 이름, 모델, 시스템 프롬프트 해시, 직렬화된 메시지(이미지는 해시),
+      출력 스키마, 추가 생성 인자
+    - 캐시 적중은 내부 클라이언트의 토큰 사용량에 포함되지 않음
+    """
+
+    def __init__(
+        self,
+        client: ChatCompletionClient,
+        agent_name: str,
+        model: str,
+        cache: LLMResponseCache,
+        mode: str = "record_missing",
+    ):
+        if mode not in LLM_CACHE_MODES or mode == "off":
+            raise ValueError(f"[LLMCache] 지원하지 않는 모드입니다: {mode}")
+        super().__init__(client)
+        self.agent_name = agent_name
+        self.model = model
+        self.cache = cache
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+
+    def request_key(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[Tool | ToolSchema],
+        json_output: Optional[bool | type[BaseModel]],
+        extra_create_args: Mapping[str, Any],
+    ) -> tuple[str, Dict[str, Any]]:
+        system_prompt = "\n".join(
+            m.content for m in messages if isinstance(m, SystemMessage)
+        )
+        if isinstance(json_output, type) and issubclass(json_output, BaseModel):
+            json_output_data = json_output.model_json_schema()
+        else:
+            json_output_data = json_output
+
+        request = {
+            "agent": self.agent_name,
+            "model": self.model,
+            "system_prompt": _digest(system_prompt),
+            "messages": [
+                _serialize_message(m)
+                for m in messages
+                if not isinstance(m, SystemMessage)
+            ],
+            "tools": [
+                (tool.schema if isinstance(tool, Tool) else tool) for tool in tools
+            ],
+            "json_output": json_output_data,
+            "extra_create_args": dict(extra_create_args),
+        }
+        serialized = json.dumps(
+            request, sort_keys=True, ensure_ascii=False, default=str
+        )
+        return _digest(serialized), request
+
+    async def _lookup(self, key: str) -> Optional[CreateResult]:
+        if self.mode == "record":
+            return None
+        result = await self.cache.aget(self.agent_name, key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        if self.mode == "replay":
+            raise LLMCacheMiss(
+                f"[LLMCache] {self.agent_name}: 기록된 응답이 없습니다 (key={key})"
+            )
+        return None
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        key, request = self.request_key(messages, tools, json_output, extra_create_args)
+        cached = await self._lookup(key)
+        if cached is not None:
+            return cached
+
+        result = await self.client.create(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        await self.cache.aset(self.agent_name, key, request, result)
+        return result
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        async def _generator() -> AsyncGenerator[Union[str, CreateResult], None]:
+            key, request = self.request_key(
+                messages, tools, json_output, extra_create_args
+            )
+            cached = await self._lookup(key)
+            if cached is not None:
+                yield cached
+                return
+
+            async for chunk in self.client.create_stream(
+                messages,
+                tools=tools,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            ):
+                if isinstance(chunk, CreateResult):
+                    await self.cache.aset(self.agent_name, key, request, chunk)
+                yield chunk
+
+        return _generator()
@@ -0,0 +1,112 @@
+import asyncio
+from typing import Any, AsyncGenerator, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from src.agents.client_wrapper import ChatCompletionClientWrapper
+
+
+class LLMConcurrencyLimiter:
+    """
+    - 모델 호출 동시 실행 수를 제한하는 전역 한도
+    - semaphore가 asyncio.Semaphore면 이벤트 루프 안에서 기다림
+      (한 이벤트 루프에서 모든 실행을 돌릴 때)
+    - threading/multiprocessing 세마포어면 이벤트 루프가 달라도,
+      여러 워커 프로세스가 나눠 가져도 같은 한도를 공유
+      (바로 얻지 못하면 executor 스레드의 blocking acquire를 기다려 루프를 막지 않음)
+    """
+
+    def __init__(self, semaphore: Any):
+        self.semaphore = semaphore
+
+    async def __aenter__(self) -> "LLMConcurrencyLimiter":
+        if isinstance(self.semaphore, asyncio.Semaphore):
+            await self.semaphore.acquire()
+        elif not self.semaphore.acquire(False):
+            await self._acquire_in_executor()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.semaphore.release()
+
+    async def _acquire_in_executor(self) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, self.semaphore.acquire)
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # 기다리던 호출이 취소돼도 스레드는 결국 한도를 얻으므로 그때 바로 반납
+            future.add_done_callback(self._release_acquired)
+            raise
+
+    def _release_acquired(self, future: "asyncio.Future[Any]") -> None:
+        if not future.cancelled() and future.exception() is None:
+            self.semaphore.release()
+
+
+# 프로세스 전체에서 공유하는 한도 (None이면 제한 없음)
+_limiter: Optional[LLMConcurrencyLimiter] = None
+
+
+def set_llm_semaphore(semaphore: Any | None) -> None:
+    """
+    이후 생성되는 모델 클라이언트가 공유할 세마포어 지정
+    - 러너가 워커 프로세스 초기화 시 같은 multiprocessing 세마포어를 넘겨줌
+    """
+    global _limiter
+    _limiter = LLMConcurrencyLimiter(semaphore) if semaphore is not None else None
+
+
+def get_llm_limiter() -> Optional[LLMConcurrencyLimiter]:
+    return _limiter
+
+
+class ConcurrencyLimitedChatCompletionClient(ChatCompletionClientWrapper):
+    """모델 호출 전후로 전역 한도를 획득/반납하는 클라이언트"""
+
+    def __init__(self, client: ChatCompletionClient, limiter: LLMConcurrencyLimiter):
+        super().__init__(client)
+        self.limiter = limiter
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        async with self.limiter:
+            return await self.client.create(
+                messages,
+                tools=tools,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        async def _generator() -> AsyncGenerator[Union[str, CreateResult], None]:
+            async with self.limiter:
+                async for chunk in self.client.create_stream(
+                    messages,
+                    tools=tools,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                    cancellation_token=cancellation_token,
+                ):
+                    yield chunk
+
+        return _generator()
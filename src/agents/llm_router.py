@@ -0,0 +1,298 @@
+import asyncio
+import itertools
+import threading
+import weakref
+from collections import deque
+from time import perf_counter
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from autogen_core import CancellationToken
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from src.agents.client_wrapper import ChatCompletionClientWrapper
+
+
+class RoutedChatCompletionClient(ChatCompletionClientWrapper):
+    """
+    같은 모델을 띄운 여러 엔드포인트로 요청을 나눠 보내는 클라이언트
+    - 진행 중인 요청이 가장 적은 엔드포인트를 고름 (least outstanding requests,
+      같으면 예상 지연(EWMA)이 가장 짧은 곳, 그것도 같으면 돌아가며 선택)
+    - 지연 시간 통계는 엔드포인트마다 따로 둠 (느린 엔드포인트가 기준을 끌어올리지 않게)
+    - 응답이 가장 빠른 엔드포인트 지연의 hedge_percentile 분위를 넘기면 다른
+      엔드포인트로 같은 요청을 한 번 더 보내고(hedging), 먼저 성공한 응답을 쓰고
+      나머지는 CancellationToken으로 취소
+    - 진 요청은 취소 시점까지의 시간을 예상 지연에 하한으로 반영해 다음 선택에서 밀림
+    - 어느 엔드포인트도 지연 시간 표본이 min_samples개 모이기 전이나
+      hedge_percentile=None이면 hedging하지 않음
+    - 시도가 모두 실패하면 아직 시도하지 않은 엔드포인트로 다시 보냄 (failover)
+    - model_info/count_tokens 등은 첫 엔드포인트 클라이언트 기준
+    """
+
+    def __init__(
+        self,
+        clients: Sequence[ChatCompletionClient],
+        hedge_percentile: Optional[float] = 0.95,
+        min_samples: int = 20,
+        window: int = 256,
+        ewma_alpha: float = 0.3,
+    ):
+        if not clients:
+            raise ValueError(
+                "[RoutedChatCompletionClient] 엔드포인트가 하나 이상 필요합니다."
+            )
+        super().__init__(clients[0])
+        self.clients = list(clients)
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.ewma_alpha = ewma_alpha
+        # 엔드포인트별 진행 중인 요청 수
+        self.outstanding = [0] * len(self.clients)
+        self.requests = 0
+        self.hedges = 0
+        self.failovers = 0
+        # 엔드포인트별 완료된 요청의 지연 시간 (hedging 기준) / 예상 지연 (선택 기준)
+        self._latencies: List[Deque[float]] = [
+            deque(maxlen=window) for _ in self.clients
+        ]
+        self._expected: List[Optional[float]] = [None] * len(self.clients)
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def expected_latency(self, index: int) -> float:
+        """예상 지연 (초, 아직 모르면 0이라 먼저 시도됨)"""
+        with self._lock:
+            expected = self._expected[index]
+        return 0.0 if expected is None else expected
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        hedging을 시작할 대기 시간 (초, hedging하지 않으면 None)
+        - 표본이 충분한 엔드포인트들 중 hedge_percentile 분위가 가장 짧은 값
+        """
+        if self.hedge_percentile is None or len(self.clients) < 2:
+            return None
+        with self._lock:
+            windows = [
+                sorted(latencies)
+                for latencies in self._latencies
+                if len(latencies) >= self.min_samples
+            ]
+        if not windows:
+            return None
+        return min(
+            latencies[
+                min(int(self.hedge_percentile * len(latencies)), len(latencies) - 1)
+            ]
+            for latencies in windows
+        )
+
+    def _acquire(self, exclude: Sequence[int] = ()) -> Optional[int]:
+        """진행 중인 요청이 가장 적은(같으면 예상 지연이 짧은) 엔드포인트를 골라 요청 수를 올림"""
+        with self._lock:
+            candidates = [i for i in range(len(self.clients)) if i not in exclude]
+            if not candidates:
+                return None
+            turn = next(self._turn)
+            index = min(
+                candidates,
+                key=lambda i: (
+                    self.outstanding[i],
+                    self._expected[i] or 0.0,
+                    (i - turn) % len(self.clients),
+                ),
+            )
+            self.outstanding[index] += 1
+            return index
+
+    def _release(self, index: int) -> None:
+        with self._lock:
+            self.outstanding[index] -= 1
+
+    def _observe(self, index: int, latency: float, completed: bool) -> None:
+        """
+        지연 시간 기록
+        - completed=False(취소된 요청)는 실제 지연의 하한이므로 예상 지연을 올리기만 함
+        """
+        with self._lock:
+            if completed:
+                self._latencies[index].append(latency)
+            expected = self._expected[index]
+            if expected is None:
+                self._expected[index] = latency
+            elif completed or latency > expected:
+                self._expected[index] = expected + self.ewma_alpha * (
+                    latency - expected
+                )
+
+    async def _attempt(
+        self,
+        index: int,
+        messages: Sequence[LLMMessage],
+        cancellation_token: CancellationToken,
+        kwargs: Dict[str, Any],
+    ) -> CreateResult:
+        start = perf_counter()
+        try:
+            result = await self.clients[index].create(
+                messages, cancellation_token=cancellation_token, **kwargs
+            )
+        except asyncio.CancelledError:
+            self._observe(index, perf_counter() - start, completed=False)
+            raise
+        finally:
+            self._release(index)
+        self._observe(index, perf_counter() - start, completed=True)
+        return result
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        kwargs = {
+            "tools": tools,
+            "json_output": json_output,
+            "extra_create_args": extra_create_args,
+        }
+        # 시도(task)마다 따로 취소할 수 있도록 토큰을 하나씩 두고,
+        # 호출마다 새 토큰에 묶어 호출자 토큰이 취소되면 함께 취소
+        attempts: Dict["asyncio.Task[CreateResult]", CancellationToken] = {}
+        used: List[int] = []
+        call_token = CancellationToken()
+
+        def start(index: int) -> None:
+            token = CancellationToken()
+            call_token.add_callback(token.cancel)
+            task = asyncio.ensure_future(self._attempt(index, messages, token, kwargs))
+            # 취소되거나 진 시도의 예외는 여기서 회수 (경고 방지)
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            attempts[task] = token
+            used.append(index)
+
+        self.requests += 1
+        start(self._acquire())
+        if cancellation_token is not None:
+            # 호출자 토큰의 콜백은 지울 수 없으므로 약한 참조만 남겨
+            # 호출이 끝나면 이 호출의 토큰/시도가 해제되도록 함
+            cancellation_token.add_callback(_weak_cancel(call_token))
+
+        try:
+            pending = set(attempts)
+            done, pending = await asyncio.wait(pending, timeout=self.hedge_delay())
+            if not done:
+                index = self._acquire(exclude=used)
+                if index is not None:
+                    self.hedges += 1
+                    start(index)
+                    pending = {task for task in attempts if not task.done()}
+
+            # 먼저 성공한 응답을 쓰고, 모든 시도가 실패하면 아직 쓰지 않은
+            # 엔드포인트로 넘긴 뒤(failover) 더 없으면 처음 실패를 올림
+            errors: List[BaseException] = []
+            while True:
+                for task in done:
+                    if task.cancelled():
+                        errors.append(asyncio.CancelledError())
+                    elif task.exception() is not None:
+                        errors.append(task.exception())
+                    else:
+                        return task.result()
+                if not pending:
+                    index = None
+                    if not call_token.is_cancelled():
+                        index = self._acquire(exclude=used)
+                    if index is None:
+                        raise errors[0]
+                    self.failovers += 1
+                    start(index)
+                    pending = {task for task in attempts if not task.done()}
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            # 끝나지 않은 시도는 토큰으로 취소하고,
+            # 토큰을 쓰지 않는 클라이언트도 멈추도록 task도 취소
+            for task, token in attempts.items():
+                if not task.done():
+                    token.cancel()
+                    task.cancel()
+            attempts.clear()
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        """스트리밍은 엔드포인트 선택만 하고 hedging하지 않음"""
+
+        async def _generator() -> AsyncGenerator[Union[str, CreateResult], None]:
+            index = self._acquire()
+            try:
+                async for chunk in self.clients[index].create_stream(
+                    messages,
+                    tools=tools,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                    cancellation_token=cancellation_token,
+                ):
+                    yield chunk
+            finally:
+                self._release(index)
+
+        return _generator()
+
+    def actual_usage(self) -> RequestUsage:
+        return _sum_usage(client.actual_usage() for client in self.clients)
+
+    def total_usage(self) -> RequestUsage:
+        return _sum_usage(client.total_usage() for client in self.clients)
+
+    async def close(self) -> None:
+        for client in self.clients:
+            await client.close()
+
+
+def _weak_cancel(token: CancellationToken) -> Callable[[], None]:
+    """token이 살아 있을 때만 취소하는 콜백 (token을 붙잡아 두지 않음)"""
+    ref = weakref.ref(token)
+
+    def cancel() -> None:
+        target = ref()
+        if target is not None:
+            target.cancel()
+
+    return cancel
+
+
+def _sum_usage(usages: Any) -> RequestUsage:
+    usages = list(usages)
+    return RequestUsage(
+        prompt_tokens=sum(usage.prompt_tokens for usage in usages),
+        completion_tokens=sum(usage.completion_tokens for usage in usages),
+    )
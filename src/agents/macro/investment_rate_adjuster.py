@@ -1,4 +1,3 @@
-import json
 from os import getenv
 from typing import Any, Dict
 
@@ -6,15 +5,22 @@ import pydantic
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.messages import TextMessage
 from autogen_core import CancellationToken
-from autogen_ext.models.ollama import OllamaChatCompletionClient
 from autogen_ext.models.openai import OpenAIChatCompletionClient
-from pydantic import BaseModel, ValidationError
-
+from pydantic import BaseModel, Field, ValidationError
+
+from src.agents.model_client import create_model_client
+from src.agents.output_repair import (
+    RepairableResponse,
+    floor_fraction,
+    get_output_repair_stats,
+    max_output_retries,
+)
+from src.agents.prompt_encoder import PromptEncoder
 from src.portfoilo_manager import PortfolioManager
 
 
 class RateResponse(BaseModel):
-    rate_limit: float
+    rate_limit: float = Field(ge=0.0, le=1.0)
 
     @pydantic.field_validator("rate_limit")
     @classmethod
@@ -27,14 +33,18 @@ class RateResponse(BaseModel):
         return v
 
 
-class InvestmentRateAdjusterResponse(BaseModel):
+class InvestmentRateAdjusterResponse(RepairableResponse):
+    # rate_limit은 검증 전에 0~1, 소수점 두 자리로 보정
+    repair_fields = {"rate_limit": 2}
+
     thoughts: str
     response: RateResponse
 
 
 class InvestmentRateAdjuster(AssistantAgent):
     def __init__(self):
-        self._client = OllamaChatCompletionClient(model="gemma3:27b")
+        self._encoder = PromptEncoder.from_env()
+        self._client = create_model_client("investment_rate_adjuster")
         # self._client = OpenAIChatCompletionClient(
         #     model="gpt-4o-mini", api_key=getenv("OPENAI_API_KEY")
         # )
@@ -107,12 +117,15 @@ class InvestmentRateAdjuster(AssistantAgent):
             "portfolio_ratio": PortfolioManager.get_instance().get_portfolio_ratio(),
         }
         base_msg = TextMessage(
-            content=json.dumps(report, indent=4),
+            content=self._encoder.encode(report),
             source="data_preprocessor",
         )
         message = [base_msg]
-
-        while True:  # 최대 5회 반복
+        stats = get_output_repair_stats()
+        # 범위/자리수 위반은 출력 모델에서 고치므로, 재시도는 읽을 수 없는 출력일 때만
+        for attempt in range(max_output_retries() + 1):
+            if attempt:
+                stats.record_retry(self.name)
             try:
                 response = await self.run(task=message)
                 content = response.messages[-1].content
@@ -120,6 +133,7 @@ class InvestmentRateAdjuster(AssistantAgent):
 
                 thoughts = content.thoughts
                 rate_limit = content.response.rate_limit
+                stats.record_response(self.name, content.repairs)
 
                 report = {
                     "trend_report": trend_report,
@@ -132,16 +146,34 @@ class InvestmentRateAdjuster(AssistantAgent):
                 await self.close()
                 return report
             except ValidationError as e:  # ← ValidationError 잡기
-                feedback = TextMessage(
-                    content=(
-                        "JSON schema validation failed:"
-                        f"{e}\n\n"
-                        "규칙:\n"
-                        "- rate_limit은 0.0 ~ 1.0 사이 소수점 두 자리.\n"
-                    ),
-                    source="validator",
-                )
-                message.append(feedback)
+                # 이전 요청과 응답은 모델 컨텍스트에 남아 있으므로 피드백만 보냄
+                message = [
+                    TextMessage(
+                        content=(
+                            "JSON schema validation failed:"
+                            f"{e}\n\n"
+                            "규칙:\n"
+                            "- rate_limit은 0.0 ~ 1.0 사이 소수점 두 자리.\n"
+                        ),
+                        source="validator",
+                    )
+                ]
+        # 재시도 한도를 넘기면 현재 코인 비율을 한도로 두어 매수/매도를 강제하지 않음
+        ratios = report["portfolio_ratio"]
+        coin_ratio = sum(v for k, v in ratios.items() if k != "cash")
+        print(
+            f"InvestmentRateAdjuster: {attempt}회 재시도 후에도 오류 발생, "
+            "현재 코인 비율 유지"
+        )
+        stats.record_fallback(self.name)
+        await self.close()
+        return {
+            "trend_report": trend_report,
+            "limit_report": {
+                "rate_limit": floor_fraction(min(coin_ratio, 1.0), 2),
+                "reason": "",
+            },
+        }
 
     async def close(self):
         await self.on_reset(cancellation_token=CancellationToken())
@@ -1,16 +1,21 @@
 from typing import Any, Dict
 
+from src.agents.agent_pool import AgentPool
 from src.agents.macro.investment_rate_adjuster import InvestmentRateAdjuster
 from src.agents.macro.trend_analyzer import TrendAnalyzer
+from src.utils.image_utils import ChartImage
 
 
 class MacroAnalysisTeam:
-    def __init__(self):
-        self.trend_analyzer = TrendAnalyzer()
+    def __init__(self, pool_size: int = 1):
+        # 포트폴리오와 무관한 추세 분석은 여러 틱을 동시에 처리할 수 있도록 풀로 관리
+        self.trend_analyzer = AgentPool(TrendAnalyzer, size=pool_size)
         self.investment_rate_adjuster = InvestmentRateAdjuster()
 
-    async def analyze(self, price_data: Dict[str, Any], fig: Any) -> str:
-        trend_report = await self.trend_analyzer.analyze(price_data=price_data, fig=fig)
+    async def analyze(self, price_data: Dict[str, Any], chart: ChartImage) -> str:
+        trend_report = await self.trend_analyzer.analyze(
+            price_data=price_data, chart=chart
+        )
 
         trend_report = await self.investment_rate_adjuster.adjust_rate_limit(
             trend_report, price_data
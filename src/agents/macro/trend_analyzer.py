@@ -5,17 +5,18 @@ import pydantic
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.messages import MultiModalMessage
 from autogen_core import CancellationToken
-from autogen_ext.models.ollama import OllamaChatCompletionClient
 from autogen_ext.models.openai import OpenAIChatCompletionClient
-from matplotlib import pyplot as plt
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from src.utils.image_utils import get_agentic_image
+from src.agents.model_client import create_model_client
+from src.agents.output_schema import StructuredResponse
+from src.agents.prompt_encoder import PromptEncoder
+from src.utils.image_utils import ChartImage, get_agentic_image
 
 
 class TrendReport(BaseModel):
     trend: Literal["상승장", "하락장", "횡보장", "고변동성장"]
-    confidence: float
+    confidence: float = Field(ge=0.0, le=1.0)
 
     @pydantic.field_validator("confidence")
     @classmethod
@@ -25,14 +26,15 @@ class TrendReport(BaseModel):
         return v
 
 
-class TrendAnalyzerResponse(BaseModel):
+class TrendAnalyzerResponse(StructuredResponse):
     thoughts: str
     response: TrendReport
 
 
 class TrendAnalyzer(AssistantAgent):
     def __init__(self):
-        self._client = OllamaChatCompletionClient(model="gemma3:27b")
+        self._encoder = PromptEncoder.from_env()
+        self._client = create_model_client("trend_analyzer")
         # self._client = OpenAIChatCompletionClient(
         #     model="gpt-4o-mini", api_key=getenv("OPENAI_API_KEY")
         # )
@@ -72,12 +74,13 @@ OHLCV 데이터와 관련 기술 지표 값, 그리고 캔들 차트 이미지
             ),
         )
 
-    async def analyze(self, price_data: Dict[str, Any], fig: Any) -> Dict[str, Any]:
-        image = get_agentic_image(fig)
-        plt.close(fig)
+    async def analyze(
+        self, price_data: Dict[str, Any], chart: ChartImage
+    ) -> Dict[str, Any]:
+        image = get_agentic_image(chart)
 
         message = MultiModalMessage(
-            content=[image, f"{price_data}"],
+            content=[image, self._encoder.encode(price_data)],
             source="data_preprocessor",
         )
 
@@ -1,25 +1,30 @@
 from typing import Any, Dict
 
+from src.agents.agent_pool import AgentPool
 from src.agents.micro.order_tactician import OrderTactician
 from src.agents.micro.pulse_detector import PulseDetector
+from src.utils.image_utils import ChartImage
 
 
 class MicroAnalysisTeam:
-    def __init__(self):
-        self.pulse_detector = PulseDetector()
+    def __init__(self, pool_size: int = 1):
+        # 포트폴리오와 무관한 펄스 감지는 여러 틱을 동시에 처리할 수 있도록 풀로 관리
+        self.pulse_detector = AgentPool(PulseDetector, size=pool_size)
         self.order_tactician = OrderTactician()
 
     async def analyze(
         self,
         price_data: Dict[str, Any],
-        fig: Any,
+        chart: ChartImage,
         macro_report: Dict[str, Any],
     ) -> Dict[str, Any]:
-        micro_report = await self.pulse_detector.detect(price_data=price_data, fig=fig)
+        pulse_report = await self.pulse_detector.detect(
+            price_data=price_data, chart=chart
+        )
 
         order_report = await self.order_tactician.decide(
-            macro_report=macro_report, micro_report=micro_report
+            macro_report=macro_report, pulse_report=pulse_report
         )
 
-        micro_report = {"micro_report": micro_report, "order_report": order_report}
+        micro_report = {"pulse_report": pulse_report, "order_report": order_report}
         return micro_report
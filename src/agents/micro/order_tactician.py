@@ -1,21 +1,27 @@
-import json
 from os import getenv
-from typing import Any, Dict, Literal, Union
+from typing import Any, Dict, List, Literal, Union
 
 import pydantic
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.messages import TextMessage
 from autogen_core import CancellationToken
-from autogen_ext.models.ollama import OllamaChatCompletionClient
 from autogen_ext.models.openai import OpenAIChatCompletionClient
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, Field, ValidationError
 
+from src.agents.model_client import create_model_client
+from src.agents.output_repair import (
+    RepairableResponse,
+    floor_fraction,
+    get_output_repair_stats,
+    max_output_retries,
+)
+from src.agents.prompt_encoder import PromptEncoder
 from src.portfoilo_manager import PortfolioManager
 
 
 class OrderResponse(BaseModel):
     order: Literal["buy", "sell", "hold"]
-    amount: float
+    amount: float = Field(ge=0.0, le=1.0)
 
     @pydantic.field_validator("amount")
     @classmethod
@@ -38,14 +44,18 @@ class OrderResponse(BaseModel):
         return self
 
 
-class OrderTacticianResponse(BaseModel):
+class OrderTacticianResponse(RepairableResponse):
+    # amount는 검증 전에 0~1, 소수점 세 자리로 보정
+    repair_fields = {"amount": 3}
+
     thoughts: str
     response: OrderResponse
 
 
 class OrderTactician(AssistantAgent):
     def __init__(self):
-        self._client = OllamaChatCompletionClient(model="gemma3:27b")
+        self._encoder = PromptEncoder.from_env()
+        self._client = create_model_client("order_tactician")
         # self._client = OpenAIChatCompletionClient(
         #     model="gpt-4o-mini", api_key=getenv("OPENAI_API_KEY")
         # )
@@ -167,11 +177,15 @@ class OrderTactician(AssistantAgent):
             "portfolio_ratio": PortfolioManager.get_instance().get_portfolio_ratio(),
         }
         base_msg = TextMessage(
-            content=json.dumps(report, indent=4),
+            content=self._encoder.encode(report),
             source="data_preprocessor",
         )
         messages = [base_msg]
-        for _ in range(5):  # 최대 5회 반복
+        stats = get_output_repair_stats()
+        # 범위/자리수/한도 위반은 여기서 고치므로, 재시도는 읽을 수 없는 출력일 때만
+        for attempt in range(max_output_retries() + 1):
+            if attempt:
+                stats.record_retry(self.name)
             try:
                 response = await self.run(task=messages)
                 content = response.messages[-1].content
@@ -179,77 +193,69 @@ class OrderTactician(AssistantAgent):
                 OrderResponse.model_validate(content.response.model_dump())
 
                 thoughts = content.thoughts
-
-                order = content.response.order
-                amount = content.response.amount
-                ratios = report["portfolio_ratio"]
-
-                cash_ratio = ratios.get("cash", 0.0)
-                coin_ratio = sum(v for k, v in ratios.items() if k != "cash")
-
-                rate_limit = (
-                    macro_report["limit_report"]["rate_limit"]
-                    if macro_report is not None
-                    else 1.0
-                )
-
-                # 추가 검증: buy 오류
-                if order == "buy":
-                    if round(amount, 4) > round(rate_limit, 4):
-                        raise ValueError(
-                            "Buy amount {:.4f} exceeds rate_limit limit {:.4f}.".format(
-                                amount, rate_limit
-                            )
-                        )
-                    # 소수점 4자리까지 반올림하여 비교
-                    if round(coin_ratio + amount, 4) > round(rate_limit, 4):
-                        raise ValueError(
-                            "Buy amount {:.4f} exceeds rate_limit limit {:.4f}.".format(
-                                amount, rate_limit
-                            )
-                        )
-
-                # 추가 검증: sell 오류
-                if order == "sell":
-                    if round(amount, 4) > round(coin_ratio, 4):
-                        raise ValueError(
-                            "Sell amount {:.4f} exceeds coin balance {:.4f}.".format(
-                                amount, coin_ratio
-                            )
-                        )
-
                 report = content.response.model_dump()
+                repairs = content.repairs + self._repair_order(report, macro_report)
+                stats.record_response(self.name, repairs)
+
                 report["reason"] = thoughts
 
                 await self.close()
                 return report
             except ValidationError as e:
-                feedback = TextMessage(
-                    content=(
-                        f"⛔  JSON schema validation failed: {e}\n"
-                        "규칙:\n"
-                        "1. order가 hold인 경우 amount는 0.0.\n"
-                    ),
-                    source="validator",
-                )
-            except ValueError as e:
-                feedback = TextMessage(
-                    content=(
-                        f"⛔  Order rule validation failed: {e}\n"
-                        "- sell 시에는 coin 비율 이하의 amount만 허용됩니다.\n"
-                        "- buy 시에는 cash 비율 이하의 amount만 허용됩니다.\n"
-                    ),
-                    source="validator",
-                )
-            messages.append(feedback)
-            print(messages)
-        print("OrderTactician: 5회 반복 후에도 오류 발생, 보유 유지")
+                # 이전 요청과 응답은 모델 컨텍스트에 남아 있으므로 피드백만 보냄
+                messages = [
+                    TextMessage(
+                        content=(
+                            f"⛔  JSON schema validation failed: {e}\n"
+                            "규칙:\n"
+                            "1. order가 hold인 경우 amount는 0.0.\n"
+                        ),
+                        source="validator",
+                    )
+                ]
+        print(f"OrderTactician: {attempt}회 재시도 후에도 오류 발생, 보유 유지")
+        stats.record_fallback(self.name)
         await self.close()
         return {
             "order": "hold",
             "amount": 0.0,
         }
 
+    @staticmethod
+    def _repair_order(
+        report: Dict[str, Any], macro_report: Union[Dict[str, Any], None]
+    ) -> List[str]:
+        """
+        주문 규칙에 맞게 amount를 줄임 (고친 내용 반환)
+        - buy: rate_limit - 코인 비율까지 / sell: 보유 코인 비율까지
+          (규칙 비교는 기존처럼 소수점 4자리 반올림 기준, 줄일 때는 3자리 내림)
+        - 줄일 수 있는 수량이 없으면 hold
+        """
+        ratios = PortfolioManager.get_instance().get_portfolio_ratio()
+        coin_ratio = sum(v for k, v in ratios.items() if k != "cash")
+        rate_limit = (
+            macro_report["limit_report"]["rate_limit"]
+            if macro_report is not None
+            else 1.0
+        )
+
+        order, amount = report["order"], report["amount"]
+        if order == "buy":
+            limit = rate_limit - coin_ratio
+        elif order == "sell":
+            limit = coin_ratio
+        else:
+            return []
+        if round(amount, 4) <= round(limit, 4):
+            return []
+
+        repaired = floor_fraction(limit, 3)
+        if repaired <= 0.0:
+            report.update(order="hold", amount=0.0)
+            return [f"order: {order!r} -> 'hold' (amount {amount!r} 불가)"]
+        report["amount"] = repaired
+        return [f"amount: {amount!r} -> {repaired!r} ({order} 한도)"]
+
     async def close(self):
         await self.on_reset(cancellation_token=CancellationToken())
         # await self._client.close()
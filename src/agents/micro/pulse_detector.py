@@ -5,17 +5,22 @@ import pydantic
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.messages import MultiModalMessage, TextMessage
 from autogen_core import CancellationToken
-from autogen_ext.models.ollama import OllamaChatCompletionClient
 from autogen_ext.models.openai import OpenAIChatCompletionClient
-from matplotlib import pyplot as plt
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, Field, ValidationError
 
-from src.utils.image_utils import get_agentic_image
+from src.agents.model_client import create_model_client
+from src.agents.output_repair import (
+    RepairableResponse,
+    get_output_repair_stats,
+    max_output_retries,
+)
+from src.agents.prompt_encoder import PromptEncoder
+from src.utils.image_utils import ChartImage, get_agentic_image
 
 
 class PulseResponse(BaseModel):
     pulse: Literal["상승 돌파", "하락 돌파", "돌파 없음"]
-    strength: float
+    strength: float = Field(ge=0.0, le=1.0)
 
     @pydantic.field_validator("strength")
     @classmethod
@@ -28,14 +33,18 @@ class PulseResponse(BaseModel):
         return v
 
 
-class PulseDetectorResponse(BaseModel):
+class PulseDetectorResponse(RepairableResponse):
+    # strength는 검증 전에 0~1, 소수점 두 자리로 보정
+    repair_fields = {"strength": 2}
+
     thoughts: str
     response: PulseResponse
 
 
 class PulseDetector(AssistantAgent):
     def __init__(self):
-        self._client = OllamaChatCompletionClient(model="gemma3:27b")
+        self._encoder = PromptEncoder.from_env()
+        self._client = create_model_client("pulse_detector")
         # self._client = OpenAIChatCompletionClient(
         #     model="gpt-4o-mini", api_key=getenv("OPENAI_API_KEY")
         # )
@@ -75,16 +84,21 @@ class PulseDetector(AssistantAgent):
             ),
         )
 
-    async def detect(self, price_data: Dict[str, Any], fig: Any) -> Dict[str, Any]:
-        image = get_agentic_image(fig)
-        plt.close(fig)
+    async def detect(
+        self, price_data: Dict[str, Any], chart: ChartImage
+    ) -> Dict[str, Any]:
+        image = get_agentic_image(chart)
 
         base_mm = MultiModalMessage(
-            content=[image, f"{price_data}"],
+            content=[image, self._encoder.encode(price_data)],
             source="data_preprocessor",
         )
         messages = [base_mm]
-        while True:  # 최대 5회 반복
+        stats = get_output_repair_stats()
+        # 범위/자리수 위반은 출력 모델에서 고치므로, 재시도는 읽을 수 없는 출력일 때만
+        for attempt in range(max_output_retries() + 1):
+            if attempt:
+                stats.record_retry(self.name)
             try:
                 response = await self.run(task=messages)
                 content = response.messages[-1].content
@@ -93,6 +107,7 @@ class PulseDetector(AssistantAgent):
 
                 thoughts = content.thoughts
                 pulse_report = content.response
+                stats.record_response(self.name, content.repairs)
 
                 report = pulse_report.dict()
                 report["reason"] = thoughts
@@ -100,17 +115,23 @@ class PulseDetector(AssistantAgent):
                 await self.close()
                 return report
             except ValidationError as e:  # ← ValidationError 잡기
-                feedback = TextMessage(
-                    content=(
-                        "JSON schema validation failed:"
-                        f"{e}\n\n"
-                        "규칙:\n"
-                        "1. pulse는 '상승 돌파', '하락 돌파', '돌파 없음' 중 하나.\n"
-                        " strength는 0.0 ~ 1.0 사이 소수점 두 자리.\n"
-                    ),
-                    source="validator",
-                )
-                messages.append(feedback)
+                # 이전 요청과 응답은 모델 컨텍스트에 남아 있으므로 피드백만 보냄
+                messages = [
+                    TextMessage(
+                        content=(
+                            "JSON schema validation failed:"
+                            f"{e}\n\n"
+                            "규칙:\n"
+                            "1. pulse는 '상승 돌파', '하락 돌파', '돌파 없음' 중 하나.\n"
+                            " strength는 0.0 ~ 1.0 사이 소수점 두 자리.\n"
+                        ),
+                        source="validator",
+                    )
+                ]
+        print(f"PulseDetector: {attempt}회 재시도 후에도 오류 발생, 돌파 없음으로 처리")
+        stats.record_fallback(self.name)
+        await self.close()
+        return {"pulse": "돌파 없음", "strength": 0.0, "reason": ""}
 
     async def close(self):
         await self.on_reset(cancellation_token=CancellationToken())
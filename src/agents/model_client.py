@@ -0,0 +1,76 @@
+from os import getenv
+
+from autogen_core.models import ChatCompletionClient, ModelFamily, ModelInfo
+
+from src.agents.client_pool import get_model_client_registry
+from src.agents.llm_cache import (
+    LLM_CACHE_MODES,
+    LLMResponseCache,
+    RecordReplayChatCompletionClient,
+)
+from src.agents.llm_limiter import (
+    ConcurrencyLimitedChatCompletionClient,
+    get_llm_limiter,
+)
+from src.agents.token_accounting import TokenAccountingChatCompletionClient
+
+DEFAULT_MODEL = "gemma3:27b"
+
+# autogen-ext 0.5.6의 Ollama 모델 정보 테이블에 gemma3가 없어 직접 지정
+MODEL_INFO = {
+    "gemma3": ModelInfo(
+        vision=True,
+        function_calling=False,
+        json_output=True,
+        family=ModelFamily.UNKNOWN,
+        structured_output=True,
+    ),
+}
+
+
+def create_model_client(
+    agent_name: str, model: str = DEFAULT_MODEL
+) -> ChatCompletionClient:
+    """
+    에이전트용 모델 클라이언트 생성
+    - 실제 HTTP 클라이언트는 레지스트리에서 (provider, model, endpoint)마다 하나를
+      모든 에이전트/실행이 공유 (keep-alive 연결 풀, 엔드포인트 동시 요청 한도/타임아웃)
+    - OLLAMA_HOSTS에 엔드포인트를 여러 개(쉼표 구분) 지정하면 진행 중인 요청이
+      가장 적은 곳으로 나눠 보내고, 느린 요청은 다른 엔드포인트로 hedging
+    - set_llm_semaphore()로 전역 한도가 지정되어 있으면 호출마다 한도를 획득
+    - LLM_CACHE_MODE (off | record | replay | record_missing, 기본 off)가 off가 아니면
+      LLM_CACHE_DIR(기본 data/llm_cache)에 응답을 기록/재생하는 클라이언트로 감쌈
+    - 가장 바깥에서 호출별 입력/출력 토큰을 세어 현재 실행의 TokenLedger에 기록
+    """
+    registry = get_model_client_registry()
+    model_info = MODEL_INFO.get(model.split(":")[0])
+    hosts = [host.strip() for host in getenv("OLLAMA_HOSTS", "").split(",")]
+    hosts = [host for host in hosts if host]
+    if len(hosts) > 1:
+        client = registry.router(model, hosts, model_info=model_info)
+    else:
+        client = registry.get(
+            model, model_info=model_info, host=hosts[0] if hosts else None
+        )
+
+    # 전역 동시 호출 한도 (캐시 적중은 한도를 쓰지 않도록 캐시보다 안쪽에서 감쌈)
+    limiter = get_llm_limiter()
+    if limiter is not None:
+        client = ConcurrencyLimitedChatCompletionClient(client, limiter)
+
+    mode = getenv("LLM_CACHE_MODE", "off")
+    if mode not in LLM_CACHE_MODES:
+        raise ValueError(
+            f"LLM_CACHE_MODE는 {', '.join(LLM_CACHE_MODES)} 중 하나여야 합니다: {mode}"
+        )
+    if mode != "off":
+        client = RecordReplayChatCompletionClient(
+            client,
+            agent_name=agent_name,
+            model=model,
+            cache=LLMResponseCache(getenv("LLM_CACHE_DIR", "data/llm_cache")),
+            mode=mode,
+        )
+
+    # 캐시 적중을 포함한 모든 호출의 프롬프트 토큰을 실행의 TokenLedger에 기록
+    return TokenAccountingChatCompletionClient(client, agent_name)
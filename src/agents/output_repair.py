@@ -0,0 +1,147 @@
+import math
+import threading
+from collections import defaultdict
+from os import getenv
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
+
+import pydantic
+from pydantic import PrivateAttr
+
+from src.agents.output_schema import StructuredResponse
+
+# 규칙 위반이 아닌, 고칠 수 없는 출력에만 모델을 다시 호출하는 최대 횟수
+DEFAULT_MAX_RETRIES = 2
+
+
+def max_output_retries() -> int:
+    """LLM_OUTPUT_RETRIES: 출력 검증 실패 시 모델 재호출 최대 횟수 (기본 2)"""
+    return int(getenv("LLM_OUTPUT_RETRIES", str(DEFAULT_MAX_RETRIES)))
+
+
+def _number(value: Any) -> Optional[float]:
+    """숫자로 읽을 수 있으면 float (bool/NaN/inf/그 밖의 값은 None)"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            return None
+    if not isinstance(value, (int, float)) or not math.isfinite(value):
+        return None
+    return float(value)
+
+
+def round_fraction(
+    value: float, decimals: int, low: float = 0.0, high: float = 1.0
+) -> float:
+    """[low, high]로 자르고 소수점 decimals자리로 반올림"""
+    return round(min(max(value, low), high), decimals)
+
+
+def floor_fraction(value: float, decimals: int) -> float:
+    """
+    소수점 decimals자리로 내림 (0 미만은 0)
+    - 0.5 - 0.4 = 0.09999999999999998 같은 오차는 내리기 전에 정리
+    """
+    scale = 10**decimals
+    return max(math.floor(round(value * scale, 6)) / scale, 0.0)
+
+
+class RepairableResponse(StructuredResponse):
+    """
+    에이전트 출력(thoughts + response) 모델의 기반 클래스
+    - 검증 전에 response의 repair_fields(필드 -> 소수점 자리수)를 0~1로 자르고
+      반올림해, 범위/자리수 위반만으로 모델을 다시 호출하지 않게 함
+    - 고친 내용은 repairs에 "필드: 원래 값 -> 고친 값"으로 남김
+    - 숫자로 읽을 수 없는 값은 그대로 두어 원래 검증기에서 실패
+    - JSON 스키마는 바뀌지 않음 (구조화 출력 형식과 LLM 캐시 키 유지)
+    """
+
+    repair_fields: ClassVar[Dict[str, int]] = {}
+    _repairs: List[str] = PrivateAttr(default_factory=list)
+
+    @pydantic.model_validator(mode="wrap")
+    @classmethod
+    def repair_response(cls, data: Any, handler: Any) -> Any:
+        # 이미 만든 인스턴스를 다시 검증할 때(StructuredMessage 등)는 repairs 유지
+        if not isinstance(data, dict):
+            return handler(data)
+        repairs: List[str] = []
+        if isinstance(data.get("response"), dict):
+            response = dict(data["response"])
+            for field, decimals in cls.repair_fields.items():
+                if field not in response:
+                    continue
+                number = _number(response[field])
+                if number is None:
+                    continue
+                repaired = round_fraction(number, decimals)
+                if repaired != number or isinstance(response[field], str):
+                    repairs.append(f"{field}: {response[field]!r} -> {repaired!r}")
+                response[field] = repaired
+            data = {**data, "response": response}
+        instance = handler(data)
+        instance._repairs = repairs
+        return instance
+
+    @property
+    def repairs(self) -> List[str]:
+        return self._repairs
+
+
+class OutputRepairStats:
+    """
+    에이전트별 출력 보정/재시도 통계
+    - responses: 받아들인 응답 수 / repaired: 그중 로컬에서 고친 응답 수
+    - retries: 모델 재호출 수 / fallbacks: 재시도 한도를 넘겨 기본값을 쓴 수
+    - fields: 필드별 보정 횟수
+    """
+
+    COUNTERS: Tuple[str, ...] = ("responses", "repaired", "retries", "fallbacks")
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(self.COUNTERS, 0)
+        )
+        self._fields: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def record_response(self, agent_name: str, repairs: List[str]) -> None:
+        with self._lock:
+            counts = self._counts[agent_name]
+            counts["responses"] += 1
+            if repairs:
+                counts["repaired"] += 1
+                for repair in repairs:
+                    self._fields[agent_name][repair.split(":", 1)[0]] += 1
+        if repairs:
+            print(f"[{agent_name}] 출력 보정: {', '.join(repairs)}")
+
+    def record_retry(self, agent_name: str) -> None:
+        with self._lock:
+            self._counts[agent_name]["retries"] += 1
+
+    def record_fallback(self, agent_name: str) -> None:
+        with self._lock:
+            self._counts[agent_name]["fallbacks"] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                agent_name: {**counts, "fields": dict(self._fields[agent_name])}
+                for agent_name, counts in self._counts.items()
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._fields.clear()
+
+
+# 프로세스 전체에서 공유하는 통계
+_stats = OutputRepairStats()
+
+
+def get_output_repair_stats() -> OutputRepairStats:
+    return _stats
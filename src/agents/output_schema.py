@@ -0,0 +1,93 @@
+from os import getenv
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+from pydantic.json_schema import (
+    DEFAULT_REF_TEMPLATE,
+    GenerateJsonSchema,
+    JsonSchemaMode,
+    JsonSchemaValue,
+)
+from pydantic_core import CoreSchema
+
+# strict: 제약 디코딩용 스키마 / plain: pydantic 기본 스키마 (비교·호환용)
+OUTPUT_SCHEMA_MODES = ("strict", "plain")
+
+
+class StructuredOutputSchema(GenerateJsonSchema):
+    """
+    백엔드 제약 디코딩(Ollama format, OpenAI structured outputs)에 넘길 JSON 스키마
+    - $ref/$defs를 펼쳐 하나의 스키마로 만듦 (참조를 풀지 못하는 백엔드 대비)
+    - 모든 object에 additionalProperties: false, 모든 속성을 required로 둠
+      (OpenAI strict 모드 조건, 문법 변환 시 키 이름/개수도 고정)
+    - Literal은 enum, Field(ge=, le=)는 minimum/maximum으로 그대로 남음
+    """
+
+    def generate(
+        self, schema: CoreSchema, mode: JsonSchemaMode = "validation"
+    ) -> JsonSchemaValue:
+        json_schema = super().generate(schema, mode=mode)
+        defs = json_schema.pop("$defs", {})
+        return _strict(_inline(json_schema, defs))
+
+
+def _inline(node: Any, defs: Dict[str, Any]) -> Any:
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if ref is not None:
+            target = _inline(defs[ref.rsplit("/", 1)[-1]], defs)
+            # $ref 옆에 붙은 키(description 등)는 펼친 스키마에 덮어씀
+            extra = {k: _inline(v, defs) for k, v in node.items() if k != "$ref"}
+            return {**target, **extra}
+        return {k: _inline(v, defs) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_inline(v, defs) for v in node]
+    return node
+
+
+def _strict(node: Any) -> Any:
+    if isinstance(node, dict):
+        node = {k: _strict(v) for k, v in node.items()}
+        if node.get("type") == "object" and "properties" in node:
+            node["additionalProperties"] = False
+            node["required"] = list(node["properties"])
+        return node
+    if isinstance(node, list):
+        return [_strict(v) for v in node]
+    return node
+
+
+def output_schema_generator() -> type[GenerateJsonSchema]:
+    """LLM_OUTPUT_SCHEMA (strict | plain, 기본 strict)에 맞는 스키마 생성기"""
+    mode = getenv("LLM_OUTPUT_SCHEMA", "strict")
+    if mode not in OUTPUT_SCHEMA_MODES:
+        raise ValueError(
+            f"LLM_OUTPUT_SCHEMA는 {', '.join(OUTPUT_SCHEMA_MODES)} 중 하나여야 합니다: "
+            f"{mode}"
+        )
+    return StructuredOutputSchema if mode == "strict" else GenerateJsonSchema
+
+
+class StructuredResponse(BaseModel):
+    """
+    에이전트 출력 모델의 기반 클래스
+    - model_json_schema()가 StructuredOutputSchema를 기본으로 써서,
+      autogen이 json_output으로 넘기는 스키마가 그대로 백엔드 제약 디코딩에 쓰임
+      (enum/범위를 벗어나거나 키가 틀린 출력은 생성 단계에서 막힘)
+    - 검증은 pydantic 모델 그대로 (스키마로 표현하지 못하는 자리수 규칙 등)
+    """
+
+    @classmethod
+    def model_json_schema(
+        cls,
+        by_alias: bool = True,
+        ref_template: str = DEFAULT_REF_TEMPLATE,
+        schema_generator: Optional[type[GenerateJsonSchema]] = None,
+        mode: JsonSchemaMode = "validation",
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        if schema_generator is None:
+            schema_generator = output_schema_generator()
+        return super().model_json_schema(
+            by_alias, ref_template, schema_generator, mode, **kwargs
+        )
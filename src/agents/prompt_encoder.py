@@ -0,0 +1,68 @@
+import json
+import math
+from os import getenv
+from typing import Any, Sequence
+
+
+class PromptEncoder:
+    """
+    에이전트 입력 데이터(가격 데이터, 상위 리포트, 포트폴리오 비율)를 짧은 JSON으로 인코딩
+    - 상위 리포트의 drop_keys(기본 reason: 앞 에이전트의 생각 과정)는 뺌
+    - 실수는 유효숫자 digits자리로 반올림 (가격·거래량·지표 모두 같은 상대 정밀도,
+      정수부는 그대로)
+    - NaN/inf는 null, 공백 없는 JSON (separators=(",", ":"), 한글은 그대로)
+    - 프롬프트 길이가 곧 prefill 시간이라 indent=4 JSON/파이썬 repr 대신 사용
+    """
+
+    def __init__(self, digits: int = 6, drop_keys: Sequence[str] = ("reason",)):
+        if digits < 1:
+            raise ValueError(f"[PromptEncoder] digits는 1 이상이어야 합니다: {digits}")
+        self.digits = digits
+        self.drop_keys = frozenset(drop_keys)
+
+    @classmethod
+    def from_env(cls) -> "PromptEncoder":
+        """
+        환경 변수 설정
+        - LLM_PROMPT_DIGITS: 실수 유효숫자 자리수 (기본 6)
+        - LLM_PROMPT_REASON: on이면 상위 리포트의 reason을 포함 (기본 off)
+        """
+        include_reason = getenv("LLM_PROMPT_REASON", "off") == "on"
+        return cls(
+            digits=int(getenv("LLM_PROMPT_DIGITS", "6")),
+            drop_keys=() if include_reason else ("reason",),
+        )
+
+    def compact(self, value: Any) -> Any:
+        """JSON으로 바꿀 수 있는 값으로 정리 (dict/list는 재귀)"""
+        if isinstance(value, dict):
+            return {
+                str(key): self.compact(item)
+                for key, item in value.items()
+                if key not in self.drop_keys
+            }
+        if isinstance(value, (list, tuple)):
+            return [self.compact(item) for item in value]
+        if value is None or isinstance(value, (bool, int, str)):
+            return value
+        if isinstance(value, float) or hasattr(value, "__float__"):
+            number = float(value)
+            if not math.isfinite(number):
+                return None
+            rounded = self._round(number)
+            # 정수값 실수는 정수로 (2328181.0 -> 2328181)
+            return int(rounded) if rounded.is_integer() else rounded
+        # Timestamp 등
+        return str(value)
+
+    def _round(self, number: float) -> float:
+        """유효숫자 digits자리로 반올림 (정수부는 자르지 않음: KRW 가격은 그대로)"""
+        if number == 0.0:
+            return 0.0
+        integer_digits = math.floor(math.log10(abs(number))) + 1
+        return round(number, max(self.digits - integer_digits, 0))
+
+    def encode(self, value: Any) -> str:
+        return json.dumps(
+            self.compact(value), ensure_ascii=False, separators=(",", ":")
+        )
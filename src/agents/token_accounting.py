@@ -0,0 +1,248 @@
+import contextlib
+import functools
+import math
+import threading
+from collections import defaultdict
+from contextvars import ContextVar
+from os import getenv
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import pandas as pd
+from autogen_core import CancellationToken, Image
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    SystemMessage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from src.agents.client_wrapper import ChatCompletionClientWrapper
+
+DEFAULT_ENCODING = "o200k_base"
+
+# 호출별로 세는 항목
+# - system: 시스템 프롬프트 / input: 첫 사용자 메시지(가격 데이터·리포트) 텍스트
+# - history: 그 뒤의 대화(이전 응답, 검증 피드백) / images: 이미지 수
+# - output: 응답 / backend_*: 백엔드가 보고한 토큰 수 (모델 토크나이저 기준)
+LEDGER_FIELDS: Tuple[str, ...] = (
+    "calls",
+    "cached",
+    "system",
+    "input",
+    "history",
+    "images",
+    "output",
+    "backend_prompt",
+    "backend_completion",
+)
+
+
+class TokenCounter:
+    """
+    tiktoken으로 텍스트 토큰 수를 셈
+    - 모델(gemma3 등) 토크나이저와 달라 절대값이 아닌 상대 비교용
+    - 인코딩 파일을 받을 수 없으면(오프라인) UTF-8 바이트 수 / 4로 근사
+    - 같은 텍스트(시스템 프롬프트 등)는 한 번만 인코딩
+    """
+
+    def __init__(self, encoding_name: str = DEFAULT_ENCODING):
+        try:
+            import tiktoken
+
+            self._encoding = tiktoken.get_encoding(encoding_name)
+            self.encoding_name = encoding_name
+        except Exception as e:
+            print(f"[TokenCounter] tiktoken 인코딩을 불러오지 못해 근사치 사용: {e}")
+            self._encoding = None
+            self.encoding_name = "approx"
+        self.count = functools.lru_cache(maxsize=1024)(self._count)
+
+    def _count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is None:
+            return math.ceil(len(text.encode("utf-8")) / 4)
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def count_message(self, message: LLMMessage) -> Tuple[int, int]:
+        """(텍스트 토큰 수, 이미지 수)"""
+        content = message.content
+        if isinstance(content, str):
+            return self.count(content), 0
+        tokens = images = 0
+        for part in content:
+            if isinstance(part, Image):
+                images += 1
+            elif isinstance(part, str):
+                tokens += self.count(part)
+            else:
+                # 함수 호출 등
+                tokens += self.count(str(part))
+        return tokens, images
+
+
+_counter: Optional[TokenCounter] = None
+_counter_lock = threading.Lock()
+
+
+def get_token_counter() -> TokenCounter:
+    """프로세스에서 공유하는 카운터 (LLM_TOKEN_ENCODING, 기본 o200k_base)"""
+    global _counter
+    with _counter_lock:
+        if _counter is None:
+            _counter = TokenCounter(getenv("LLM_TOKEN_ENCODING", DEFAULT_ENCODING))
+        return _counter
+
+
+# 현재 실행(run)의 토큰 장부 (PortfolioManager.activate와 같은 방식)
+_current_ledger: ContextVar[Optional["TokenLedger"]] = ContextVar(
+    "current_token_ledger", default=None
+)
+
+
+class TokenLedger:
+    """
+    실행 하나의 에이전트별 토큰 사용량
+    - activate()한 with 블록 안(과 그 안에서 만든 task)의 모델 호출이 기록됨
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(LEDGER_FIELDS, 0)
+        )
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator["TokenLedger"]:
+        token = _current_ledger.set(self)
+        try:
+            yield self
+        finally:
+            _current_ledger.reset(token)
+
+    def record(self, agent_name: str, counts: Mapping[str, int]) -> None:
+        with self._lock:
+            row = self._rows[agent_name]
+            for key, value in counts.items():
+                row[key] += value
+
+    def report(self) -> pd.DataFrame:
+        """
+        에이전트별 합계와 호출당 평균 입력 토큰, 입력 토큰 중 비중
+        - prompt = system + input + history (이미지 제외)
+        """
+        with self._lock:
+            rows = {agent: dict(row) for agent, row in self._rows.items()}
+        report = pd.DataFrame.from_dict(
+            rows, orient="index", columns=list(LEDGER_FIELDS)
+        )
+        if report.empty:
+            return report
+        report.loc["total"] = report.sum()
+        report["prompt"] = report["system"] + report["input"] + report["history"]
+        report["prompt_per_call"] = (report["prompt"] / report["calls"]).round(1)
+        total_prompt = report.loc["total", "prompt"]
+        report["prompt_share"] = (report["prompt"] / total_prompt).round(3)
+        return report
+
+
+def current_token_ledger() -> Optional[TokenLedger]:
+    return _current_ledger.get()
+
+
+class TokenAccountingChatCompletionClient(ChatCompletionClientWrapper):
+    """
+    호출마다 입력/출력 토큰을 세어 현재 실행의 TokenLedger에 기록하는 클라이언트
+    - 활성화된 장부가 없으면(실행 밖 호출) 세지 않음
+    """
+
+    def __init__(self, client: ChatCompletionClient, agent_name: str):
+        super().__init__(client)
+        self.agent_name = agent_name
+
+    def _prompt_counts(self, messages: Sequence[LLMMessage]) -> Dict[str, int]:
+        counter = get_token_counter()
+        counts = dict.fromkeys(("system", "input", "history", "images"), 0)
+        seen_input = False
+        for message in messages:
+            tokens, images = counter.count_message(message)
+            if isinstance(message, SystemMessage):
+                key = "system"
+            elif not seen_input:
+                key, seen_input = "input", True
+            else:
+                key = "history"
+            counts[key] += tokens
+            counts["images"] += images
+        return counts
+
+    def _record(self, messages: Sequence[LLMMessage], result: CreateResult) -> None:
+        ledger = current_token_ledger()
+        if ledger is None:
+            return
+        counts = self._prompt_counts(messages)
+        content = result.content
+        if not isinstance(content, str):
+            content = str(content)
+        counts.update(
+            calls=1,
+            cached=int(bool(result.cached)),
+            output=get_token_counter().count(content),
+            backend_prompt=result.usage.prompt_tokens,
+            backend_completion=result.usage.completion_tokens,
+        )
+        ledger.record(self.agent_name, counts)
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        result = await self.client.create(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        self._record(messages, result)
+        return result
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        async def _generator() -> AsyncGenerator[Union[str, CreateResult], None]:
+            async for chunk in self.client.create_stream(
+                messages,
+                tools=tools,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            ):
+                if isinstance(chunk, CreateResult):
+                    self._record(messages, chunk)
+                yield chunk
+
+        return _generator()
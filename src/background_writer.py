@@ -0,0 +1,109 @@
+import asyncio
+import atexit
+import queue
+import threading
+import weakref
+from typing import Any, Callable, List
+
+# 프로세스 종료 시 남은 쓰기를 마치기 위해 열려 있는 writer를 추적
+_open_writers: "weakref.WeakSet[BackgroundWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all() -> None:
+    for writer in list(_open_writers):
+        try:
+            writer.close()
+        except BackgroundWriteError as e:
+            print(e)
+
+
+class BackgroundWriteError(RuntimeError):
+    """백그라운드 쓰기 작업이 실패했음을 실행(run)에 알리는 예외"""
+
+
+class BackgroundWriter:
+    """
+    - 디스크 쓰기 작업을 전용 스레드 하나에서 순서대로 실행
+    - 큐 크기는 max_pending으로 제한, 가득 차면 submit()이 자리가 날 때까지 대기
+      (디스크가 밀리면 생산 속도를 늦추는 backpressure)
+    - 이벤트 루프에서는 asubmit()으로 예약 (큐가 가득 차면 루프를 막지 않고
+      다른 스레드에서 자리를 기다림)
+    - 작업에서 난 예외는 모아 두었다가 다음 submit()/flush()/close()에서
+      BackgroundWriteError로 던짐
+    - 이벤트 루프에서는 aflush()/aclose()로 루프를 막지 않고 기다림
+    """
+
+    def __init__(self, max_pending: int = 256, name: str = "background-writer"):
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+        self._errors: List[BaseException] = []
+        self._errors_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        _open_writers.add(self)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """쓰기 작업 예약 (앞선 작업이 실패했으면 예약하지 않고 예외)"""
+        self._queue.put(self._item(fn, args, kwargs))
+
+    async def asubmit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """이벤트 루프용 submit() (큐가 가득 차면 스레드에서 자리를 기다림)"""
+        item = self._item(fn, args, kwargs)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            await asyncio.to_thread(self._queue.put, item)
+
+    def _item(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        if self._closed:
+            raise RuntimeError("[BackgroundWriter] 이미 닫힌 writer입니다.")
+        self.raise_errors()
+        return fn, args, kwargs
+
+    def flush(self) -> None:
+        """예약된 작업이 모두 끝날 때까지 대기"""
+        self._queue.join()
+        self.raise_errors()
+
+    def close(self) -> None:
+        """남은 작업을 마치고 스레드 종료"""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+            _open_writers.discard(self)
+        self.raise_errors()
+
+    async def aflush(self) -> None:
+        await asyncio.to_thread(self.flush)
+
+    async def aclose(self) -> None:
+        await asyncio.to_thread(self.close)
+
+    def raise_errors(self) -> None:
+        with self._errors_lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            raise BackgroundWriteError(
+                f"[BackgroundWriter] 쓰기 작업 {len(errors)}건 실패: {errors[0]!r}"
+            ) from errors[0]
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                fn, args, kwargs = item
+                try:
+                    fn(*args, **kwargs)
+                except Exception as e:
+                    with self._errors_lock:
+                        self._errors.append(e)
+            finally:
+                self._queue.task_done()
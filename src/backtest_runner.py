@@ -0,0 +1,156 @@
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import time
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+from dotenv import load_dotenv
+
+from src.agents.client_pool import get_model_client_registry
+from src.agents.llm_limiter import set_llm_semaphore
+
+SUMMARY_KEYS = ["coin", "trend", "system_mode", "start_date", "end_date"]
+
+
+def _init_worker(semaphore: Any) -> None:
+    """워커 프로세스가 모든 백테스트에 걸친 LLM 동시 호출 한도를 공유하도록 설정"""
+    set_llm_semaphore(semaphore)
+
+
+def run_backtest(config: Dict[str, Any], run_id: str, log_dir: str) -> Dict[str, Any]:
+    """
+    설정 하나를 백테스트하고 결과를 반환 (워커 프로세스에서 실행)
+    - 실행 중 출력은 log_dir/{run_id}.log 로 보냄
+    - 실패해도 예외 대신 error를 담아 반환해 다른 실행은 계속 진행
+    """
+    from src.trading_system import create_system
+
+    start_time = time()
+    result = {"run_id": run_id, **config}
+    log_path = os.path.join(log_dir, f"{run_id}.log")
+    with open(log_path, "w", encoding="utf-8") as log:
+        with contextlib.redirect_stdout(log):
+            try:
+                result["performance"] = create_system(**config, run_id=run_id).run()
+            except Exception:
+                traceback.print_exc(file=log)
+                result["error"] = traceback.format_exc(limit=1).strip()
+    result["elapsed"] = time() - start_time
+    return result
+
+
+async def _run_in_loop(
+    configs: List[Dict[str, Any]],
+    llm_concurrency: int,
+    on_result: Callable[[int, Dict[str, Any]], None],
+) -> None:
+    """모든 설정을 현재 이벤트 루프에서 동시에 실행 (포트폴리오는 실행마다 분리됨)"""
+    from src.trading_system import TradingSystem
+
+    # 모든 실행이 이 루프 안에 있으므로 스레드 없이 기다리는 asyncio 세마포어
+    set_llm_semaphore(asyncio.Semaphore(llm_concurrency))
+
+    async def run_one(i: int, config: Dict[str, Any]) -> None:
+        start_time = time()
+        run_id = f"run{i:02d}"
+        result = {"run_id": run_id, **config}
+        try:
+            system = TradingSystem(**config, run_id=run_id)
+            result["performance"] = await system.run()
+        except Exception:
+            traceback.print_exc()
+            result["error"] = traceback.format_exc(limit=1).strip()
+        result["elapsed"] = time() - start_time
+        on_result(i, result)
+
+    try:
+        await asyncio.gather(*(run_one(i, config) for i, config in enumerate(configs)))
+    finally:
+        set_llm_semaphore(None)
+        # 모든 실행이 공유한 모델 클라이언트 연결 풀을 루프가 끝나기 전에 닫음
+        await get_model_client_registry().aclose()
+
+
+def run_configs(
+    configs: List[Dict[str, Any]],
+    max_workers: int | None = None,
+    llm_concurrency: int = 4,
+    results_path: str = "data/results/backtest_results.jsonl",
+    mode: str = "process",
+) -> List[Dict[str, Any]]:
+    """
+    여러 설정을 동시에 백테스트
+    - mode="process": 워커 프로세스(max_workers개)에서 실행, 출력은 실행별 로그 파일로
+    - mode="loop": 현재 프로세스의 이벤트 루프 하나에서 모든 실행을 동시에 진행
+    - 모든 실행이 하나의 세마포어로 LLM 동시 호출 수(llm_concurrency)를 공유
+    - 끝나는 대로 results_path(JSONL)에 한 줄씩 기록
+    - 반환값은 configs 순서의 결과 목록
+    """
+    if mode not in ("process", "loop"):
+        raise ValueError(f"mode는 'process' 또는 'loop'만 가능합니다: {mode}")
+    directory = os.path.dirname(results_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    results: List[Dict[str, Any] | None] = [None] * len(configs)
+    start_time = time()
+    with open(results_path, "w", encoding="utf-8") as f:
+
+        def on_result(i: int, result: Dict[str, Any]) -> None:
+            results[i] = result
+            f.write(json.dumps(result, ensure_ascii=False, default=float) + "\n")
+            f.flush()
+            status = "error" if "error" in result else result["performance"]
+            print(
+                f"[{sum(r is not None for r in results)}/{len(configs)}] "
+                f"{result['run_id']} ({result['elapsed']:.1f}s): {status}"
+            )
+
+        if mode == "loop":
+            load_dotenv()
+            asyncio.run(_run_in_loop(configs, llm_concurrency, on_result))
+        else:
+            log_dir = os.path.splitext(results_path)[0] + "_logs"
+            os.makedirs(log_dir, exist_ok=True)
+            context = multiprocessing.get_context()
+            with ProcessPoolExecutor(
+                max_workers=max_workers or len(configs) or 1,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(context.BoundedSemaphore(llm_concurrency),),
+            ) as executor:
+                futures = {
+                    executor.submit(run_backtest, config, f"run{i:02d}", log_dir): i
+                    for i, config in enumerate(configs)
+                }
+                for future in as_completed(futures):
+                    on_result(futures[future], future.result())
+
+    print(f"Total time taken for all backtests: {time() - start_time:.2f} seconds")
+    return results
+
+
+def summarize(results: List[Dict[str, Any]]) -> pd.DataFrame:
+    """같은 설정(코인/추세/모드/기간)의 반복 실행을 묶어 성과 지표 평균·표준편차 계산"""
+    rows = [
+        {**{key: result[key] for key in SUMMARY_KEYS}, **result["performance"]}
+        for result in results
+        if "performance" in result
+    ]
+    if not rows:
+        return pd.DataFrame()
+    df = pd.DataFrame(rows)
+    return df.groupby(SUMMARY_KEYS, sort=False).agg(
+        runs=("return", "size"),
+        return_mean=("return", "mean"),
+        return_std=("return", "std"),
+        mdd_mean=("mdd", "mean"),
+        sharpe_mean=("sharpe", "mean"),
+        sortino_mean=("sortino", "mean"),
+        calmar_mean=("calmar", "mean"),
+    )
@@ -0,0 +1,188 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+BASE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+class CandleStore:
+    """
+    - 캔들을 컬럼형 NumPy 구조체 배열에 저장 (용량이 부족하면 2배로 확장)
+    - 시간순으로 들어오는 캔들은 끝에 바로 append (fast path)
+    - 그 외의 시점은 searchsorted로 위치를 찾아 upsert (같은 시점은 keep="last")
+    - window()/row()/column()은 복사 없는 view를 반환
+    """
+
+    def __init__(
+        self,
+        columns: Iterable[str],
+        dtypes: Optional[Dict[str, Any]] = None,
+        capacity: int = 64,
+    ):
+        dtypes = dtypes or {}
+        self.columns: List[str] = list(columns)
+        self._dtype = np.dtype(
+            [("datetime", "datetime64[ns]")]
+            + [(col, self._numeric_dtype(dtypes.get(col))) for col in self.columns]
+        )
+        self._data = self._empty(max(int(capacity), 1))
+        self._size = 0
+
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame, columns: Iterable[str], capacity: int = 64
+    ) -> "CandleStore":
+        """초기 DataFrame을 dtype·정렬·중복 제거 후 한 번에 적재"""
+        columns = list(columns)
+        df = df.copy()
+        df["datetime"] = pd.to_datetime(df["datetime"])
+        df = df.drop_duplicates(subset="datetime", keep="last").sort_values(
+            "datetime", kind="stable"
+        )
+
+        present = [col for col in columns if col in df.columns]
+        store = cls(
+            columns,
+            dtypes={col: df[col].dtype for col in present},
+            capacity=max(capacity, len(df)),
+        )
+        n = len(df)
+        store._data["datetime"][:n] = df["datetime"].to_numpy(dtype="datetime64[ns]")
+        for col in present:
+            store._data[col][:n] = df[col].to_numpy()
+        store._size = n
+        return store
+
+    @classmethod
+    def from_array(cls, data: np.ndarray) -> "CandleStore":
+        """np.save로 저장된 구조체 배열(또는 memmap)을 복사 없이 감싸기"""
+        if data.dtype.names is None or data.dtype.names[0] != "datetime":
+            raise ValueError("[CandleStore] datetime 필드가 첫 컬럼인 구조체 배열이 필요합니다.")
+        store = cls.__new__(cls)
+        store.columns = list(data.dtype.names[1:])
+        store._dtype = data.dtype
+        store._data = data
+        store._size = len(data)
+        return store
+
+    def freeze(self) -> "CandleStore":
+        """읽기 전용으로 전환 (여러 실행이 공유하는 스토어를 실수로 고치지 않도록)"""
+        self._data.flags.writeable = False
+        return self
+
+    def to_array(self) -> np.ndarray:
+        return self._data[: self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    @property
+    def datetimes(self) -> np.ndarray:
+        return self._data["datetime"][: self._size]
+
+    def column(self, name: str) -> np.ndarray:
+        return self._data[name][: self._size]
+
+    def row(self, index: int) -> np.void:
+        if not -self._size <= index < self._size:
+            raise IndexError(f"[CandleStore] 인덱스 범위 초과: {index}")
+        return self._data[index % self._size]
+
+    def window(self, end: int, size: int) -> np.ndarray:
+        """end(미포함) 직전까지 최대 size개 캔들 (부족하면 가용 범위 전체)"""
+        end = min(max(end, 0), self._size)
+        return self._data[max(end - size, 0) : end]
+
+    def last_datetime(self) -> Optional[np.datetime64]:
+        return self._data["datetime"][self._size - 1] if self._size else None
+
+    def locate(self, dt: Any, side: str = "right") -> int:
+        return int(np.searchsorted(self.datetimes, self._to_datetime64(dt), side=side))
+
+    def upsert(self, row: Dict[str, Any]) -> Tuple[int, bool]:
+        """
+        row를 반영하고 (위치, 새 행 여부)를 반환
+        - 기존 시점이면 행 전체를 row 값으로 교체 (row에 없는 컬럼은 NaN)
+        """
+        dt = self._to_datetime64(row["datetime"])
+        n = self._size
+
+        # fast path: 시간순 append
+        if n == 0 or dt > self._data["datetime"][n - 1]:
+            self._reserve(n + 1)
+            self._write(n, dt, row)
+            self._size = n + 1
+            return n, True
+
+        pos = int(np.searchsorted(self.datetimes, dt, side="left"))
+        if self._data["datetime"][pos] == dt:
+            self._write(pos, dt, row)
+            return pos, False
+
+        # 과거 시점 삽입: 뒤쪽 행을 한 칸씩 민다 (드문 경우)
+        self._reserve(n + 1)
+        self._data[pos + 1 : n + 1] = self._data[pos:n]
+        self._write(pos, dt, row)
+        self._size = n + 1
+        return pos, True
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {name: self._data[name][: self._size] for name in self._dtype.names}
+        )
+
+    def _write(self, index: int, dt: np.datetime64, row: Dict[str, Any]) -> None:
+        for col in self.columns:
+            value = row.get(col)
+            if value is None:
+                value = np.nan
+            arr = self._data[col]
+            if arr.dtype.kind in "iu" and not float(value).is_integer():
+                self._promote(col)
+            self._data[col][index] = value
+        self._data["datetime"][index] = dt
+
+    def _reserve(self, size: int) -> None:
+        if size <= len(self._data):
+            return
+        capacity = len(self._data)
+        while capacity < size:
+            capacity *= 2
+        data = self._empty(capacity)
+        data[: self._size] = self._data[: self._size]
+        self._data = data
+
+    def _promote(self, col: str) -> None:
+        """정수 컬럼에 실수가 들어오면 float64로 승격"""
+        self._dtype = np.dtype(
+            [
+                (name, np.float64 if name == col else self._dtype[name])
+                for name in self._dtype.names
+            ]
+        )
+        data = self._empty(len(self._data))
+        for name in self._dtype.names:
+            data[name][: self._size] = self._data[name][: self._size]
+        self._data = data
+
+    def _empty(self, capacity: int) -> np.ndarray:
+        data = np.empty(capacity, dtype=self._dtype)
+        for name in self._dtype.names:
+            if data[name].dtype.kind == "f":
+                data[name].fill(np.nan)
+        return data
+
+    @staticmethod
+    def _numeric_dtype(dtype: Any) -> np.dtype:
+        if dtype is not None and np.dtype(dtype).kind in "iuf":
+            return np.dtype(dtype)
+        return np.dtype(np.float64)
+
+    @staticmethod
+    def _to_datetime64(dt: Any) -> np.datetime64:
+        return pd.Timestamp(dt).to_datetime64().astype("datetime64[ns]")
@@ -0,0 +1,206 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from src.chart_renderer import CHART_FIELDS
+from src.utils.image_utils import ChartImage
+
+
+class ChartCache:
+    """
+    - 캔들 윈도우(차트에 그려지는 필드)의 바이트 + 렌더링 설정의 해시를 키로 PNG를 저장
+    - 같은 윈도우는 코인/설정/실행이 달라도 한 번만 렌더링
+    - 디스크: cache_dir/{키 앞 2자리}/{키}.png, 전체 크기가 max_bytes를 넘으면
+      가장 오래 사용되지 않은 파일부터 삭제 (LRU)
+    - 메모리: 최근 memory_items개의 ChartImage를 유지
+    - archive(): 차트 보관 경로를 캐시 파일의 하드 링크로 만들어 중복 저장 방지
+    - 디스크 쓰기(store/archive)는 백그라운드 writer 스레드에서 호출해도 안전
+    - 이벤트 루프에서는 aget()으로 조회 (디스크 읽기/PNG 디코드를 스레드에서)
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "data/chart_cache",
+        max_bytes: int = 512 * 1024 * 1024,
+        memory_items: int = 256,
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, ChartImage]" = OrderedDict()
+        # 디스크 항목: 키 -> 파일 크기 (앞쪽일수록 오래 사용되지 않음)
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self._scan()
+        self._evict()
+
+    @staticmethod
+    def key(window: np.ndarray, settings: Dict[str, Any]) -> str:
+        """윈도우 값과 렌더링 설정이 같으면 같은 키 (dtype 차이는 무시)"""
+        digest = hashlib.sha1()
+        digest.update(
+            json.dumps(settings, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        )
+        digest.update(np.ascontiguousarray(window["datetime"], dtype="datetime64[ns]"))
+        for name in CHART_FIELDS[1:]:
+            digest.update(np.ascontiguousarray(window[name], dtype=np.float64))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[ChartImage]:
+        with self._lock:
+            chart = self._memory.get(key)
+            if chart is not None:
+                self._memory.move_to_end(key)
+                self._touch(key)
+                self.hits += 1
+                return chart
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                png = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self._forget(key)
+                self.misses += 1
+            return None
+
+        chart = ChartImage.from_png(png)
+        with self._lock:
+            if key not in self._entries:
+                # 다른 프로세스가 기록한 항목
+                self._entries[key] = len(png)
+                self._total_bytes += len(png)
+            self._touch(key)
+            self._remember(key, chart)
+            self.hits += 1
+        return chart
+
+    async def aget(self, key: str) -> Optional[ChartImage]:
+        # 메모리 적중도 mtime을 갱신하므로 조회 전체를 스레드에서 실행
+        return await asyncio.to_thread(self.get, key)
+
+    def put(self, key: str, chart: ChartImage) -> None:
+        """메모리에 기억하고 디스크에 저장 (remember() + store())"""
+        self.remember(key, chart)
+        self.store(key, chart)
+
+    def remember(self, key: str, chart: ChartImage) -> None:
+        """메모리에만 기억 (디스크 저장은 store()로 따로 할 수 있음)"""
+        with self._lock:
+            self._remember(key, chart)
+
+    def store(self, key: str, chart: ChartImage) -> None:
+        """PNG를 디스크 캐시에 저장"""
+        with self._lock:
+            if key in self._entries:
+                self._touch(key)
+                return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 동시에 같은 키를 쓰는 프로세스가 있어도 깨진 파일이 보이지 않도록 임시 파일 후 교체
+        tmp_path = f"{path}.tmp{os.getpid()}_{threading.get_ident()}"
+        with open(tmp_path, "wb") as f:
+            f.write(chart.png)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = len(chart.png)
+                self._total_bytes += len(chart.png)
+            self._evict()
+
+    def archive(self, key: str, save_path: str) -> str:
+        """
+        save_path(확장자가 없으면 .png)를 캐시 파일의 하드 링크로 교체
+        - 하드 링크를 만들 수 없으면 PNG 바이트를 복사
+        """
+        if not os.path.splitext(save_path)[1]:
+            save_path = f"{save_path}.png"
+        source = self._path(key)
+        tmp_path = f"{save_path}.tmp{os.getpid()}_{threading.get_ident()}"
+        try:
+            # 이미 같은 파일을 가리키면 그대로 둠 (rename은 같은 inode끼리 아무 일도 하지 않음)
+            if os.path.exists(save_path) and os.path.samefile(source, save_path):
+                return save_path
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            os.link(source, tmp_path)
+            os.replace(tmp_path, save_path)
+        except OSError:
+            chart = self.get(key)
+            if chart is None:
+                raise
+            chart.save(save_path)
+        return save_path
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+            }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.png")
+
+    def _scan(self) -> None:
+        """기존 캐시 파일을 마지막 사용 시각(mtime) 순으로 읽어 LRU 순서 복원"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        found = []
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(".png"):
+                    continue
+                stat = entry.stat()
+                found.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def _touch(self, key: str) -> None:
+        if key not in self._entries:
+            return
+        self._entries.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def _remember(self, key: str, chart: ChartImage) -> None:
+        self._memory[key] = chart
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _forget(self, key: str) -> None:
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+        self._memory.pop(key, None)
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            self._forget(key)
@@ -0,0 +1,188 @@
+from time import perf_counter
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+# mplfinance 'charles' 스타일과 동일한 색상
+UP_COLOR = "#006340"
+DOWN_COLOR = "#a02128"
+GRID_COLOR = "#a0a0a0"
+
+# 차트에 그려지는 필드 (volume은 그리지 않음)
+CHART_FIELDS = ["datetime", "open", "high", "low", "close"]
+
+# 차트 모양이 바뀌면 올려서 기존 차트 캐시를 무효화
+CHART_STYLE_VERSION = 1
+
+
+def _candle_widths(n: int) -> Tuple[float, float]:
+    """mplfinance width 테이블(30→60개 구간)을 보간한 (몸통 폭, 선 두께)"""
+    ratio = min(max((n - 30) / 30.0, 0.0), 1.0)
+    return 0.65 + (0.575 - 0.65) * ratio, 1.0 + (0.875 - 1.0) * ratio
+
+
+def _date_format(datetimes: pd.DatetimeIndex) -> str:
+    """mplfinance의 x축 날짜 포맷 결정 규칙"""
+    first, last = datetimes[0], datetimes[-1]
+    avg_days = (last - first) / pd.Timedelta(days=1) / len(datetimes)
+    if avg_days < 0.33:
+        return "%b %d, %H:%M" if last.date() != first.date() else "%H:%M"
+    return "%Y-%b-%d" if last.year != first.year else "%b %d"
+
+
+class _CandleChart:
+    """Agg Figure 하나와 캔들 artist들을 유지하며 데이터만 교체"""
+
+    def __init__(self, figsize: Tuple[float, float], title: str, ylabel: str):
+        self.figure = Figure(figsize=figsize, facecolor="w")
+        FigureCanvasAgg(self.figure)
+        self.figure.subplots_adjust(left=0.04, right=0.92, bottom=0.22, top=0.88)
+        self.figure.suptitle(title, fontsize="x-large", fontweight="semibold")
+
+        ax = self.figure.add_subplot(1, 1, 1)
+        ax.set_facecolor("w")
+        for spine in ax.spines.values():
+            spine.set_color("white")
+        ax.yaxis.tick_right()
+        ax.yaxis.set_label_position("right")
+        ax.set_ylabel(ylabel, fontsize="large", fontweight="semibold")
+        ax.grid(True, axis="y", color=GRID_COLOR, linestyle="--", linewidth=0.4)
+        ax.set_axisbelow(True)
+        ax.xaxis.set_major_locator(MaxNLocator(nbins=8, integer=True))
+        ax.xaxis.set_major_formatter(FuncFormatter(self._format_x))
+        ax.tick_params(axis="x", rotation=45)
+        self.ax = ax
+
+        self.wicks = LineCollection([], zorder=1)
+        self.bodies = PolyCollection([], zorder=2)
+        ax.add_collection(self.wicks)
+        ax.add_collection(self.bodies)
+        self.message = ax.text(
+            0.5,
+            0.5,
+            "No data available",
+            horizontalalignment="center",
+            verticalalignment="center",
+            transform=ax.transAxes,
+            visible=False,
+        )
+
+        self._labels: List[str] = []
+
+    def _format_x(self, x: float, pos=None) -> str:
+        ix = int(round(x))
+        if 0 <= ix < len(self._labels):
+            return self._labels[ix]
+        return ""
+
+    def update(self, window: np.ndarray) -> None:
+        n = len(window)
+        closes = window["close"].astype(float) if n else np.empty(0)
+        if n == 0 or np.isnan(closes).all():
+            self._labels = []
+            self.bodies.set_verts([])
+            self.wicks.set_segments([])
+            self.message.set_visible(True)
+            return
+        self.message.set_visible(False)
+
+        opens = window["open"].astype(float)
+        highs = window["high"].astype(float)
+        lows = window["low"].astype(float)
+        x = np.arange(n, dtype=float)
+
+        width, linewidth = _candle_widths(n)
+        half = width / 2.0
+        bottom = np.minimum(opens, closes)
+        top = np.maximum(opens, closes)
+        verts = np.empty((n, 4, 2))
+        verts[:, 0] = np.column_stack([x - half, bottom])
+        verts[:, 1] = np.column_stack([x - half, top])
+        verts[:, 2] = np.column_stack([x + half, top])
+        verts[:, 3] = np.column_stack([x + half, bottom])
+        segments = np.empty((n, 2, 2))
+        segments[:, 0] = np.column_stack([x, lows])
+        segments[:, 1] = np.column_stack([x, highs])
+
+        colors = np.where(closes >= opens, UP_COLOR, DOWN_COLOR)
+        self.bodies.set_verts(verts)
+        self.bodies.set_facecolor(colors)
+        self.bodies.set_edgecolor(colors)
+        self.bodies.set_linewidth(linewidth)
+        self.wicks.set_segments(segments)
+        self.wicks.set_color(colors)
+        self.wicks.set_linewidth(linewidth)
+
+        datetimes = pd.DatetimeIndex(window["datetime"])
+        fmt = _date_format(datetimes)
+        self._labels = [dt.strftime(fmt) for dt in datetimes]
+
+        miny, maxy = np.nanmin(lows), np.nanmax(highs)
+        margin = (maxy - miny) * 0.05 or abs(maxy) * 0.01 or 1.0
+        self.ax.set_xlim(-1.0, float(n))
+        self.ax.set_ylim(miny - margin, maxy + margin)
+
+
+class ChartRenderer:
+    """
+    - 타임프레임별로 Agg Figure 하나를 재사용하는 캔들 차트 렌더러
+    - 40봉 슬라이딩 윈도우가 바뀔 때 몸통/꼬리/축 범위만 제자리에서 갱신
+      (mplfinance로 매번 새 Figure를 만드는 비용 제거)
+    - 호출마다 렌더링 시간을 render_times에 기록
+    """
+
+    def __init__(
+        self,
+        figsize: Tuple[float, float] = (10, 4),
+        title: str = "Candlestick Chart (Price Only)",
+        ylabel: str = "close",
+    ):
+        self.figsize = figsize
+        self.title = title
+        self.ylabel = ylabel
+        self.render_times: Dict[str, List[float]] = {}
+        self.last_render_seconds = 0.0
+        self._charts: Dict[str, _CandleChart] = {}
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        """렌더링 결과를 결정하는 설정값 (차트 캐시 키에 사용)"""
+        return {
+            "version": CHART_STYLE_VERSION,
+            "figsize": list(self.figsize),
+            "title": self.title,
+            "ylabel": self.ylabel,
+        }
+
+    def render(self, window: np.ndarray, timeframe: str = "macro") -> Figure:
+        """
+        window: datetime/open/high/low/close 필드를 가진 구조체 배열 (CandleStore view)
+        반환되는 Figure는 다음 render() 호출 때 같은 타임프레임에서 재사용됨
+        """
+        start = perf_counter()
+        chart = self._charts.get(timeframe)
+        if chart is None:
+            chart = _CandleChart(self.figsize, self.title, self.ylabel)
+            self._charts[timeframe] = chart
+        chart.update(window)
+        chart.figure.canvas.draw()
+        self.last_render_seconds = perf_counter() - start
+        self.render_times.setdefault(timeframe, []).append(self.last_render_seconds)
+        return chart.figure
+
+    def render_stats(self) -> Dict[str, Dict[str, float]]:
+        """타임프레임별 렌더링 횟수/평균/최대 시간(초)"""
+        return {
+            timeframe: {
+                "count": len(times),
+                "mean": float(np.mean(times)),
+                "max": float(np.max(times)),
+            }
+            for timeframe, times in self.render_times.items()
+            if times
+        }
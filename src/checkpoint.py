@@ -0,0 +1,90 @@
+import os
+import pickle
+from typing import Any, Dict, Optional
+
+from src.background_writer import BackgroundWriter
+
+# 체크포인트에 담는 상태 구조가 바뀌면 올려서 기존 체크포인트로 재개하지 않도록 함
+CHECKPOINT_VERSION = 1
+
+
+class Checkpointer:
+    """
+    - 백테스트 실행 상태를 매크로 틱 경계마다 한 파일로 저장
+      (data/checkpoints/{system_mode}/{trend}/{coin}_{trend}[_{run_id}].pkl)
+    - 상태는 호출 시점에 바로 직렬화하고, 파일 쓰기는 writer 스레드에서
+      임시 파일에 쓴 뒤 교체 (writer 큐 순서상 앞서 예약된 기록 flush가 먼저 끝남)
+    - config(코인/기간/틱/모드/초기 자본)가 다른 체크포인트로는 재개하지 않음
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        coin: str,
+        trend: str,
+        system_mode: str,
+        run_id: str | None = None,
+        checkpoint_dir: str = "data/checkpoints",
+        writer: BackgroundWriter | None = None,
+    ):
+        self.config = config
+        self.writer = writer
+        file_name = f"{coin}_{trend}" if run_id is None else f"{coin}_{trend}_{run_id}"
+        self.path = os.path.join(checkpoint_dir, system_mode, trend, f"{file_name}.pkl")
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """저장된 상태 (없으면 None)"""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as f:
+            checkpoint = pickle.load(f)
+        if checkpoint.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(
+                f"[Checkpointer] 지원하지 않는 체크포인트 버전입니다: {self.path}"
+            )
+        if checkpoint.get("config") != self.config:
+            raise ValueError(
+                f"[Checkpointer] 설정이 다른 실행의 체크포인트입니다: {self.path}\n"
+                f"  체크포인트: {checkpoint.get('config')}\n  현재: {self.config}"
+            )
+        return checkpoint["state"]
+
+    def save(self, state: Dict[str, Any]) -> None:
+        self._submit(self._write, self._dump(state))
+
+    async def asave(self, state: Dict[str, Any]) -> None:
+        """이벤트 루프용 save() (writer 큐가 가득 차도 루프를 막지 않음)"""
+        payload = self._dump(state)
+        if self.writer is None or self.writer.closed:
+            self._write(payload)
+        else:
+            await self.writer.asubmit(self._write, payload)
+
+    def clear(self) -> None:
+        """체크포인트 삭제 (실행이 끝났거나 처음부터 다시 시작할 때)"""
+        self._submit(self._remove)
+
+    def _dump(self, state: Dict[str, Any]) -> bytes:
+        return pickle.dumps(
+            {"version": CHECKPOINT_VERSION, "config": self.config, "state": state},
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+
+    def _submit(self, fn, *args) -> None:
+        if self.writer is None or self.writer.closed:
+            fn(*args)
+        else:
+            self.writer.submit(fn, *args)
+
+    def _write(self, payload: bytes) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _remove(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -1,202 +1,222 @@
 import os
-from typing import Any, Dict, Tuple
+from collections.abc import Mapping
+from typing import Dict, Tuple
 
-import matplotlib.pyplot as plt
-import mplfinance as mpf
+import numpy as np
 import pandas as pd
-import talib
+
+from src.background_writer import BackgroundWriter
+from src.candle_store import BASE_COLUMNS, CandleStore
+from src.chart_cache import ChartCache
+from src.chart_renderer import ChartRenderer
+from src.feature_store import FeatureStore
+from src.indicator_engine import IndicatorEngine
+from src.tick_stream import Tick
+from src.utils.image_utils import ChartImage
 
 
 class DataPreprocessor:
     """
     - 일봉(매크로)과 분봉(마이크로) 데이터를 구분하여 관리 및 지표 계산
     - update()로 새로운 데이터(딕셔너리) 한 건씩 받아
-      1) 내부 DataFrame(일봉/분봉)에 append
-      2) 각 시장에 맞는 주요 지표 재계산
+      1) 내부 CandleStore(일봉/분봉)에 append
+      2) 각 시장에 맞는 주요 지표를 IndicatorEngine으로 증분 갱신
+    - feature_stores가 주어지면 사전 계산된 지표를 인덱스 조회로 사용하고,
+      조회되지 않는 캔들만 증분 경로로 처리
+    - chart_cache가 주어지면 같은 윈도우의 차트는 한 번만 렌더링
+    - writer가 주어지면 차트 파일 저장은 백그라운드 스레드에서 진행
     """
 
     def __init__(
-        self, df_macro: pd.DataFrame | None = None, df_micro: pd.DataFrame | None = None
+        self,
+        df_macro: pd.DataFrame | None = None,
+        df_micro: pd.DataFrame | None = None,
+        feature_stores: Dict[str, FeatureStore] | None = None,
+        chart_cache: ChartCache | None = None,
+        writer: BackgroundWriter | None = None,
     ):
-        # 기본 컬럼 정의
-        base_cols = ["datetime", "open", "high", "low", "close", "volume"]
-
-        # 주입된 초기 데이터프레임이 없으면 빈 DF 생성
-        self.df_macro = (
-            df_macro.copy() if df_macro is not None else pd.DataFrame(columns=base_cols)
-        )
-        self.df_micro = (
-            df_micro.copy() if df_micro is not None else pd.DataFrame(columns=base_cols)
+        # 지표 컬럼은 틱이 들어올 때 스트리밍 엔진이 채움
+        self._engines = {
+            "macro": IndicatorEngine("macro"),
+            "micro": IndicatorEngine("micro"),
+        }
+
+        # 주입된 초기 데이터프레임이 없으면 빈 스토어 생성
+        self._stores = {}
+        for timeframe, df in (("macro", df_macro), ("micro", df_micro)):
+            columns = BASE_COLUMNS + self._engines[timeframe].columns
+            if df is not None and not df.empty:
+                self._stores[timeframe] = CandleStore.from_frame(df, columns)
+            else:
+                self._stores[timeframe] = CandleStore(columns)
+
+        # 지표가 계산된 행 수
+        self._synced = {"macro": 0, "micro": 0}
+
+        self._feature_stores = feature_stores or {}
+
+        # 타임프레임별 Figure를 재사용하는 차트 렌더러
+        self.chart_renderer = ChartRenderer()
+        # 같은 윈도우의 차트를 다시 렌더링하지 않도록 재사용 (None이면 매번 렌더링)
+        self.chart_cache = chart_cache
+        # 차트 파일 저장을 맡길 백그라운드 writer (None이면 바로 저장)
+        self.writer = writer
+
+    def get_state(self) -> Dict:
+        """
+        체크포인트용 상태: 증분 경로를 쓴 타임프레임의 캔들 버퍼, 지표 엔진, 지표 계산 위치
+        - 모든 틱을 feature_stores에서 조회한 타임프레임은 버퍼/엔진을 건드리지 않아
+          생성자가 다시 만드는 상태와 같으므로 저장하지 않음 (체크포인트 크기 O(1))
+        """
+        timeframes = [tf for tf, synced in self._synced.items() if synced > 0]
+        return {
+            "stores": {tf: self._stores[tf].to_array() for tf in timeframes},
+            "engines": {tf: self._engines[tf] for tf in timeframes},
+            "synced": {tf: self._synced[tf] for tf in timeframes},
+        }
+
+    def set_state(self, state: Dict) -> None:
+        """get_state()로 저장한 상태로 복원 (저장되지 않은 타임프레임은 그대로)"""
+        self._stores.update(
+            {tf: CandleStore.from_array(data) for tf, data in state["stores"].items()}
         )
+        self._engines.update(state["engines"])
+        self._synced.update(state["synced"])
+
+    @property
+    def df_macro(self) -> pd.DataFrame:
+        return self._stores["macro"].to_frame()
+
+    @property
+    def df_micro(self) -> pd.DataFrame:
+        return self._stores["micro"].to_frame()
+
+    async def update_and_get_price_data(
+        self, row: Mapping, timeframe: str, save_path: str = None
+    ) -> Tuple[Dict, ChartImage]:
+        # datetime 파싱 (Tick은 이미 파싱·포맷되어 있음)
+        if isinstance(row, Tick):
+            label = row.label
+        else:
+            row = {**row, "datetime": pd.to_datetime(row["datetime"])}
+            label = row["datetime"].strftime("%Y-%m-%d %H:%M:%S")
 
-        # 공통 전처리: dtype·정렬·중복 제거
-        for df in (self.df_macro, self.df_micro):
-            if not df.empty:
-                df["datetime"] = pd.to_datetime(df["datetime"])
-                df.drop_duplicates(subset="datetime", keep="last", inplace=True)
-                df.sort_values("datetime", inplace=True)
-                df.reset_index(drop=True, inplace=True)
-
-        # 초기 지표 계산
-        if not self.df_macro.empty:
-            self._compute_higher_timeframe_indicators()
-        if not self.df_micro.empty:
-            self._compute_lower_timeframe_indicators()
-
-    def update_and_get_price_data(
-        self, row: dict, timeframe: str, save_path: str = None
-    ) -> Tuple[Dict, Any]:
-        # datetime 파싱
-        row["datetime"] = pd.to_datetime(row["datetime"])
-
-        full_df = self._update(row, timeframe)
-        full_df["datetime"] = pd.to_datetime(full_df["datetime"])
+        feature_store = self._feature_stores.get(timeframe)
+        pos = feature_store.lookup(row) if feature_store is not None else None
+        if pos is not None:
+            store = feature_store.store
+        else:
+            pos = self._update(row, timeframe)
+            store = self._stores[timeframe]
 
         # 기간(window) 설정
         window = 40
 
-        # row 시점까지의 과거 데이터 확보
-        hist_df = full_df[full_df["datetime"] <= row["datetime"]]
-        window_df = hist_df.tail(window)  # 부족하면 가용 범위 전체
+        # row 시점까지의 과거 데이터 (부족하면 가용 범위 전체)
+        window_view = store.window(pos + 1, window)
 
-        fig = self._draw_close_chart(
-            df=window_df, timeframe=timeframe, save_path=save_path, return_fig=True
+        chart = await self._draw_close_chart(
+            window=window_view, timeframe=timeframe, save_path=save_path
         )
         # row 시점(가장 최근 행)만 dict 로 변환해 반환
-        latest_row = hist_df.iloc[[-1]].dropna(axis=1).to_dict(orient="records")[0]
-        latest_row["datetime"] = latest_row["datetime"].strftime("%Y-%m-%d %H:%M:%S")
-        return latest_row, fig  # tmp_df를 latest_row로 변경하여 반환
-
-    def _update(self, row: dict, timeframe: str) -> pd.DataFrame:
+        # (구조체 행을 한 번에 파이썬 값 튜플로 바꾼 뒤 datetime 필드는 건너뜀)
+        latest_row = {"datetime": label}
+        for col, value in zip(store.columns, store.row(pos).item()[1:]):
+            if value == value:  # NaN 제외
+                latest_row[col] = value
+        return latest_row, chart  # tmp_df를 latest_row로 변경하여 반환
+
+    def _update(self, row: dict, timeframe: str) -> int:
         """
         row: dict, 새로운 데이터 한 건
         timeframe: "macro" 또는 "micro"
+        반환값: 스토어 내 row의 위치
         """
-        row_df = pd.DataFrame([row])
-        if timeframe == "macro":
-            self.df_macro = (
-                pd.concat([self.df_macro, row_df], ignore_index=True)
-                .drop_duplicates(subset="datetime", keep="last")
-                .sort_values("datetime")
-                .reset_index(drop=True)
-            )
-            self._compute_higher_timeframe_indicators()
-            return self.df_macro
-        elif timeframe == "micro":
-            self.df_micro = (
-                pd.concat([self.df_micro, row_df], ignore_index=True)
-                .drop_duplicates(subset="datetime", keep="last")
-                .sort_values("datetime")
-                .reset_index(drop=True)
-            )
-            self._compute_lower_timeframe_indicators()
-            return self.df_micro
-        else:
+        if timeframe not in self._stores:
             raise ValueError("timeframe은 'macro' 또는 'micro'만 가능합니다.")
 
-    def _compute_higher_timeframe_indicators(self):
-        df = self.df_macro
-        close, high, low, volume, open_ = (
-            df[c].astype(float) for c in ("close", "high", "low", "volume", "open")
-        )
+        pos, _ = self._stores[timeframe].upsert(row)
+        self._sync_indicators(timeframe, pos)
+        return pos
 
-        df["sma5"] = talib.SMA(close, timeperiod=5)
-        df["sma10"] = talib.SMA(close, timeperiod=10)
-        df["sma20"] = talib.SMA(close, timeperiod=20)
-        df["ema5"] = talib.EMA(close, timeperiod=5)
-        df["ema10"] = talib.EMA(close, timeperiod=10)
-        df["ema20"] = talib.EMA(close, timeperiod=20)
-        df["macd"], df["macd_signal"], df["macd_hist"] = talib.MACD(
-            close, fastperiod=12, slowperiod=26, signalperiod=9
-        )
-        df["sar"] = talib.SAR(high, low, acceleration=0.02, maximum=0.2)
+    def _sync_indicators(self, timeframe: str, pos: int) -> None:
+        """
+        pos 위치까지의 행에 대해 아직 계산되지 않은 지표만 엔진으로 이어서 계산
+        - 시간순 append: 새 캔들만큼만 갱신 (캔들당 O(1))
+        - 이미 계산된 구간의 행이 바뀐 경우: 엔진을 초기화하고 재계산
+        """
+        engine = self._engines[timeframe]
+        store = self._stores[timeframe]
+        if pos < self._synced[timeframe]:
+            engine.reset()
+            self._synced[timeframe] = 0
+
+        start = self._synced[timeframe]
+        end = pos + 1
+        if start >= end:
+            return
 
-    def _compute_lower_timeframe_indicators(self):
-        df = self.df_micro
-        close, high, low, _, _ = (
-            df[c].astype(float) for c in ("close", "high", "low", "volume", "open")
-        )
-        # 참고: https://realtrading.com/trading-blog/short-term-trading-indicators/
-
-        df["sma5"] = talib.SMA(close, timeperiod=5)
-        df["sma10"] = talib.SMA(close, timeperiod=10)
-        df["sma20"] = talib.SMA(close, timeperiod=20)
-        df["ema5"] = talib.EMA(close, timeperiod=5)
-        df["ema10"] = talib.EMA(close, timeperiod=10)
-        df["ema20"] = talib.EMA(close, timeperiod=20)
-        df["rsi"] = talib.RSI(close, timeperiod=14)
-        df["stoch_k"], df["stoch_d"] = talib.STOCHF(
-            high, low, close, fastk_period=14, fastd_period=3, fastd_matype=0
-        )
-        df["adx"] = talib.ADX(high, low, close, timeperiod=14)
-        upperband, middleband, lowerband = talib.BBANDS(
-            close, timeperiod=20, nbdevup=2, nbdevdn=2, matype=0
-        )
-        df["bb_upper"] = upperband
-        df["bb_middle"] = middleband
-        df["bb_lower"] = lowerband
+        highs = store.column("high")
+        lows = store.column("low")
+        closes = store.column("close")
+        outputs = [store.column(col) for col in engine.columns]
+        for i in range(start, end):
+            values = engine.update(highs[i], lows[i], closes[i])
+            for out, value in zip(outputs, values):
+                out[i] = value
+
+        self._synced[timeframe] = end
 
-    def _draw_close_chart(
+    async def _draw_close_chart(
         self,
-        df: pd.DataFrame,
+        window: np.ndarray,
         timeframe: str = "macro",
         save_path: str = None,
-        return_fig: bool = False,
-    ):
+    ) -> ChartImage:
         """
-        현재까지 누적된 종가 시계열을 선 그래프로 표시
+        현재까지 누적된 캔들 윈도우를 캔들 차트로 그려 한 번만 래스터화
+        - chart_cache에 같은 윈도우가 있으면 렌더링 없이 캐시된 이미지 사용
         - save_path: 파일로 저장할 경로(str), None이면 저장하지 않음
-        - return_fig: True면 Figure 객체 반환 (멀티모달 에이전트 전달용)
+        - 반환된 ChartImage는 디스크 저장과 멀티모달 에이전트 입력에 함께 사용
         """
-        if df.empty or df["close"].isnull().all():
-            if return_fig:
-                fig, ax = plt.subplots(figsize=(8, 4))
-                ax.text(
-                    0.5,
-                    0.5,
-                    "No data available",
-                    horizontalalignment="center",
-                    verticalalignment="center",
-                    transform=ax.transAxes,
+        key = None
+        chart = None
+        rendered = False
+        if self.chart_cache is not None:
+            key = ChartCache.key(window, self.chart_renderer.settings)
+            chart = await self.chart_cache.aget(key)
+        if chart is None:
+            fig = self.chart_renderer.render(window, timeframe=timeframe)
+            chart = ChartImage.from_figure(fig)
+            rendered = True
+            if self.chart_cache is not None:
+                self.chart_cache.remember(key, chart)
+
+        if rendered or save_path is not None:
+            if self.writer is not None:
+                await self.writer.asubmit(
+                    self._save_chart, chart, key, rendered, save_path
                 )
-                return fig
-            return
+            else:
+                self._save_chart(chart, key, rendered, save_path)
 
-        # mplfinance expects columns: Open, High, Low, Close (case-insensitive)
-        # Ensure columns are properly named and datetime is index
-        plot_df = df.copy()
-        plot_df = plot_df.rename(
-            columns={
-                "open": "Open",
-                "high": "High",
-                "low": "Low",
-                "close": "Close",
-                "volume": "Volume",
-            }
-        )
-        plot_df.set_index("datetime", inplace=True)
-
-        fig, axlist = mpf.plot(
-            plot_df,
-            type="candle",
-            style="charles",
-            title="Candlestick Chart (Price Only)",
-            ylabel="close",
-            volume=False,
-            returnfig=True,
-            figsize=(10, 4),
-        )
-        fig.tight_layout()
+        return chart
+
+    def _save_chart(
+        self, chart: ChartImage, key: str | None, rendered: bool, save_path: str | None
+    ) -> None:
+        """새로 렌더링한 차트를 캐시에 저장하고 save_path에 보관 (writer 스레드에서 실행)"""
+        if rendered and self.chart_cache is not None:
+            self.chart_cache.store(key, chart)
 
         if save_path is not None:
             directory = os.path.dirname(save_path)
             if directory and not os.path.exists(directory):
                 os.makedirs(directory, exist_ok=True)
             try:
-                fig.savefig(save_path)
+                if self.chart_cache is not None:
+                    self.chart_cache.archive(key, save_path)
+                else:
+                    chart.save(save_path)
             except Exception as e:
                 print(f"Error saving chart to {save_path}: {e}")
-
-        if return_fig:
-            return fig
-        plt.close(fig)
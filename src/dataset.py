@@ -0,0 +1,170 @@
+import json
+import os
+import shutil
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.candle_store import BASE_COLUMNS
+from src.utils.file_lock import file_lock
+
+# 변환 포맷이 바뀌면 올려서 기존 변환본을 무효화
+DATASET_VERSION = 2
+
+
+class OHLCVDataset:
+    """
+    - data/{coin}_{tick}.csv 를 컬럼별 .npy 파일로 한 번만 변환
+      (정렬된 int64 나노초 타임스탬프와 각 행의 원본 CSV 행 번호 포함)
+    - 이후에는 memmap으로 열어 start_date/end_date 구간을 이진 탐색으로 잘라
+      복사 없는 view로 반환
+    - 여러 프로세스가 같은 변환본을 동시에 열어도 되도록 {path}.lock으로 직렬화
+      (열기는 공유 잠금, 변환은 배타 잠금 안에서 변환본을 다시 확인한 뒤 한 번만)
+    """
+
+    def __init__(self, path: str, arrays: Dict[str, np.ndarray], source: Dict[str, Any]):
+        self.path = path
+        self.source = source
+        self.timestamps: np.ndarray = arrays["timestamp"]
+        # 정렬된 각 행의 원본 CSV 행 번호
+        self.rows: np.ndarray = arrays["row"]
+        self.columns = [col for col in BASE_COLUMNS if col in arrays]
+        self._arrays = arrays
+
+    @classmethod
+    def open(
+        cls,
+        coin: str,
+        tick: str,
+        data_dir: str = "data",
+        cache_dir: str = "data/columnar",
+    ) -> "OHLCVDataset":
+        """변환본이 없거나 원본 CSV가 바뀌었으면 변환 후 memmap으로 연다"""
+        csv_path = os.path.join(data_dir, f"{coin}_{tick}.csv")
+        path = os.path.join(cache_dir, f"{coin}_{tick}")
+        source = cls._fingerprint(csv_path)
+
+        with file_lock(path, shared=True):
+            meta = cls._read_meta(path)
+            if cls._is_current(meta, source):
+                return cls._load(path, meta, source)
+
+        with file_lock(path):
+            # 잠금을 기다리는 동안 다른 프로세스가 변환했을 수 있음
+            meta = cls._read_meta(path)
+            if not cls._is_current(meta, source):
+                cls._convert(csv_path, path)
+                meta = cls._read_meta(path)
+            return cls._load(path, meta, source)
+
+    @classmethod
+    def convert(cls, csv_path: str, path: str) -> None:
+        """CSV를 시간순으로 정렬해 컬럼별 .npy + meta.json 으로 저장"""
+        with file_lock(path):
+            cls._convert(csv_path, path)
+
+    @classmethod
+    def _convert(cls, csv_path: str, path: str) -> None:
+        """convert()의 본체 (path의 배타 잠금 안에서 호출)"""
+        df = pd.read_csv(csv_path)
+        timestamps = pd.to_datetime(df["datetime"]).to_numpy(dtype="datetime64[ns]")
+        order = np.argsort(timestamps, kind="stable")
+        columns = [col for col in BASE_COLUMNS if col in df.columns]
+
+        # 깨진 변환본이 보이지 않도록 임시 디렉터리에 쓴 뒤 교체
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        np.save(os.path.join(tmp_path, "timestamp.npy"), timestamps[order].view(np.int64))
+        np.save(os.path.join(tmp_path, "row.npy"), order.astype(np.int64))
+        for col in columns:
+            np.save(os.path.join(tmp_path, f"{col}.npy"), df[col].to_numpy()[order])
+        with open(os.path.join(tmp_path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": DATASET_VERSION,
+                    "source": cls._fingerprint(csv_path),
+                    "columns": columns,
+                    "rows": len(df),
+                },
+                f,
+            )
+        # 기존 변환본은 먼저 옆으로 옮긴 뒤 지움
+        # (이미 memmap으로 연 프로세스는 지워진 파일을 계속 읽을 수 있음)
+        old_path = f"{path}.old{os.getpid()}"
+        if os.path.exists(path):
+            shutil.rmtree(old_path, ignore_errors=True)
+            os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        shutil.rmtree(old_path, ignore_errors=True)
+
+    @classmethod
+    def _load(
+        cls, path: str, meta: Dict[str, Any], source: Dict[str, Any]
+    ) -> "OHLCVDataset":
+        arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in ["timestamp", "row"] + meta["columns"]
+        }
+        return cls(path, arrays, source)
+
+    @staticmethod
+    def _is_current(meta: Optional[Dict[str, Any]], source: Dict[str, Any]) -> bool:
+        return (
+            meta is not None
+            and meta["source"] == source
+            and meta.get("version") == DATASET_VERSION
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def bounds(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> slice:
+        """start_date <= datetime < end_date 구간의 위치 (이진 탐색)"""
+        lo = 0 if start_date is None else self._search(start_date)
+        hi = len(self.timestamps) if end_date is None else self._search(end_date)
+        return slice(lo, max(lo, hi))
+
+    def select(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """구간에 해당하는 컬럼별 view (timestamp는 int64 나노초, row는 원본 CSV 행 번호)"""
+        bounds = self.bounds(start_date, end_date)
+        return {name: arr[bounds] for name, arr in self._arrays.items()}
+
+    def to_frame(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        copy: bool = True,
+    ) -> pd.DataFrame:
+        """
+        구간만 DataFrame으로 만든다
+        - index는 원본 CSV의 행 번호를 유지 (차트 파일명 등에서 사용)
+        - copy=False면 memmap view를 복사 없이 감싼 읽기 전용 DataFrame
+        """
+        bounds = self.bounds(start_date, end_date)
+        data = {"datetime": self.timestamps[bounds].view("datetime64[ns]")}
+        for col in self.columns:
+            data[col] = self._arrays[col][bounds]
+        return pd.DataFrame(data, index=pd.Index(self.rows[bounds]), copy=copy)
+
+    def _search(self, date: Any) -> int:
+        ts = pd.Timestamp(date).to_datetime64().astype("datetime64[ns]").view(np.int64)
+        return int(np.searchsorted(self.timestamps, ts, side="left"))
+
+    @staticmethod
+    def _fingerprint(csv_path: str) -> Dict[str, Any]:
+        stat = os.stat(csv_path)
+        return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+    @staticmethod
+    def _read_meta(path: str) -> Optional[Dict[str, Any]]:
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
@@ -0,0 +1,112 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import pandas as pd
+
+from src.chart_cache import ChartCache
+from src.dataset import OHLCVDataset
+from src.feature_store import FeatureStore, indicator_params_hash
+
+
+class DatasetRegistry:
+    """
+    - 같은 프로세스의 실행들이 같은 시나리오의 캔들/지표를 한 번만 만들어 공유
+      (config.json처럼 같은 설정을 여러 번 돌릴 때 시나리오 수만큼만 준비)
+    - 키: 캔들은 (coin, tick, 시작, 끝), 지표는 여기에 (timeframe, 지표 파라미터 해시)
+    - 반환하는 DataFrame/CandleStore는 읽기 전용이라 한 실행이 고쳐도
+      다른 실행에 섞이지 않음 (고치려 하면 ValueError)
+    - 차트 캐시도 프로세스에 하나만 두어 같은 윈도우의 차트를 실행 간에 재사용
+    """
+
+    def __init__(self):
+        self._items: Dict[Tuple[Hashable, ...], Any] = {}
+        # 지표를 만들면서 캔들을 조회하므로 재진입 가능한 락
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def frame(
+        self, coin: str, tick: str, start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        """[start_date, end_date) 구간 캔들 (컬럼형 변환본의 memmap view)"""
+        key = ("frame", coin, tick, _timestamp(start_date), _timestamp(end_date))
+        return self._get(
+            key,
+            lambda: OHLCVDataset.open(coin, tick).to_frame(
+                start_date, end_date, copy=False
+            ),
+        )
+
+    def indicators(
+        self, coin: str, tick: str, timeframe: str, start_date: str, end_date: str
+    ) -> FeatureStore:
+        """구간 캔들 전체의 지표 (증분 경로와 같은 값, DataPreprocessor 조회용)"""
+        key = (
+            "indicators",
+            coin,
+            tick,
+            timeframe,
+            _timestamp(start_date),
+            _timestamp(end_date),
+            indicator_params_hash(timeframe),
+        )
+
+        def build() -> FeatureStore:
+            df = self.frame(coin, tick, start_date, end_date)
+            feature_store = FeatureStore.build_incremental(df, timeframe)
+            feature_store.store.freeze()
+            return feature_store
+
+        return self._get(key, build)
+
+    def feature_store(
+        self, coin: str, tick: str, timeframe: str, start_date: str
+    ) -> FeatureStore:
+        """FeatureStore.load_or_build 결과 (디스크 캐시를 프로세스에서 한 번만 염)"""
+        key = (
+            "features",
+            coin,
+            tick,
+            timeframe,
+            _timestamp(start_date),
+            indicator_params_hash(timeframe),
+        )
+
+        def build() -> FeatureStore:
+            feature_store = FeatureStore.load_or_build(
+                coin, tick, timeframe, start_date=start_date
+            )
+            feature_store.store.freeze()
+            return feature_store
+
+        return self._get(key, build)
+
+    def chart_cache(self) -> ChartCache:
+        return self._get(("chart_cache",), ChartCache)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def _get(self, key: Tuple[Hashable, ...], build: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._items:
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            value = build()
+            self._items[key] = value
+            return value
+
+
+def _timestamp(date: Any) -> pd.Timestamp:
+    """같은 시각의 다른 표기("2024-01-01", "2024-01-01 00:00:00")를 같은 키로"""
+    return pd.Timestamp(date)
+
+
+# 프로세스 전체에서 공유하는 레지스트리
+_registry = DatasetRegistry()
+
+
+def get_dataset_registry() -> DatasetRegistry:
+    return _registry
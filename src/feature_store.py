@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.candle_store import BASE_COLUMNS, CandleStore
+from src.dataset import OHLCVDataset
+from src.indicator_engine import (
+    INDICATOR_PARAMS,
+    IndicatorEngine,
+    compute_indicators,
+    indicator_columns,
+)
+from src.utils.file_lock import file_lock
+
+# 저장 포맷/계산 방식이 바뀌면 올려서 기존 캐시를 무효화
+FEATURE_STORE_VERSION = 1
+
+# lookup()에서 row에 없는 컬럼 표시
+_MISSING = object()
+
+
+def indicator_params_hash(timeframe: str) -> str:
+    payload = json.dumps(
+        {"version": FEATURE_STORE_VERSION, "params": INDICATOR_PARAMS[timeframe]},
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+class FeatureStore:
+    """
+    - 지표는 인과적(causal)이므로 run 시작 전에 전체 캔들에 대해 한 번에 벡터화 계산
+    - (coin, tick, timeframe, 시작 시점, 지표 파라미터 해시)별로 디스크에 저장
+    - 틱마다 price_data에 필요한 행을 인덱스 조회로 반환
+    """
+
+    def __init__(self, store: CandleStore, timeframe: str):
+        self.store = store
+        self.timeframe = timeframe
+        # lookup()에서 비교할 OHLCV 필드의 구조체 행 내 위치 (0번은 datetime)
+        self._base_fields = [
+            (col, store.columns.index(col) + 1)
+            for col in BASE_COLUMNS
+            if col in store.columns
+        ]
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, timeframe: str) -> "FeatureStore":
+        """df(시간순 캔들) 전체에 대해 지표를 TA-Lib으로 한 번에 계산"""
+        df = df.copy()
+        df["datetime"] = pd.to_datetime(df["datetime"])
+        df = df.drop_duplicates(subset="datetime", keep="last").sort_values(
+            "datetime", kind="stable"
+        )
+        df = df.reset_index(drop=True)
+        compute_indicators(df, timeframe)
+        columns = BASE_COLUMNS + indicator_columns(timeframe)
+        return cls(CandleStore.from_frame(df, columns), timeframe)
+
+    @classmethod
+    def build_incremental(cls, df: pd.DataFrame, timeframe: str) -> "FeatureStore":
+        """
+        df 전체의 지표를 증분 경로(IndicatorEngine)로 계산
+        - DataPreprocessor가 틱마다 계산하는 값과 비트 단위로 같음
+        """
+        engine = IndicatorEngine(timeframe)
+        store = CandleStore.from_frame(df, BASE_COLUMNS + engine.columns)
+        highs = store.column("high")
+        lows = store.column("low")
+        closes = store.column("close")
+        outputs = [store.column(col) for col in engine.columns]
+        for i in range(len(store)):
+            values = engine.update(highs[i], lows[i], closes[i])
+            for out, value in zip(outputs, values):
+                out[i] = value
+        return cls(store, timeframe)
+
+    @classmethod
+    def load_or_build(
+        cls,
+        coin: str,
+        tick: str,
+        timeframe: str,
+        start_date: str,
+        data_dir: str = "data",
+        cache_dir: str = "data/features",
+        verify: bool = True,
+    ) -> "FeatureStore":
+        """
+        data/{coin}_{tick}.csv 에서 start_date 이후 캔들의 지표를 캐시에서 읽거나 새로 계산
+        - start_date는 지표 워밍업 기준점이라 키에 포함 (end_date는 무관)
+        - 원본 CSV가 바뀌면 다시 계산
+        - 배열과 meta는 {array_path}.lock 안에서만 읽고 써서 서로 어긋나지 않음
+          (읽기는 공유 잠금, 계산/저장은 배타 잠금 안에서 캐시를 다시 확인한 뒤 한 번만)
+        """
+        dataset = OHLCVDataset.open(coin, tick, data_dir=data_dir)
+        source = dataset.source
+
+        origin = pd.Timestamp(start_date).strftime("%Y%m%d%H%M%S")
+        name = f"{coin}_{tick}_{timeframe}_{origin}_{indicator_params_hash(timeframe)}"
+        array_path = os.path.join(cache_dir, f"{name}.npy")
+        meta_path = os.path.join(cache_dir, f"{name}.json")
+
+        with file_lock(array_path, shared=True):
+            cached = cls._load_cached(array_path, meta_path, source, timeframe)
+        if cached is not None:
+            return cached
+
+        with file_lock(array_path):
+            # 잠금을 기다리는 동안 다른 프로세스가 계산했을 수 있음
+            cached = cls._load_cached(array_path, meta_path, source, timeframe)
+            if cached is not None:
+                return cached
+
+            feature_store = cls.build(dataset.to_frame(start_date), timeframe)
+            if verify:
+                feature_store.check_lookahead()
+            # 배열만 바뀐 채 중단되어도 이전 meta와 짝지어지지 않도록 meta를 먼저 지움
+            if os.path.exists(meta_path):
+                os.remove(meta_path)
+            feature_store.save(array_path)
+            _write_json(
+                meta_path, {"source": source, "params": INDICATOR_PARAMS[timeframe]}
+            )
+        return feature_store
+
+    @classmethod
+    def _load_cached(
+        cls, array_path: str, meta_path: str, source: Dict[str, Any], timeframe: str
+    ) -> Optional["FeatureStore"]:
+        """meta의 원본 정보가 source와 같으면 캐시된 배열을 memmap으로 연다"""
+        if not (os.path.exists(array_path) and os.path.exists(meta_path)):
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("source") != source:
+            return None
+        data = np.load(array_path, mmap_mode="r")
+        return cls(CandleStore.from_array(data), timeframe)
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 쓰는 도중 중단되거나 동시에 저장해도 깨진 캐시가 보이지 않도록 임시 파일 후 교체
+        tmp_path = f"{path}.tmp{os.getpid()}_{threading.get_ident()}"
+        with open(tmp_path, "wb") as f:
+            np.save(f, self.store.to_array())
+        os.replace(tmp_path, path)
+
+    def lookup(self, row: Dict[str, Any]) -> Optional[int]:
+        """row와 시점·OHLCV가 같은 행의 위치, 없으면 None"""
+        dt = pd.Timestamp(row["datetime"]).to_datetime64()
+        pos = self.store.locate(dt, side="left")
+        if pos >= len(self.store) or self.store.datetimes[pos] != dt:
+            return None
+        # 구조체 행을 한 번에 파이썬 값 튜플로 바꿔 비교
+        stored = self.store.row(pos).item()
+        for col, field in self._base_fields:
+            value = row.get(col, _MISSING)
+            if value is not _MISSING and stored[field] != value:
+                return None
+        return pos
+
+    def check_lookahead(
+        self,
+        sample_size: int = 32,
+        seed: int = 0,
+        rtol: float = 1e-9,
+        atol: float = 1e-8,
+    ) -> None:
+        """
+        미래 데이터 누수 검사
+        - 표본 틱들에서 사전 계산 값을 증분 경로(IndicatorEngine) 값과 비교
+        - 다르면 ValueError
+        """
+        n = len(self.store)
+        if n == 0:
+            return
+        rng = np.random.default_rng(seed)
+        samples = set(rng.choice(n, size=min(sample_size, n), replace=False).tolist())
+        samples.add(n - 1)
+
+        engine = IndicatorEngine(self.timeframe)
+        highs = self.store.column("high")
+        lows = self.store.column("low")
+        closes = self.store.column("close")
+        for i in range(max(samples) + 1):
+            values = engine.update(highs[i], lows[i], closes[i])
+            if i not in samples:
+                continue
+            stored = self.store.row(i)
+            for col, value in zip(engine.columns, values):
+                expected = float(stored[col])
+                if np.isnan(value) and np.isnan(expected):
+                    continue
+                if not np.isclose(value, expected, rtol=rtol, atol=atol):
+                    raise ValueError(
+                        f"[FeatureStore] {self.timeframe} 틱 {i}의 '{col}' 값이 "
+                        f"증분 계산과 다릅니다: {expected} != {value}"
+                    )
+
+
+def _write_json(path: str, payload: Dict[str, Any]) -> None:
+    """JSON을 임시 파일에 쓴 뒤 교체 (반쯤 쓴 meta가 보이지 않음)"""
+    tmp_path = f"{path}.tmp{os.getpid()}_{threading.get_ident()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
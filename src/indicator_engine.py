@@ -0,0 +1,615 @@
+import math
+from collections import deque
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import talib
+
+NAN = float("nan")
+
+# 타임프레임별 지표 파라미터 (스트리밍/벡터화 경로가 공유)
+INDICATOR_PARAMS = {
+    "macro": {
+        "sma": (5, 10, 20),
+        "ema": (5, 10, 20),
+        "macd": {"fastperiod": 12, "slowperiod": 26, "signalperiod": 9},
+        "sar": {"acceleration": 0.02, "maximum": 0.2},
+    },
+    "micro": {
+        "sma": (5, 10, 20),
+        "ema": (5, 10, 20),
+        "rsi": {"timeperiod": 14},
+        "stochf": {"fastk_period": 14, "fastd_period": 3},
+        "adx": {"timeperiod": 14},
+        "bbands": {"timeperiod": 20, "nbdevup": 2, "nbdevdn": 2},
+    },
+}
+
+
+def _is_zero(value: float) -> bool:
+    # TA_IS_ZERO
+    return -0.00000001 < value < 0.00000001
+
+
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    # TRUE_RANGE 매크로와 동일한 비교 순서
+    out = high - low
+    tmp = abs(high - prev_close)
+    if tmp > out:
+        out = tmp
+    tmp = abs(low - prev_close)
+    if tmp > out:
+        out = tmp
+    return out
+
+
+class StreamingSMA:
+    """TA-Lib SMA와 같은 누적합 방식의 이동평균"""
+
+    __slots__ = ("period", "_window", "_total")
+
+    def __init__(self, period: int):
+        self.period = period
+        self._window = deque()
+        self._total = 0.0
+
+    def update(self, value: float) -> float:
+        self._window.append(value)
+        self._total += value
+        if len(self._window) < self.period:
+            return NAN
+        out = self._total / self.period
+        self._total -= self._window.popleft()
+        return out
+
+
+class StreamingEMA:
+    """첫 period개 값의 SMA로 시드하는 TA-Lib 기본 EMA"""
+
+    __slots__ = ("period", "k", "_count", "_seed_total", "_value")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.k = 2.0 / (period + 1)
+        self._count = 0
+        self._seed_total = 0.0
+        self._value = None
+
+    def update(self, value: float) -> float:
+        if self._value is None:
+            self._count += 1
+            self._seed_total += value
+            if self._count < self.period:
+                return NAN
+            self._value = self._seed_total / self.period
+            return self._value
+        self._value = ((value - self._value) * self.k) + self._value
+        return self._value
+
+
+class StreamingMACD:
+    """
+    TA-Lib MACD
+    - fast EMA도 slow EMA와 같은 시점(slowperiod번째 캔들)에서 시드됨
+    - signal EMA가 준비될 때까지 세 값 모두 NaN
+    """
+
+    __slots__ = (
+        "fastperiod",
+        "slowperiod",
+        "_k_fast",
+        "_k_slow",
+        "_recent",
+        "_count",
+        "_slow_total",
+        "_fast",
+        "_slow",
+        "_signal",
+    )
+
+    def __init__(self, fastperiod: int = 12, slowperiod: int = 26, signalperiod: int = 9):
+        if slowperiod < fastperiod:
+            fastperiod, slowperiod = slowperiod, fastperiod
+        self.fastperiod = fastperiod
+        self.slowperiod = slowperiod
+        self._k_fast = 2.0 / (fastperiod + 1)
+        self._k_slow = 2.0 / (slowperiod + 1)
+        self._recent = deque(maxlen=fastperiod)
+        self._count = 0
+        self._slow_total = 0.0
+        self._fast = None
+        self._slow = None
+        self._signal = StreamingEMA(signalperiod)
+
+    def update(self, value: float) -> Tuple[float, float, float]:
+        if self._slow is None:
+            self._count += 1
+            self._recent.append(value)
+            self._slow_total += value
+            if self._count < self.slowperiod:
+                return NAN, NAN, NAN
+            fast_total = 0.0
+            for v in self._recent:
+                fast_total += v
+            self._fast = fast_total / self.fastperiod
+            self._slow = self._slow_total / self.slowperiod
+        else:
+            self._fast = ((value - self._fast) * self._k_fast) + self._fast
+            self._slow = ((value - self._slow) * self._k_slow) + self._slow
+
+        macd = self._fast - self._slow
+        signal = self._signal.update(macd)
+        if math.isnan(signal):
+            return NAN, NAN, NAN
+        return macd, signal, macd - signal
+
+
+class StreamingSAR:
+    """TA-Lib Parabolic SAR (두 번째 캔들부터 출력)"""
+
+    __slots__ = (
+        "acceleration",
+        "maximum",
+        "_count",
+        "_is_long",
+        "_sar",
+        "_ep",
+        "_af",
+        "_new_high",
+        "_new_low",
+    )
+
+    def __init__(self, acceleration: float = 0.02, maximum: float = 0.2):
+        if acceleration > maximum:
+            acceleration = maximum
+        self.acceleration = acceleration
+        self.maximum = maximum
+        self._count = 0
+        self._is_long = True
+        self._sar = NAN
+        self._ep = NAN
+        self._af = acceleration
+        self._new_high = NAN
+        self._new_low = NAN
+
+    def update(self, high: float, low: float) -> float:
+        self._count += 1
+        if self._count == 1:
+            self._new_high = high
+            self._new_low = low
+            return NAN
+
+        if self._count == 2:
+            # 초기 방향: 1기간 -DM이 양수면 숏으로 시작
+            diff_p = high - self._new_high
+            diff_m = self._new_low - low
+            self._is_long = not (diff_m > 0 and diff_p < diff_m)
+            if self._is_long:
+                self._ep = high
+                self._sar = self._new_low
+            else:
+                self._ep = low
+                self._sar = self._new_high
+            # 첫 반복에서는 직전 고가/저가 대신 오늘 값을 사용
+            self._new_low = low
+            self._new_high = high
+
+        prev_low = self._new_low
+        prev_high = self._new_high
+        new_low = low
+        new_high = high
+        self._new_low = new_low
+        self._new_high = new_high
+        sar = self._sar
+        ep = self._ep
+        af = self._af
+
+        if self._is_long:
+            if new_low <= sar:
+                self._is_long = False
+                sar = ep
+                if sar < prev_high:
+                    sar = prev_high
+                if sar < new_high:
+                    sar = new_high
+                out = sar
+                af = self.acceleration
+                ep = new_low
+                sar = sar + af * (ep - sar)
+                if sar < prev_high:
+                    sar = prev_high
+                if sar < new_high:
+                    sar = new_high
+            else:
+                out = sar
+                if new_high > ep:
+                    ep = new_high
+                    af += self.acceleration
+                    if af > self.maximum:
+                        af = self.maximum
+                sar = sar + af * (ep - sar)
+                if sar > prev_low:
+                    sar = prev_low
+                if sar > new_low:
+                    sar = new_low
+        else:
+            if new_high >= sar:
+                self._is_long = True
+                sar = ep
+                if sar > prev_low:
+                    sar = prev_low
+                if sar > new_low:
+                    sar = new_low
+                out = sar
+                af = self.acceleration
+                ep = new_high
+                sar = sar + af * (ep - sar)
+                if sar > prev_low:
+                    sar = prev_low
+                if sar > new_low:
+                    sar = new_low
+            else:
+                out = sar
+                if new_low < ep:
+                    ep = new_low
+                    af += self.acceleration
+                    if af > self.maximum:
+                        af = self.maximum
+                sar = sar + af * (ep - sar)
+                if sar < prev_high:
+                    sar = prev_high
+                if sar < new_high:
+                    sar = new_high
+
+        self._sar = sar
+        self._ep = ep
+        self._af = af
+        return out
+
+
+class StreamingRSI:
+    """TA-Lib RSI (Wilder 평활)"""
+
+    __slots__ = ("timeperiod", "_count", "_prev", "_gain", "_loss")
+
+    def __init__(self, timeperiod: int = 14):
+        self.timeperiod = timeperiod
+        self._count = 0
+        self._prev = NAN
+        self._gain = 0.0
+        self._loss = 0.0
+
+    def update(self, value: float) -> float:
+        self._count += 1
+        if self._count == 1:
+            self._prev = value
+            return NAN
+
+        diff = value - self._prev
+        self._prev = value
+        period = self.timeperiod
+
+        if self._count <= period + 1:
+            # 초기 구간: 단순 합산 후 평균
+            if diff < 0:
+                self._loss -= diff
+            else:
+                self._gain += diff
+            if self._count < period + 1:
+                return NAN
+            self._loss /= period
+            self._gain /= period
+        else:
+            self._loss *= period - 1
+            self._gain *= period - 1
+            if diff < 0:
+                self._loss -= diff
+            else:
+                self._gain += diff
+            self._loss /= period
+            self._gain /= period
+
+        total = self._gain + self._loss
+        if _is_zero(total):
+            return 0.0
+        return 100 * (self._gain / total)
+
+
+class _RollingExtreme:
+    """단조 덱 기반 구간 최댓값/최솟값 (캔들당 분할상환 O(1))"""
+
+    __slots__ = ("period", "_is_max", "_deque", "_count")
+
+    def __init__(self, period: int, is_max: bool):
+        self.period = period
+        self._is_max = is_max
+        self._deque = deque()
+        self._count = 0
+
+    def update(self, value: float) -> float:
+        dq = self._deque
+        if self._is_max:
+            while dq and dq[-1][1] <= value:
+                dq.pop()
+        else:
+            while dq and dq[-1][1] >= value:
+                dq.pop()
+        dq.append((self._count, value))
+        if dq[0][0] <= self._count - self.period:
+            dq.popleft()
+        self._count += 1
+        return dq[0][1]
+
+
+class StreamingSTOCHF:
+    """TA-Lib STOCHF (fastd_matype=0), %K/%D 모두 %D가 준비된 시점부터 출력"""
+
+    __slots__ = ("fastk_period", "_count", "_highest", "_lowest", "_fastd")
+
+    def __init__(self, fastk_period: int = 14, fastd_period: int = 3):
+        self.fastk_period = fastk_period
+        self._count = 0
+        self._highest = _RollingExtreme(fastk_period, is_max=True)
+        self._lowest = _RollingExtreme(fastk_period, is_max=False)
+        self._fastd = StreamingSMA(fastd_period)
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float]:
+        self._count += 1
+        highest = self._highest.update(high)
+        lowest = self._lowest.update(low)
+        if self._count < self.fastk_period:
+            return NAN, NAN
+
+        diff = (highest - lowest) / 100.0
+        fastk = (close - lowest) / diff if diff != 0.0 else 0.0
+        fastd = self._fastd.update(fastk)
+        if math.isnan(fastd):
+            return NAN, NAN
+        return fastk, fastd
+
+
+class StreamingADX:
+    """TA-Lib ADX (2 * timeperiod번째 캔들부터 출력)"""
+
+    __slots__ = (
+        "timeperiod",
+        "_count",
+        "_prev_high",
+        "_prev_low",
+        "_prev_close",
+        "_plus_dm",
+        "_minus_dm",
+        "_tr",
+        "_sum_dx",
+        "_adx",
+    )
+
+    def __init__(self, timeperiod: int = 14):
+        self.timeperiod = timeperiod
+        self._count = 0
+        self._prev_high = NAN
+        self._prev_low = NAN
+        self._prev_close = NAN
+        self._plus_dm = 0.0
+        self._minus_dm = 0.0
+        self._tr = 0.0
+        self._sum_dx = 0.0
+        self._adx = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        self._count += 1
+        period = self.timeperiod
+        if self._count == 1:
+            self._prev_high = high
+            self._prev_low = low
+            self._prev_close = close
+            return NAN
+
+        diff_p = high - self._prev_high
+        diff_m = self._prev_low - low
+        self._prev_high = high
+        self._prev_low = low
+
+        smoothing = self._count > period
+        if smoothing:
+            self._minus_dm -= self._minus_dm / period
+            self._plus_dm -= self._plus_dm / period
+        if diff_m > 0 and diff_p < diff_m:
+            self._minus_dm += diff_m
+        elif diff_p > 0 and diff_p > diff_m:
+            self._plus_dm += diff_p
+
+        tr = _true_range(high, low, self._prev_close)
+        self._prev_close = close
+        if not smoothing:
+            self._tr += tr
+            return NAN
+        self._tr = self._tr - (self._tr / period) + tr
+
+        dx = None
+        if not _is_zero(self._tr):
+            minus_di = 100.0 * (self._minus_dm / self._tr)
+            plus_di = 100.0 * (self._plus_dm / self._tr)
+            di_sum = minus_di + plus_di
+            if not _is_zero(di_sum):
+                dx = 100.0 * (abs(minus_di - plus_di) / di_sum)
+
+        if self._count <= 2 * period:
+            if dx is not None:
+                self._sum_dx += dx
+            if self._count < 2 * period:
+                return NAN
+            self._adx = self._sum_dx / period
+            return self._adx
+
+        if dx is not None:
+            self._adx = ((self._adx * (period - 1)) + dx) / period
+        return self._adx
+
+
+class StreamingBBANDS:
+    """TA-Lib BBANDS (matype=0), 제곱합 누적 방식의 표준편차"""
+
+    __slots__ = ("timeperiod", "nbdevup", "nbdevdn", "_window", "_total", "_total2")
+
+    def __init__(self, timeperiod: int = 20, nbdevup: float = 2, nbdevdn: float = 2):
+        self.timeperiod = timeperiod
+        self.nbdevup = nbdevup
+        self.nbdevdn = nbdevdn
+        self._window = deque()
+        self._total = 0.0
+        self._total2 = 0.0
+
+    def update(self, value: float) -> Tuple[float, float, float]:
+        self._window.append(value)
+        self._total += value
+        self._total2 += value * value
+        if len(self._window) < self.timeperiod:
+            return NAN, NAN, NAN
+
+        oldest = self._window.popleft()
+        middle = self._total / self.timeperiod
+        self._total -= oldest
+        mean2 = self._total2 / self.timeperiod
+        self._total2 -= oldest * oldest
+        mean2 -= middle * middle
+        stddev = math.sqrt(mean2) if not mean2 < 0.00000001 else 0.0
+
+        if self.nbdevup == self.nbdevdn:
+            if self.nbdevup == 1.0:
+                return middle + stddev, middle, middle - stddev
+            dev = stddev * self.nbdevup
+            return middle + dev, middle, middle - dev
+        return (
+            middle + stddev * self.nbdevup,
+            middle,
+            middle - stddev * self.nbdevdn,
+        )
+
+
+class IndicatorEngine:
+    """
+    - 캔들 한 건씩 받아 타임프레임별 지표를 상수 시간에 갱신
+    - 출력은 DataPreprocessor의 TA-Lib 계산 결과와 부동소수점 오차 범위 내에서 일치
+    """
+
+    def __init__(self, timeframe: str):
+        if timeframe not in INDICATOR_PARAMS:
+            raise ValueError("timeframe은 'macro' 또는 'micro'만 가능합니다.")
+        self.timeframe = timeframe
+        self.columns = indicator_columns(timeframe)
+        self.reset()
+
+    def reset(self) -> None:
+        params = INDICATOR_PARAMS[self.timeframe]
+        self._sma = [StreamingSMA(p) for p in params["sma"]]
+        self._ema = [StreamingEMA(p) for p in params["ema"]]
+        if self.timeframe == "macro":
+            self._macd = StreamingMACD(**params["macd"])
+            self._sar = StreamingSAR(**params["sar"])
+        else:
+            self._rsi = StreamingRSI(**params["rsi"])
+            self._stochf = StreamingSTOCHF(**params["stochf"])
+            self._adx = StreamingADX(**params["adx"])
+            self._bbands = StreamingBBANDS(**params["bbands"])
+
+    def update(self, high: float, low: float, close: float) -> List[float]:
+        """새 캔들을 반영하고 self.columns 순서의 지표값 목록을 반환"""
+        high, low, close = float(high), float(low), float(close)
+        values = [sma.update(close) for sma in self._sma]
+        values += [ema.update(close) for ema in self._ema]
+        if self.timeframe == "macro":
+            values += self._macd.update(close)
+            values.append(self._sar.update(high, low))
+        else:
+            values.append(self._rsi.update(close))
+            values += self._stochf.update(high, low, close)
+            values.append(self._adx.update(high, low, close))
+            values += self._bbands.update(close)
+        return values
+
+
+def indicator_columns(timeframe: str) -> List[str]:
+    params = INDICATOR_PARAMS[timeframe]
+    columns = [f"sma{p}" for p in params["sma"]] + [f"ema{p}" for p in params["ema"]]
+    if timeframe == "macro":
+        columns += ["macd", "macd_signal", "macd_hist", "sar"]
+    else:
+        columns += ["rsi", "stoch_k", "stoch_d", "adx", "bb_upper", "bb_middle", "bb_lower"]
+    return columns
+
+
+def compute_higher_timeframe_indicators(df: pd.DataFrame) -> None:
+    """매크로 지표를 TA-Lib으로 한 번에 계산 (df에 컬럼 추가)"""
+    params = INDICATOR_PARAMS["macro"]
+    close, high, low = (df[c].astype(float) for c in ("close", "high", "low"))
+
+    for p in params["sma"]:
+        df[f"sma{p}"] = talib.SMA(close, timeperiod=p)
+    for p in params["ema"]:
+        df[f"ema{p}"] = talib.EMA(close, timeperiod=p)
+    df["macd"], df["macd_signal"], df["macd_hist"] = talib.MACD(close, **params["macd"])
+    df["sar"] = talib.SAR(high, low, **params["sar"])
+
+
+def compute_lower_timeframe_indicators(df: pd.DataFrame) -> None:
+    """마이크로 지표를 TA-Lib으로 한 번에 계산 (df에 컬럼 추가)"""
+    params = INDICATOR_PARAMS["micro"]
+    close, high, low = (df[c].astype(float) for c in ("close", "high", "low"))
+    # 참고: https://realtrading.com/trading-blog/short-term-trading-indicators/
+
+    for p in params["sma"]:
+        df[f"sma{p}"] = talib.SMA(close, timeperiod=p)
+    for p in params["ema"]:
+        df[f"ema{p}"] = talib.EMA(close, timeperiod=p)
+    df["rsi"] = talib.RSI(close, **params["rsi"])
+    df["stoch_k"], df["stoch_d"] = talib.STOCHF(
+        high, low, close, **params["stochf"], fastd_matype=0
+    )
+    df["adx"] = talib.ADX(high, low, close, **params["adx"])
+    df["bb_upper"], df["bb_middle"], df["bb_lower"] = talib.BBANDS(
+        close, **params["bbands"], matype=0
+    )
+
+
+def compute_indicators(df: pd.DataFrame, timeframe: str) -> None:
+    if timeframe == "macro":
+        compute_higher_timeframe_indicators(df)
+    elif timeframe == "micro":
+        compute_lower_timeframe_indicators(df)
+    else:
+        raise ValueError("timeframe은 'macro' 또는 'micro'만 가능합니다.")
+
+
+def verify_talib_parity(
+    df: pd.DataFrame, timeframe: str, rtol: float = 1e-9, atol: float = 1e-8
+) -> Dict[str, float]:
+    """
+    스트리밍 엔진 결과를 TA-Lib 전체 재계산 결과와 비교
+    - NaN 위치가 다르거나 허용 오차를 넘으면 ValueError
+    - 컬럼별 최대 절대 오차를 반환
+    """
+    expected = df[["open", "high", "low", "close", "volume"]].copy()
+    compute_indicators(expected, timeframe)
+
+    engine = IndicatorEngine(timeframe)
+    streamed = np.array(
+        [
+            engine.update(h, l, c)
+            for h, l, c in zip(df["high"], df["low"], df["close"])
+        ],
+        dtype=float,
+    ).reshape(len(df), len(engine.columns))
+
+    max_errors = {}
+    for i, col in enumerate(engine.columns):
+        want = expected[col].to_numpy(dtype=float)
+        got = streamed[:, i]
+        if not np.array_equal(np.isnan(want), np.isnan(got)):
+            raise ValueError(f"[IndicatorEngine] '{col}' NaN 구간이 TA-Lib과 다릅니다.")
+        mask = ~np.isnan(want)
+        if not np.allclose(got[mask], want[mask], rtol=rtol, atol=atol):
+            raise ValueError(f"[IndicatorEngine] '{col}' 값이 TA-Lib과 다릅니다.")
+        max_errors[col] = float(np.max(np.abs(got[mask] - want[mask]), initial=0.0))
+    return max_errors
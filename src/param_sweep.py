@@ -0,0 +1,148 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.portfoilo_manager import TRADING_FEE
+from src.replay_engine import align_to_prices, encode_orders, replay
+
+# 체결 가격: 시가, 종가, VWAP 근사(고가·저가·종가 평균)
+FILL_PRICES = ("open", "close", "vwap")
+_PRICE_FIELDS = ("open", "high", "low", "close")
+
+METRIC_KEYS = ["return", "mdd", "sharpe", "sortino", "calmar", "volatility"]
+
+# 워커 프로세스가 붙은 공유 메모리 가격 배열 (이름 → (블록, (4, T) 배열))
+_attached: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+def fill_price_series(prices: np.ndarray, fill: str) -> np.ndarray:
+    """(4, T) open/high/low/close 배열에서 체결 가격 시리즈 선택"""
+    if fill == "open":
+        return prices[0]
+    if fill == "close":
+        return prices[3]
+    if fill == "vwap":
+        return (prices[1] + prices[2] + prices[3]) / 3
+    raise ValueError(
+        f"[param_sweep] fill은 {', '.join(FILL_PRICES)} 중 하나여야 합니다: {fill}"
+    )
+
+
+def _attach(name: str, shape: Tuple[int, int]) -> np.ndarray:
+    """
+    부모가 만든 공유 메모리 가격 배열에 붙음 (워커마다 한 번)
+    - 워커는 부모의 resource_tracker를 공유하므로 정리(unlink)는 부모가 한 번만 함
+    """
+    if name not in _attached:
+        shm = shared_memory.SharedMemory(name=name)
+        _attached[name] = (shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf))
+    return _attached[name][1]
+
+
+def _evaluate(
+    task: Dict[str, Any], prices: np.ndarray | None = None
+) -> List[Dict[str, Any]]:
+    """결정 세트 하나 × 체결 가격 하나에 대해 수수료 × 초기 자본 격자를 한 번에 평가"""
+    if prices is None:
+        prices = _attach(task["shm_name"], task["shape"])
+    fill_prices = fill_price_series(prices, task["fill"])[task["positions"]]
+
+    grid = list(itertools.product(task["fees"], task["initial_cashes"]))
+    fees = np.array([fee for fee, _ in grid])
+    initial_cashes = np.array([cash for _, cash in grid])
+    result = replay(
+        fill_prices,
+        np.tile(task["orders"], (len(grid), 1)),
+        np.tile(task["amounts"], (len(grid), 1)),
+        task["final_price"],
+        initial_cash=initial_cashes,
+        fee=fees,
+        interval_minutes=task["interval_minutes"],
+        risk_free_rate=task["risk_free_rate"],
+    )
+
+    rows = []
+    for i, (fee, initial_cash) in enumerate(grid):
+        rows.append(
+            {
+                "decisions": task["decisions"],
+                "fill": task["fill"],
+                "fee": fee,
+                "initial_cash": initial_cash,
+                **{key: float(result[key][i]) for key in METRIC_KEYS},
+                "final_value": float(result["equity"][i, -1]),
+            }
+        )
+    return rows
+
+
+def sweep(
+    decisions: Dict[str, pd.DataFrame],
+    prices: pd.DataFrame,
+    final_price: float,
+    fees: Sequence[float] = (TRADING_FEE,),
+    fills: Sequence[str] = ("open",),
+    initial_cashes: Sequence[float] = (10_000_000,),
+    interval_minutes: int = 15,
+    risk_free_rate: float = 0.0,
+    max_workers: int | None = None,
+) -> pd.DataFrame:
+    """
+    기록된 에이전트 결정을 수수료 × 체결 가격 × 초기 자본 격자로 다시 평가
+    - decisions: 이름 → trade 기록 (datetime/order/amount, replay_engine.load_records)
+    - prices: 결정 시각을 모두 포함하는 OHLCV 데이터
+    - final_price: 마지막 전량 매도 가격 (마지막 매크로 봉의 종가)
+    - 가격 배열은 공유 메모리에 한 번만 올리고, (결정 세트 × 체결 가격) 작업을
+      프로세스 풀(max_workers, 0이면 현재 프로세스)에서 나눠 실행
+    - 수수료 × 초기 자본 조합은 작업 안에서 배치 차원으로 한 번에 계산
+    - LLM 에이전트는 호출하지 않음
+    - 반환: 조합마다 한 행인 결과 표 (decisions/fill/fee/initial_cash + 성과 지표)
+    """
+    for fill in fills:
+        if fill not in FILL_PRICES:
+            raise ValueError(
+                f"[param_sweep] fill은 {', '.join(FILL_PRICES)} 중 하나여야 합니다: "
+                f"{fill}"
+            )
+
+    array = np.stack([prices[field].to_numpy(np.float64) for field in _PRICE_FIELDS])
+
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    try:
+        np.ndarray(array.shape, dtype=np.float64, buffer=shm.buf)[:] = array
+
+        tasks = []
+        for name, records in decisions.items():
+            positions = align_to_prices(prices, records["datetime"])
+            for fill in fills:
+                tasks.append(
+                    {
+                        "decisions": name,
+                        "fill": fill,
+                        "shm_name": shm.name,
+                        "shape": array.shape,
+                        "positions": positions,
+                        "orders": encode_orders(records["order"].to_numpy(object)),
+                        "amounts": records["amount"].fillna(0.0).to_numpy(np.float64),
+                        "final_price": final_price,
+                        "fees": list(fees),
+                        "initial_cashes": list(initial_cashes),
+                        "interval_minutes": interval_minutes,
+                        "risk_free_rate": risk_free_rate,
+                    }
+                )
+
+        if max_workers == 0:
+            results = [_evaluate(task, array) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_evaluate, tasks))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return pd.DataFrame([row for rows in results for row in rows])
@@ -0,0 +1,177 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# 1년을 분 단위로 (연환산 인자 계산용)
+MINUTES_PER_YEAR = 525600
+
+# 시각이 없는 기록(초기 현금)의 int64 표현
+_NAT = np.iinfo(np.int64).min
+
+
+class ValueHistory:
+    """
+    포트폴리오 가치 기록
+    - (시각, 가치)를 늘어나는 int64(ns)/float64 배열에 저장
+    - 용량이 차면 두 배로 늘려 append는 분할 상환 O(1)
+    - 시각이 없는 기록은 NaT로 저장
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._dates = np.empty(capacity, dtype=np.int64)
+        self._values = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, date: Optional[datetime], value: float) -> None:
+        if self._size == len(self._values):
+            self._grow()
+        self._dates[self._size] = _NAT if date is None else pd.Timestamp(date).value
+        self._values[self._size] = value
+        self._size += 1
+
+    def _grow(self) -> None:
+        capacity = max(2 * len(self._values), 1)
+        self._dates = np.resize(self._dates, capacity)
+        self._values = np.resize(self._values, capacity)
+
+    @property
+    def dates(self) -> np.ndarray:
+        """기록된 시각 (datetime64[ns] 뷰)"""
+        return self._dates[: self._size].view("datetime64[ns]")
+
+    @property
+    def values(self) -> np.ndarray:
+        """기록된 가치 (float64 뷰)"""
+        return self._values[: self._size]
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({"date": self.dates.copy(), "value": self.values.copy()})
+
+
+def _safe_divide(numerator: Any, denominator: Any) -> Any:
+    """분모가 0인 원소는 0으로 (스칼라/배열 공용)"""
+    numerator, denominator = np.broadcast_arrays(
+        np.asarray(numerator, dtype=np.float64),
+        np.asarray(denominator, dtype=np.float64),
+    )
+    out = np.zeros(numerator.shape)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out[()]
+
+
+class StreamingPerformance:
+    """
+    가치가 기록될 때마다 성과 지표를 O(1)로 갱신하는 누산기
+    - 수익률/MDD: 최신 가치와 최고치로 계산
+    - 초과 수익률의 평균·분산: Welford 알고리즘으로 누적 (모집단 분산)
+    - 하방 편차: 음의 초과 수익률 제곱합을 누적
+    - 구간 수익률은 시각이 있는 가치끼리만 계산 (초기 현금 기록은 제외)
+    - 가치로 배열을 넘기면 원소별로 독립된 포트폴리오의 지표를 한 번에 갱신
+      (replay_engine이 여러 결정 세트를 PortfolioManager와 같은 연산 순서로 평가)
+    """
+
+    def __init__(
+        self,
+        initial_value: float,
+        risk_free_rate: float = 0.0,
+        interval_minutes: int = 15,
+    ):
+        self.initial_value = initial_value
+        self.last_value = initial_value
+        self.peak_value = initial_value
+        self.max_drawdown = 0.0
+
+        # 연환산 인자: (분단위 1년=525600분) / interval_minutes
+        self.periods_per_year = MINUTES_PER_YEAR / interval_minutes
+        # 무위험 수익률을 1분 단위로 환산하여 적용
+        self.risk_free_per_period = risk_free_rate * (interval_minutes / 1440)
+
+        self._prev_value: Any = None
+        self.count = 0
+        self.mean_excess: Any = 0.0
+        self._m2: Any = 0.0
+        self._downside_sq: Any = 0.0
+
+    def update(self, value: Any, dated: bool = True) -> None:
+        self.last_value = value
+
+        # 최고치 갱신 및 MDD 계산
+        self.peak_value = np.maximum(self.peak_value, value)
+        drawdown = (self.peak_value - value) / self.peak_value * 100
+        self.max_drawdown = np.maximum(self.max_drawdown, drawdown)
+
+        if not dated:
+            return
+        prev_value, self._prev_value = self._prev_value, value
+        if prev_value is None:
+            return
+
+        excess = value / prev_value - 1 - self.risk_free_per_period
+        self.count += 1
+        delta = excess - self.mean_excess
+        self.mean_excess = self.mean_excess + delta / self.count
+        self._m2 = self._m2 + delta * (excess - self.mean_excess)
+        self._downside_sq = self._downside_sq + np.where(
+            excess < 0, excess * excess, 0.0
+        )
+
+    def _zeros(self) -> Any:
+        return np.zeros(np.shape(self.last_value))[()]
+
+    def total_return(self) -> Any:
+        """전체 수익률 (%)"""
+        return (self.last_value - self.initial_value) / self.initial_value * 100
+
+    def std(self) -> Any:
+        """구간 초과 수익률의 표준편차"""
+        if self.count == 0:
+            return self._zeros()
+        return np.sqrt(np.maximum(self._m2, 0.0) / self.count)
+
+    def downside_deviation(self) -> Any:
+        """구간 초과 수익률의 하방 편차 (목표 수익률 0)"""
+        if self.count == 0:
+            return self._zeros()
+        return np.sqrt(self._downside_sq / self.count)
+
+    def sharpe(self) -> Any:
+        # 표준편차 0이면 0
+        return _safe_divide(
+            np.sqrt(self.periods_per_year) * self.mean_excess, self.std()
+        )
+
+    def sortino(self) -> Any:
+        return _safe_divide(
+            np.sqrt(self.periods_per_year) * self.mean_excess,
+            self.downside_deviation(),
+        )
+
+    def volatility(self) -> Any:
+        """연환산 변동성 (%)"""
+        return np.sqrt(self.periods_per_year) * self.std() * 100
+
+    def annualized_return(self) -> Any:
+        """구간 평균 수익률의 연환산 (%)"""
+        if self.count == 0:
+            return self._zeros()
+        mean_return = self.mean_excess + self.risk_free_per_period
+        return mean_return * self.periods_per_year * 100
+
+    def calmar(self) -> Any:
+        """연환산 수익률 / MDD"""
+        return _safe_divide(self.annualized_return(), self.max_drawdown)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "return": self.total_return(),
+            "mdd": self.max_drawdown,
+            "sharpe": self.sharpe(),
+            "sortino": self.sortino(),
+            "calmar": self.calmar(),
+            "volatility": self.volatility(),
+        }
@@ -1,23 +1,41 @@
+import contextlib
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
-import numpy as np
+from src.performance_metrics import StreamingPerformance, ValueHistory
 
+# 거래 수수료 (매수/매도 금액 대비)
+TRADING_FEE = 0.0008
 
-class PortfolioManager:
-    _instance = None
+# 현재 실행(run) 중인 백테스트의 포트폴리오
+# - asyncio Task는 생성 시점의 컨텍스트를 복사하므로
+#   한 이벤트 루프에서 여러 백테스트가 돌아도 각자 자신의 포트폴리오를 봄
+_current_portfolio: ContextVar[Optional["PortfolioManager"]] = ContextVar(
+    "current_portfolio", default=None
+)
 
-    def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super().__new__(cls)
-        return cls._instance
 
-    # get_instance 메서드 추가
+class PortfolioManager:
     @classmethod
-    def get_instance(cls):
-        if not cls._instance:
-            cls._instance = cls()
-        return cls._instance
+    def get_instance(cls) -> "PortfolioManager":
+        """현재 컨텍스트에서 활성화된(activate) 포트폴리오"""
+        instance = _current_portfolio.get()
+        if instance is None:
+            raise RuntimeError(
+                "[PortfolioManager] 활성화된 포트폴리오가 없습니다. "
+                "TradingSystem.run() 안에서 호출해야 합니다."
+            )
+        return instance
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator["PortfolioManager"]:
+        """with 블록 안에서 get_instance()가 이 포트폴리오를 반환"""
+        token = _current_portfolio.set(self)
+        try:
+            yield self
+        finally:
+            _current_portfolio.reset(token)
 
     def __init__(
         self,
@@ -27,7 +45,7 @@ class PortfolioManager:
         interval_minutes: int = 15,
     ):
         self.coin = coin
-        self.fee = 0.0008
+        self.fee = TRADING_FEE
         self.portfolio = {
             "cash": cash,
             coin: 0,
@@ -37,14 +55,6 @@ class PortfolioManager:
             coin: 0,
         }
 
-        # 성과 지표 기록
-        self.initial_value = cash
-        self.portfolio_value_history: List[Dict[str, Any]] = [
-            {"date": None, "value": cash}
-        ]
-        self.peak_value = cash
-        self.max_drawdown = 0.0
-
         # 거래 기록
         self.trade_history: List[Dict[str, Any]] = []
         self._open_trade: Optional[Dict[str, Any]] = None
@@ -54,6 +64,16 @@ class PortfolioManager:
         # 연환산을 위한 인터벌 길이(분 단위), 15분봉이라면 15를 입력
         self.interval_minutes = interval_minutes
 
+        # 성과 지표 기록 (가치가 기록될 때마다 O(1)로 갱신)
+        self.initial_value = cash
+        self.portfolio_value_history = ValueHistory()
+        self.performance = StreamingPerformance(
+            initial_value=cash,
+            risk_free_rate=risk_free_rate,
+            interval_minutes=interval_minutes,
+        )
+        self._record_value(None, cash)
+
     async def update_portfolio_ratio(
         self, price_data: Dict[str, Any], is_sell_all: bool = False
     ) -> None:
@@ -156,13 +176,28 @@ class PortfolioManager:
 
     def _record_value(self, date: Optional[datetime], current_value: float) -> None:
         # 날짜와 함께 가치 기록
-        self.portfolio_value_history.append({"date": date, "value": current_value})
-        # 최고치 갱신 및 MDD 계산
-        if current_value > self.peak_value:
-            self.peak_value = current_value
-        drawdown = (self.peak_value - current_value) / self.peak_value * 100
-        if drawdown > self.max_drawdown:
-            self.max_drawdown = drawdown
+        self.portfolio_value_history.append(date, current_value)
+        # 수익률/MDD/샤프 등 누적 지표 갱신
+        self.performance.update(current_value, dated=date is not None)
+
+    # 체크포인트에 담는 상태
+    _STATE_KEYS = (
+        "portfolio",
+        "portfolio_ratio",
+        "trade_history",
+        "_open_trade",
+        "portfolio_value_history",
+        "performance",
+    )
+
+    def get_state(self) -> Dict[str, Any]:
+        """체크포인트용 상태 (바로 직렬화해야 이후 변경이 섞이지 않음)"""
+        return {key: getattr(self, key) for key in self._STATE_KEYS}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """get_state()로 저장한 상태로 복원"""
+        for key in self._STATE_KEYS:
+            setattr(self, key, state[key])
 
     def get_portfolio(self) -> Dict[str, Any]:
         return self.portfolio
@@ -172,12 +207,11 @@ class PortfolioManager:
 
     def compute_return(self) -> float:
         """전체 수익률 계산"""
-        final_value = self.portfolio_value_history[-1]["value"]
-        return (final_value - self.initial_value) / self.initial_value * 100
+        return self.performance.total_return()
 
     def compute_mdd(self) -> float:
         """최대 낙폭(MDD) 반환"""
-        return self.max_drawdown
+        return self.performance.max_drawdown
 
     def compute_sharpe(self) -> float:
         """
@@ -185,32 +219,20 @@ class PortfolioManager:
         interval_minutes 기준으로 연환산 인자를 적용합니다.
         예: 15분봉이라면 interval_minutes=15
         """
-        # 가치 시리즈에서 날짜 None 제거 후 값 추출
-        values = np.array(
-            [
-                rec["value"]
-                for rec in self.portfolio_value_history
-                if rec["date"] is not None
-            ]
-        )
-        if len(values) < 2:
-            return 0.0
-        # 구간별 수익률 계산
-        returns = values[1:] / values[:-1] - 1
-        # 초과 수익률
-        # 무위험 수익률을 1분 단위로 환산하여 적용
-        excess = returns - self.risk_free_rate * (self.interval_minutes / 1440)
-        # 표준편차 0 방지
-        if excess.std() == 0:
-            return 0.0
-        # 연환산 인자: (분단위 1년=525600분) / interval_minutes
-        periods_per_year = 525600 / self.interval_minutes
-        return np.sqrt(periods_per_year) * excess.mean() / excess.std()
+        return self.performance.sharpe()
+
+    def compute_sortino(self) -> float:
+        """소르티노 지수 계산 (하방 편차 기준, 샤프와 같은 연환산)"""
+        return self.performance.sortino()
+
+    def compute_calmar(self) -> float:
+        """칼마 지수 계산 (연환산 수익률 / MDD)"""
+        return self.performance.calmar()
+
+    def compute_volatility(self) -> float:
+        """연환산 변동성(%) 계산"""
+        return self.performance.volatility()
 
     def get_performance(self) -> Dict[str, float]:
-        """모든 성과 지표를 계산하여 반환"""
-        return {
-            "return": self.compute_return(),
-            "mdd": self.compute_mdd(),
-            "sharpe": self.compute_sharpe(),
-        }
+        """모든 성과 지표를 반환 (누적값이라 호출마다 O(1))"""
+        return self.performance.summary()
@@ -1,13 +1,78 @@
+import atexit
 import os
-from typing import Any, Dict
+import weakref
+from time import monotonic
+from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
+from src.background_writer import BackgroundWriter
+
+RECORD_FORMATS = ("csv", "jsonl", "parquet")
+
+# 프로세스 종료 시 남은 버퍼를 내보내기 위해 열려 있는 RecordManager를 추적
+_open_managers: "weakref.WeakSet[RecordManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all() -> None:
+    for manager in list(_open_managers):
+        manager.close()
+
+
+def read_record_file(path: str) -> pd.DataFrame:
+    """RecordManager가 남긴 기록 파일(csv/jsonl/parquet)을 읽음"""
+    extension = os.path.splitext(path)[1]
+    # 재개 시 다시 쓰는 기록이 원래 값과 같도록 부동소수점을 정확히 읽음
+    if extension == ".csv":
+        df = pd.read_csv(path, float_precision="round_trip")
+    elif extension == ".jsonl":
+        df = pd.read_json(path, lines=True, precise_float=True)
+    elif extension == ".parquet":
+        df = pd.read_parquet(path)
+    else:
+        raise ValueError(f"[RecordManager] 지원하지 않는 기록 파일 형식입니다: {path}")
+    df["datetime"] = pd.to_datetime(df["datetime"])
+    return df
+
 
 class RecordManager:
+    """
+    - 리포트를 datetime 기준으로 한 행씩 기록 (같은 datetime이면 업데이트)
+    - datetime → 행 번호 해시 인덱스로 업서트를 O(1)에 처리
+    - 행은 버퍼에 모았다가 flush_every개마다, flush_interval초마다,
+      close()/프로세스 종료 시 파일 끝에 이어 씀
+    - 이미 내보낸 행이 업데이트되거나 더 이른 시각의 행이 들어오면
+      다음 flush에서 전체를 정렬해 한 번 다시 씀
+    - file_format: csv | jsonl | parquet
+      (parquet은 pyarrow 필요, 행 그룹 단위로 이어 쓰고 close() 시 파일이 완성됨)
+    - writer가 주어지면 파일 쓰기는 백그라운드 스레드에서 진행
+      (버퍼의 스냅숏을 넘기므로 호출 쪽은 계속 기록 가능)
+    - 이벤트 루프에서는 arecord_step()/acheckpoint()/aclose()로 writer 큐가 가득 차도
+      루프를 막지 않음
+    - resume_rows가 주어지면 기존 파일의 앞(시간순) resume_rows개 행을 이어받아 시작
+      (체크포인트 이후에 기록된 행은 버림)
+    """
+
     def __init__(
-        self, coin: str, trend: str, report_type: str, system_mode: str = "full"
+        self,
+        coin: str,
+        trend: str,
+        report_type: str,
+        system_mode: str = "full",
+        run_id: str | None = None,
+        file_format: str = "csv",
+        flush_every: int = 64,
+        flush_interval: float = 5.0,
+        writer: BackgroundWriter | None = None,
+        resume_rows: int | None = None,
     ):
+        if file_format not in RECORD_FORMATS:
+            raise ValueError(
+                f"[RecordManager] file_format은 {', '.join(RECORD_FORMATS)} 중 "
+                f"하나여야 합니다: {file_format}"
+            )
         folder_path = system_mode
 
         self.folder_path = os.path.abspath(
@@ -18,7 +83,13 @@ class RecordManager:
         )
         os.makedirs(self.folder_path, exist_ok=True)
 
-        self.file_path = os.path.join(self.folder_path, f"{coin}_{trend}.csv")
+        # 같은 설정을 동시에 여러 번 돌릴 때 파일이 겹치지 않도록 run_id를 붙임
+        file_name = f"{coin}_{trend}" if run_id is None else f"{coin}_{trend}_{run_id}"
+        self.file_format = file_format
+        self.file_path = os.path.join(self.folder_path, f"{file_name}.{file_format}")
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.writer = writer
 
         if report_type == "macro":
             self.column_types = {
@@ -36,65 +107,275 @@ class RecordManager:
                 "amount": "float64",
             }
         elif report_type == "trade":
+            # order/amount: 이 시각 시가에 실행된 주문 (실행이 없으면 비어 있음)
             self.column_types = {
                 "datetime": "datetime64[ns]",
+                "order": "object",
+                "amount": "float64",
                 "return": "float64",
                 "mdd": "float64",
                 "sharpe": "float64",
+                "sortino": "float64",
+                "calmar": "float64",
+                "volatility": "float64",
             }
         else:
             raise ValueError(f"Unknown report_type: {report_type}")
 
-        # 👉 이미 파일이 존재하면 지우고 빈 데이터프레임으로 시작
-        if os.path.exists(self.file_path):
-            os.remove(self.file_path)
+        # 기록된 행(입력 순서)과 datetime → 행 번호 인덱스
+        self._rows: List[Dict[str, Any]] = []
+        self._index: Dict[pd.Timestamp, int] = {}
+        # _rows[:_flushed]는 이미 파일에 기록됨
+        self._flushed = 0
+        self._max_flushed: Optional[pd.Timestamp] = None
+        self._needs_rewrite = False
+        self._last_flush = monotonic()
+        self._df: Optional[pd.DataFrame] = None
+        self._parquet_writer = None
 
-        # 새 파일(혹은 방금 삭제한 파일) 기준으로 초기 데이터프레임 생성
-        self.df = pd.DataFrame(
-            {col: pd.Series(dtype=dtype) for col, dtype in self.column_types.items()}
-        )
-        self.save()
+        if resume_rows is not None:
+            self._resume(resume_rows)
+        else:
+            # 👉 이미 파일이 존재하면 지우고 빈 파일로 시작
+            self._submit(self._reset_file)
+        _open_managers.add(self)
 
     def record_step(self, data: Dict[str, Any]):
         """기존 datetime 있으면 업데이트, 없으면 새로 추가"""
+        if self._add(data):
+            self.flush()
+
+    async def arecord_step(self, data: Dict[str, Any]) -> None:
+        """이벤트 루프용 record_step()"""
+        if self._add(data):
+            await self.aflush()
+
+    def _add(self, data: Dict[str, Any]) -> bool:
+        """행을 버퍼에 업서트하고 flush할 때가 되었는지 반환"""
         dt = pd.to_datetime(data.get("datetime"))
         if dt is None:
             raise ValueError("datetime 값은 반드시 존재해야 합니다.")
 
-        # datetime 기준으로 기존 행 있는지 확인
-        existing_idx = self.df.index[self.df["datetime"] == dt]
-
         row = {}
         for col, dtype in self.column_types.items():
             val = data.get(col, None)
             try:
-                if dtype.startswith("datetime") and val is not None:
-                    row[col] = pd.to_datetime(val)
-                else:
-                    row[col] = pd.Series([val], dtype=dtype)[0]
+                row[col] = self._convert(val, dtype)
             except Exception as e:
                 raise ValueError(
                     f"[RecordManager] 컬럼 '{col}' 값 변환 실패: {val} → {dtype} / {e}"
                 )
 
-        import warnings
-
-        warnings.filterwarnings("ignore")
-
-        if not existing_idx.empty:
-            # 이미 존재하면 해당 행 업데이트
-            idx = existing_idx[0]
-            for key, value in row.items():
-                self.df.at[idx, key] = value
+        idx = self._index.get(dt)
+        if idx is not None:
+            # 이미 존재하면 해당 행 업데이트 (파일에 나간 행이면 다시 써야 함)
+            self._rows[idx] = row
+            if idx < self._flushed:
+                self._needs_rewrite = True
         else:
             # 존재하지 않으면 새 row 추가
-            self.df = pd.concat([self.df, pd.DataFrame([row])], ignore_index=True)
+            self._index[dt] = len(self._rows)
+            self._rows.append(row)
+            if self._max_flushed is not None and dt < self._max_flushed:
+                self._needs_rewrite = True
+        self._df = None
+
+        return (
+            len(self._rows) - self._flushed >= self.flush_every
+            or monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    @staticmethod
+    def _convert(val: Any, dtype: str) -> Any:
+        """값 하나를 컬럼 타입으로 변환 (None은 결측값으로)"""
+        if dtype.startswith("datetime"):
+            return pd.NaT if val is None else pd.to_datetime(val)
+        if dtype == "float64":
+            return np.nan if val is None else np.float64(val)
+        return val
+
+    def flush(self) -> None:
+        """버퍼에 쌓인 행을 파일에 내보냄"""
+        for job in self._flush_jobs():
+            self._submit(*job)
+
+    async def aflush(self) -> None:
+        for job in self._flush_jobs():
+            await self._asubmit(*job)
 
-        self.save()
+    def _flush_jobs(self) -> List[tuple]:
+        """버퍼를 내보낼 파일 작업 목록 (버퍼는 내보낸 것으로 표시)"""
+        jobs = []
+        if self._needs_rewrite:
+            jobs.append((self._write_all, list(self._rows)))
+        elif self._flushed < len(self._rows):
+            jobs.append((self._append_rows, self._rows[self._flushed :]))
+        self._flushed = len(self._rows)
+        if self._rows:
+            self._max_flushed = max(row["datetime"] for row in self._rows)
+        self._needs_rewrite = False
+        self._last_flush = monotonic()
+        return jobs
 
     def save(self):
-        self.df = self.df.sort_values(by="datetime")  # 기본은 ascending=True → 오름차순
-        self.df.to_csv(self.file_path, index=False, encoding="utf-8")
+        self.flush()
+
+    def close(self) -> None:
+        """남은 버퍼를 내보내고 파일을 완성 (parquet은 이때 footer가 기록됨)"""
+        self.flush()
+        self._submit(self._finalize)
+        _open_managers.discard(self)
+
+    async def aclose(self) -> None:
+        await self.aflush()
+        await self._asubmit(self._finalize)
+        _open_managers.discard(self)
+
+    def checkpoint(self) -> int:
+        """
+        체크포인트 시점까지의 행을 파일에 확정하고 행 수(재개 시 resume_rows)를 반환
+        - parquet은 작성 중인 파일을 완성하고, 이후 행은 다음 flush에서 전체를 다시 씀
+        """
+        self.flush()
+        if self.file_format == "parquet":
+            self._submit(self._finalize)
+            self._needs_rewrite = True
+        return len(self._rows)
+
+    async def acheckpoint(self) -> int:
+        await self.aflush()
+        if self.file_format == "parquet":
+            await self._asubmit(self._finalize)
+            self._needs_rewrite = True
+        return len(self._rows)
+
+    def _resume(self, resume_rows: int) -> None:
+        if resume_rows and not os.path.exists(self.file_path):
+            raise FileNotFoundError(
+                f"[RecordManager] 재개할 기록 파일이 없습니다: {self.file_path}"
+            )
+        rows = []
+        if resume_rows:
+            df = read_record_file(self.file_path)
+            df = df.sort_values(by="datetime", ignore_index=True).head(resume_rows)
+            df = df.reindex(columns=list(self.column_types))
+            # 결측값은 record_step과 같이 None/NaN으로
+            df = df.astype(object).where(df.notna(), None)
+            for data in df.to_dict("records"):
+                rows.append(
+                    {
+                        col: self._convert(data[col], dtype)
+                        for col, dtype in self.column_types.items()
+                    }
+                )
+        self._rows = rows
+        self._index = {row["datetime"]: i for i, row in enumerate(rows)}
+        self._flushed = len(rows)
+        if rows:
+            self._max_flushed = max(row["datetime"] for row in rows)
+        # 체크포인트 이후 행을 지우도록 이어받은 행으로 파일을 다시 씀
+        self._submit(self._write_all, list(rows))
+
+    def _submit(self, fn, *args) -> None:
+        """파일 작업을 writer 스레드에 맡김 (writer가 없거나 닫혔으면 바로 실행)"""
+        if self.writer is None or self.writer.closed:
+            fn(*args)
+        else:
+            self.writer.submit(fn, *args)
+
+    async def _asubmit(self, fn, *args) -> None:
+        if self.writer is None or self.writer.closed:
+            fn(*args)
+        else:
+            await self.writer.asubmit(fn, *args)
 
     def get_dataframe(self) -> pd.DataFrame:
-        return self.df
+        if self._df is None:
+            self._df = self._frame(self._rows)
+        return self._df
+
+    def _frame(self, rows: List[Dict[str, Any]]) -> pd.DataFrame:
+        df = pd.DataFrame(rows, columns=list(self.column_types))
+        df = df.astype(self.column_types)
+        return df.sort_values(by="datetime", ignore_index=True)
+
+    @property
+    def _partial_path(self) -> str:
+        return f"{self.file_path}.partial"
+
+    # 이하 파일 작업은 writer 스레드에서 순서대로 실행되며 넘겨받은 행만 사용
+    def _reset_file(self) -> None:
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+        self._write_all([])
+
+    def _finalize(self) -> None:
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+            os.replace(self._partial_path, self.file_path)
+
+    def _write_all(self, rows: List[Dict[str, Any]]) -> None:
+        """전체 행을 정렬해 다시 씀 (임시 파일에 쓴 뒤 교체)"""
+        df = self._frame(rows)
+        if self.file_format == "parquet":
+            # parquet은 이어 쓸 수 없어 작성 중인 파일을 버리고 새로 시작
+            if self._parquet_writer is not None:
+                self._parquet_writer.close()
+                self._parquet_writer = None
+            self._append_parquet(df)
+            return
+
+        tmp_path = f"{self.file_path}.tmp"
+        if self.file_format == "csv":
+            df.to_csv(tmp_path, index=False, encoding="utf-8")
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self._to_jsonl(df))
+        os.replace(tmp_path, self.file_path)
+
+    def _append_rows(self, rows: List[Dict[str, Any]]) -> None:
+        self._append(self._frame(rows))
+
+    def _append(self, df: pd.DataFrame) -> None:
+        if self.file_format == "csv":
+            df.to_csv(
+                self.file_path, mode="a", header=False, index=False, encoding="utf-8"
+            )
+        elif self.file_format == "jsonl":
+            with open(self.file_path, "a", encoding="utf-8") as f:
+                f.write(self._to_jsonl(df))
+        else:
+            self._append_parquet(df)
+
+    @staticmethod
+    def _to_jsonl(df: pd.DataFrame) -> str:
+        if df.empty:
+            return ""
+        text = df.to_json(orient="records", lines=True, date_format="iso")
+        return text if text.endswith("\n") else text + "\n"
+
+    def _append_parquet(self, df: pd.DataFrame) -> None:
+        """작성 중인 parquet 파일에 행 그룹 하나를 추가"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "[RecordManager] parquet 기록에는 pyarrow가 필요합니다."
+            ) from e
+
+        if self._parquet_writer is None:
+            arrow_types = {
+                "datetime64[ns]": pa.timestamp("ns"),
+                "float64": pa.float64(),
+                "object": pa.string(),
+            }
+            schema = pa.schema(
+                [(col, arrow_types[dtype]) for col, dtype in self.column_types.items()]
+            )
+            self._parquet_writer = pq.ParquetWriter(self._partial_path, schema)
+        table = pa.Table.from_pandas(
+            df, schema=self._parquet_writer.schema, preserve_index=False
+        )
+        self._parquet_writer.write_table(table)
@@ -0,0 +1,162 @@
+from typing import Any, Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.performance_metrics import StreamingPerformance
+from src.portfoilo_manager import TRADING_FEE
+from src.record_manager import read_record_file
+
+# 주문 코드 (NO_ORDER: 그 봉에서는 주문을 실행하지 않음 → 시가 가치만 기록)
+NO_ORDER = -1
+HOLD = 0
+BUY = 1
+SELL = 2
+ORDER_CODES = {"hold": HOLD, "buy": BUY, "sell": SELL}
+
+
+def encode_orders(orders: Sequence[Any]) -> np.ndarray:
+    """
+    주문 문자열 배열을 주문 코드로 변환
+    - None/NaN은 NO_ORDER, 알 수 없는 문자열은 PortfolioManager처럼 hold로 취급
+    """
+    orders = np.asarray(orders, dtype=object)
+    codes = np.full(orders.shape, NO_ORDER, dtype=np.int8)
+    for index, order in np.ndenumerate(orders):
+        if isinstance(order, str):
+            codes[index] = ORDER_CODES.get(order, HOLD)
+    return codes
+
+
+def replay(
+    open_prices: np.ndarray,
+    orders: np.ndarray,
+    amounts: np.ndarray,
+    final_price: float,
+    initial_cash: float | np.ndarray = 10_000_000,
+    fee: float | np.ndarray = TRADING_FEE,
+    interval_minutes: int = 15,
+    risk_free_rate: float = 0.0,
+) -> Dict[str, np.ndarray]:
+    """
+    주문 결정 시퀀스를 다시 실행해 자산 곡선과 성과 지표를 계산
+    - open_prices: (T,) 각 봉의 시가, 주문은 해당 봉 시가에 체결
+    - orders: (T,) 또는 (N, T) 주문 코드 (encode_orders 참고)
+    - amounts: orders와 같은 모양의 주문 비율 (총 자산 대비)
+    - final_price: 마지막에 전량 매도(sell_all)할 가격 (마지막 매크로 봉의 종가)
+    - initial_cash/fee: 스칼라 또는 결정 세트별 (N,) 배열
+    - N개의 결정 세트를 봉마다 한 번의 배열 연산으로 함께 계산
+    - 기록된 봉마다 주문 전 시가 가치를 기록하고, 주문이 있으면 체결 후 가치를
+      한 번 더 기록 (TradingSystem의 update_portfolio_ratio → execute 순서)
+    - 연산 순서가 PortfolioManager.update_portfolio_by_trade/sell_all과 같아
+      결과가 비트 단위로 일치
+    - 반환: equity (N, 기록 수) 자산 곡선과 return/mdd/sharpe/sortino/calmar/volatility
+      ((T,) 입력이면 배치 차원 없이 반환)
+    """
+    open_prices = np.asarray(open_prices, dtype=np.float64)
+    orders = np.asarray(orders)
+    single = orders.ndim == 1
+    orders = np.atleast_2d(orders)
+    amounts = np.broadcast_to(np.asarray(amounts, dtype=np.float64), orders.shape)
+    if orders.shape[1] != len(open_prices):
+        raise ValueError(
+            f"[replay] 주문 길이({orders.shape[1]})와 가격 길이({len(open_prices)})가 "
+            "다릅니다."
+        )
+
+    # 체결 후 가치가 기록되는 봉(주문이 실행된 봉)은 모든 결정 세트에서 같아야 함
+    executed = orders != NO_ORDER
+    if not (executed == executed[:1]).all():
+        raise ValueError("[replay] 결정 세트마다 주문이 실행되는 봉이 다릅니다.")
+    executed = executed[0]
+
+    n_sets = orders.shape[0]
+    cash = np.broadcast_to(np.asarray(initial_cash, dtype=np.float64), n_sets).copy()
+    fee = np.asarray(fee, dtype=np.float64)
+    coin = np.zeros(n_sets)
+    performance = StreamingPerformance(
+        initial_value=cash.copy(),
+        risk_free_rate=risk_free_rate,
+        interval_minutes=interval_minutes,
+    )
+    equity = [cash.copy()]
+
+    for t in range(len(open_prices)):
+        price = open_prices[t]
+        # 주문 여부와 관계없이 봉 시가 기준 가치 기록
+        value = cash + coin * price
+        performance.update(value)
+        equity.append(value)
+        if not executed[t]:
+            continue
+
+        amount = amounts[:, t]
+        buy = orders[:, t] == BUY
+        sell = orders[:, t] == SELL
+
+        total_value = cash + coin * price  # 총 자산
+        # 매수: 수수료가 반영된 금액만큼 코인 증가, 현금은 수수료 반영 전 금액 차감
+        buy_coin = coin + total_value * amount * (1 - fee) / price
+        buy_cash = cash - total_value * amount
+        # 매도: 코인 차감, 현금은 수수료가 반영된 금액 증가
+        sell_value = total_value * amount
+        sell_coin = coin - sell_value / price
+        sell_cash = cash + sell_value * (1 - fee)
+
+        coin = np.where(buy, buy_coin, np.where(sell, sell_coin, coin))
+        cash = np.where(buy, buy_cash, np.where(sell, sell_cash, cash))
+
+        value = cash + coin * price
+        performance.update(value)
+        equity.append(value)
+
+    # 모든 코인을 종가에 판매
+    cash = cash + (coin * final_price) * (1 - fee)
+    value = cash + 0 * final_price
+    performance.update(value)
+    equity.append(value)
+
+    result = {"equity": np.stack(equity, axis=1), **performance.summary()}
+    if single:
+        return {key: value[0] for key, value in result.items()}
+    return result
+
+
+def load_records(path: str) -> pd.DataFrame:
+    """RecordManager가 남긴 trade 기록 파일(csv/jsonl/parquet)을 읽음"""
+    return read_record_file(path)
+
+
+def align_to_prices(prices: pd.DataFrame, dates: Any) -> np.ndarray:
+    """기록 시각마다 가격 데이터(datetime 오름차순)의 행 위치 (없는 시각이면 오류)"""
+    timestamps = pd.to_datetime(prices["datetime"]).to_numpy("datetime64[ns]")
+    dates = pd.to_datetime(pd.Series(dates)).to_numpy("datetime64[ns]")
+    positions = np.searchsorted(timestamps, dates)
+    found = positions < len(timestamps)
+    found[found] = timestamps[positions[found]] == dates[found]
+    if not found.all():
+        missing = pd.Timestamp(dates[~found][0])
+        raise ValueError(f"[replay] 가격 데이터에 없는 시각입니다: {missing}")
+    return positions
+
+
+def replay_records(
+    records: pd.DataFrame,
+    prices: pd.DataFrame,
+    final_price: float,
+    **kwargs: Any,
+) -> Dict[str, np.ndarray]:
+    """
+    trade 기록(datetime/order/amount)을 가격 데이터의 시가에 맞춰 다시 실행
+    - prices: datetime/open 컬럼이 있는 OHLCV 데이터 (기록된 모든 시각을 포함해야 함)
+    - 나머지 인자는 replay()로 전달
+    """
+    positions = align_to_prices(prices, records["datetime"])
+    open_prices = prices["open"].to_numpy(np.float64)[positions]
+    return replay(
+        open_prices,
+        encode_orders(records["order"].to_numpy(object)),
+        records["amount"].fillna(0.0).to_numpy(np.float64),
+        final_price,
+        **kwargs,
+    )
@@ -0,0 +1,85 @@
+from collections.abc import Mapping
+from typing import Any, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class Tick(Mapping):
+    """
+    캔들 한 개 (TickStream이 만드는 가벼운 레코드)
+    - 시각은 미리 파싱(pd.Timestamp)하고 price_data용 문자열로도 포맷해 둠
+    - ["open"], .get("datetime") 등 dict처럼 읽을 수 있어 포트폴리오/주문 실행에
+      price_data로 그대로 넘김 (dict가 꼭 필요할 때만 to_dict())
+    - 키 순서와 값 타입은 iterrows().to_dict()와 같음
+    """
+
+    __slots__ = ("index", "datetime", "label", "_columns", "_values")
+
+    def __init__(
+        self,
+        index: int,
+        datetime: pd.Timestamp,
+        label: str,
+        columns: Tuple[str, ...],
+        values: Tuple[Any, ...],
+    ):
+        self.index = index
+        self.datetime = datetime
+        self.label = label
+        self._columns = columns
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "datetime":
+            return self.datetime
+        try:
+            return self._values[self._columns.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        yield "datetime"
+        yield from self._columns
+
+    def __len__(self) -> int:
+        return len(self._columns) + 1
+
+    def __repr__(self) -> str:
+        return f"Tick({self.index}, {self.to_dict()})"
+
+    def to_dict(self) -> dict:
+        return {"datetime": self.datetime, **dict(zip(self._columns, self._values))}
+
+
+class TickStream:
+    """
+    - DataFrame(datetime + OHLCV) 구간을 Tick 시퀀스로 변환 (iterrows/to_dict 대체)
+    - 컬럼 배열을 한 번에 파이썬 값으로 바꾸고, 시각 파싱·포맷도 구간 전체를
+      한 번에 벡터화해 틱마다 Series를 만들지 않음
+    - 인덱스는 DataFrame의 index (차트 파일명/스케줄러 키에 사용)
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        columns = tuple(col for col in df.columns if col != "datetime")
+        times = pd.DatetimeIndex(df["datetime"])
+        labels = np.datetime_as_string(times.to_numpy("datetime64[ns]"), unit="s")
+        rows = zip(*(df[col].to_numpy().tolist() for col in columns))
+        self._ticks: List[Tick] = [
+            Tick(index, time, label, columns, values)
+            for index, time, label, values in zip(
+                df.index.tolist(),
+                times.tolist(),
+                np.char.replace(labels, "T", " ").tolist(),
+                rows,
+            )
+        ]
+
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+    def __iter__(self) -> Iterator[Tick]:
+        return iter(self._ticks)
+
+    def __getitem__(self, key: int | slice) -> Tick | List[Tick]:
+        return self._ticks[key]
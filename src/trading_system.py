@@ -1,15 +1,25 @@
 import asyncio
-from time import time
+from time import monotonic, time
+from typing import Tuple
 
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 from pandas.tseries.offsets import MonthEnd
 
+from src.agent_scheduler import AgentScheduler
+from src.agents.client_pool import get_model_client_registry
 from src.agents.macro.macro_analysis_team import MacroAnalysisTeam
 from src.agents.micro.micro_analysis_team import MicroAnalysisTeam
+from src.agents.output_repair import get_output_repair_stats
+from src.agents.token_accounting import TokenLedger, get_token_counter
+from src.background_writer import BackgroundWriter
+from src.checkpoint import Checkpointer
 from src.data_preprocessor import DataPreprocessor
+from src.dataset_registry import get_dataset_registry
 from src.portfoilo_manager import PortfolioManager
 from src.record_manager import RecordManager
+from src.tick_stream import Tick, TickStream
 from src.trade_executor import TradeExecutor
 
 
@@ -24,6 +34,14 @@ class TradingSystem:
         micro_tick: str,
         system_mode: str = "full",  # macro, micro, full
         initial_balance: float = 10_000_000,
+        use_feature_store: bool = False,
+        use_chart_cache: bool = True,
+        agent_concurrency: int = 1,
+        run_id: str | None = None,
+        record_format: str = "csv",
+        resume: bool = False,
+        checkpoint_every: int = 1,
+        checkpoint_interval: float = 60.0,
     ):
         self.trend = trend
         self.start_date = start_date
@@ -34,25 +52,29 @@ class TradingSystem:
         self.micro_tick = micro_tick
         self.system_mode = system_mode
 
+        # 같은 코인/틱/기간의 캔들과 지표는 프로세스 안의 실행끼리 한 번만 준비해 공유
+        registry = get_dataset_registry()
+
         def load_data(tick):
             """
             coin: BTC, ETH, SOL
             tick: __desc__
+            - 컬럼형 변환본에서 [start_date, end_date) 구간만 읽음 (읽기 전용 공유 view)
             """
-            if self.end_date:
-                return pd.read_csv(f"data/{coin}_{tick}.csv")
-
-        df_macro_full = load_data(macro_tick)
-        df_micro_full = load_data(micro_tick)
-
-        self.df_macro = df_macro_full[
-            (pd.to_datetime(df_macro_full["datetime"]) >= self.start_date)
-            & (pd.to_datetime(df_macro_full["datetime"]) < self.end_date)
-        ]
-        self.df_micro = df_micro_full[
-            (pd.to_datetime(df_micro_full["datetime"]) >= self.start_date)
-            & (pd.to_datetime(df_micro_full["datetime"]) < self.end_date)
-        ]
+            return registry.frame(coin, tick, self.start_date, self.end_date)
+
+        self.df_macro = load_data(macro_tick)
+        self.df_micro = load_data(micro_tick)
+
+        # 분봉을 매크로 틱 구간별로 한 번만 나눠 두고 틱마다 view로 반환
+        # (변환본이 시간순으로 정렬되어 있으므로 구간 경계는 이진 탐색)
+        self._micro_datetimes = self.df_micro["datetime"].to_numpy("datetime64[ns]")
+        macro_starts = pd.DatetimeIndex(self.df_macro["datetime"])
+        lows, highs = self._micro_bounds(macro_starts)
+        self._micro_buckets = {
+            start: (int(lo), int(hi))
+            for start, lo, hi in zip(macro_starts, lows, highs)
+        }
 
         # interval_minutes를 macro_tick, micro_tick에 따라 동적으로 할당
         tick_to_minutes = {
@@ -73,22 +95,115 @@ class TradingSystem:
         self.portfolio_manager = PortfolioManager(
             coin=coin, cash=initial_balance, interval_minutes=interval_minutes
         )
-
-        self.data_preprocessor = DataPreprocessor(self.df_macro, self.df_micro)
-        self.macro_analysis_team = MacroAnalysisTeam()
-        self.micro_analysis_team = MicroAnalysisTeam()
+        # 이 실행의 에이전트 호출별 토큰 사용량
+        self.token_ledger = TokenLedger()
+
+        # 지표를 사전 계산해 두고 틱마다 인덱스 조회로 사용
+        # - use_feature_store: TA-Lib으로 계산해 디스크에 캐시한 지표
+        # - 그 외: 증분 경로와 같은 값을 시나리오마다 한 번만 계산해 공유
+        #   (macro 모드는 분봉을 순회하지 않으므로 매크로 지표만)
+        ticks = {"macro": macro_tick}
+        if system_mode != "macro":
+            ticks["micro"] = micro_tick
+        if use_feature_store:
+            feature_stores = {
+                timeframe: registry.feature_store(
+                    coin, tick, timeframe, start_date=start_date
+                )
+                for timeframe, tick in ticks.items()
+            }
+        else:
+            feature_stores = {
+                timeframe: registry.indicators(
+                    coin, tick, timeframe, start_date, end_date
+                )
+                for timeframe, tick in ticks.items()
+            }
+        # 차트/기록 파일 쓰기는 모두 백그라운드 writer 스레드에서 처리
+        self.io_writer = BackgroundWriter()
+
+        # checkpoint_every개 매크로 틱마다, 마지막 저장 후 checkpoint_interval초가
+        # 지났으면 실행 상태를 저장 (checkpoint_every=0이면 저장하지 않음)
+        # - 포트폴리오 가치 기록 전체를 직렬화하므로 틱이 빠른 실행(캐시 재생 등)에서
+        #   매 틱 저장하지 않도록 시간 간격을 둠 (0이면 checkpoint_every마다 저장)
+        # resume=True면 마지막 체크포인트 다음 매크로 틱부터 이어서 실행
+        # - 체크포인트 때 끝나 있던 prefetch 결과는 다시 쓰고, 끝나지 않았던 호출만
+        #   다시 보냄 (같은 응답을 받으려면 LLM_CACHE_MODE=record/record_missing)
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpointer = Checkpointer(
+            config={
+                "trend": trend,
+                "start_date": start_date,
+                "end_date": end_date,
+                "coin": coin,
+                "macro_tick": macro_tick,
+                "micro_tick": micro_tick,
+                "system_mode": system_mode,
+                "initial_balance": initial_balance,
+            },
+            coin=coin,
+            trend=trend,
+            system_mode=system_mode,
+            run_id=run_id,
+            writer=self.io_writer,
+        )
+        checkpoint = self.checkpointer.load() if resume else None
+        if checkpoint is None:
+            self.checkpointer.clear()
+        records = checkpoint["records"] if checkpoint else {}
+        self.start_tick = checkpoint["next_tick"] if checkpoint else 0
+        self.last_macro_report = checkpoint["last_macro_report"] if checkpoint else None
+
+        self.data_preprocessor = DataPreprocessor(
+            self.df_macro,
+            self.df_micro,
+            feature_stores=feature_stores,
+            chart_cache=registry.chart_cache() if use_chart_cache else None,
+            writer=self.io_writer,
+        )
+        # 포트폴리오와 무관한 에이전트 호출을 agent_concurrency개까지 동시에 실행
+        self.scheduler = AgentScheduler(max_concurrency=agent_concurrency)
+        self.macro_analysis_team = MacroAnalysisTeam(pool_size=agent_concurrency)
+        self.micro_analysis_team = MicroAnalysisTeam(pool_size=agent_concurrency)
         self.trade_executor = TradeExecutor()
 
         self.macro_recode_manager = RecordManager(
-            coin=coin, trend=trend, report_type="macro", system_mode=system_mode
+            coin=coin,
+            trend=trend,
+            report_type="macro",
+            system_mode=system_mode,
+            run_id=run_id,
+            file_format=record_format,
+            writer=self.io_writer,
+            resume_rows=records.get("macro"),
         )
         self.micro_recode_manager = RecordManager(
-            coin=coin, trend=trend, report_type="micro"
+            coin=coin,
+            trend=trend,
+            report_type="micro",
+            run_id=run_id,
+            file_format=record_format,
+            writer=self.io_writer,
+            resume_rows=records.get("micro"),
         )
         self.trade_recode_manager = RecordManager(
-            coin=coin, trend=trend, report_type="trade", system_mode=system_mode
+            coin=coin,
+            trend=trend,
+            report_type="trade",
+            system_mode=system_mode,
+            run_id=run_id,
+            file_format=record_format,
+            writer=self.io_writer,
+            resume_rows=records.get("trade"),
         )
 
+        if checkpoint is not None:
+            self.portfolio_manager.set_state(checkpoint["portfolio"])
+            self.data_preprocessor.set_state(checkpoint["preprocessor"])
+            self.scheduler.restore(checkpoint.get("prefetched", {}))
+            print(f"Resuming from checkpoint: macro tick {self.start_tick}")
+
     async def run(self) -> dict:
         print("Starting backtest...")
         print(f"trend: {self.trend}")
@@ -100,34 +215,76 @@ class TradingSystem:
         print(f"System Mode: {self.system_mode}")
         print(f"Initial balance: {self.initial_balance}")
 
+        # 에이전트/TradeExecutor가 get_instance()로 이 실행의 포트폴리오를 보도록 활성화
+        # 에이전트 모델 호출의 토큰 수도 이 실행의 장부에 기록
+        with self.portfolio_manager.activate(), self.token_ledger.activate():
+            try:
+                await self._run_ticks()
+            finally:
+                await self.scheduler.close()
+                # 버퍼에 남은 기록을 내보내고 파일을 완성
+                for record_manager in (
+                    self.macro_recode_manager,
+                    self.micro_recode_manager,
+                    self.trade_recode_manager,
+                ):
+                    await record_manager.aclose()
+                # 남은 쓰기를 기다림 (실패한 쓰기가 있으면 BackgroundWriteError)
+                await self.io_writer.aclose()
+
+        await self.portfolio_manager.sell_all(
+            price_data=self.df_macro.iloc[-1].to_dict(),
+        )
+        # 끝까지 실행했으므로 더 이어서 실행할 체크포인트가 없음
+        self.checkpointer.clear()
+
+        print("Backtest completed.")
+        print(f"Portfolio performance: {self.portfolio_manager.get_performance()}")
+        return self.portfolio_manager.get_performance()
+
+    async def _run_ticks(self) -> None:
         # 1. 매크로 단위 데이터를 순회
         start_time = time()
-        for index, macro_tick in self.df_macro.iterrows():
-            # start_date 이전에 대해서는 가격적 분석 지표만 추가
-            macro_dict = macro_tick.to_dict()
+        last_checkpoint = monotonic()
+        macro_ticks = TickStream(self.df_macro)
+        for n, macro_tick in enumerate(macro_ticks):
+            if n < self.start_tick:
+                # 체크포인트 이전에 끝난 틱
+                continue
+            if (
+                n > self.start_tick
+                and self.checkpoint_every
+                and n % self.checkpoint_every == 0
+                and monotonic() - last_checkpoint >= self.checkpoint_interval
+            ):
+                # 직전 매크로 틱까지 끝난 상태를 저장
+                await self._save_checkpoint(n)
+                last_checkpoint = monotonic()
+
+            # 포트폴리오와 무관한 추세 분석은 앞으로 올 틱까지 미리 실행
+            for ahead in macro_ticks[n : n + 1 + self.scheduler.lookahead]:
+                self._prefetch_macro(ahead)
 
             macro_start_time = time()
 
             print(f"###### {macro_tick['datetime']} 틱 시작 ######")
 
-            # 2. 현재까지의 매크로 단위 데이터를 활용, 가격적 분석 지표 추가 및 차트 생성
-            price_data, fig = self.data_preprocessor.update_and_get_price_data(
-                row=macro_dict,
-                timeframe="macro",
-                save_path=f"data/close_charts/{self.trend}/{index+1}_macro_chart",
-            )
-            # 3. 매크로 시장 분석
-            macro_report = await self.macro_analysis_team.analyze(
-                price_data=price_data, fig=fig
+            # 2~3. 가격 지표/차트 생성 및 추세 분석 (prefetch 결과)
+            price_data, trend_report = await self.scheduler.result(
+                ("macro", macro_tick.index)
             )
+            # 3. 매크로 시장 분석 (투자 비율은 포트폴리오에 의존하므로 순서대로)
+            adjuster = self.macro_analysis_team.investment_rate_adjuster
+            macro_report = await adjuster.adjust_rate_limit(trend_report, price_data)
 
             print(f"Macro Report: {macro_report}")
+            self.last_macro_report = macro_report
             macro_report_tmp = macro_report.copy()
             macro_report_tmp["datetime"] = macro_tick["datetime"]
             macro_report_tmp["trend"] = macro_report["trend_report"]["trend"]
             macro_report_tmp["confidence"] = macro_report["trend_report"]["confidence"]
             macro_report_tmp["rate_limit"] = macro_report["limit_report"]["rate_limit"]
-            self.macro_recode_manager.record_step(macro_report_tmp)
+            await self.macro_recode_manager.arecord_step(macro_report_tmp)
 
             if abs(macro_report["limit_report"]["rate_limit"]) < 1e-8:
                 print("No rate_limit, skipping micro analysis.")
@@ -158,7 +315,11 @@ class TradingSystem:
                 #     order = "hold"
                 #     amount = 0.0
 
-                self.portfolio_manager.update_portfolio_ratio(price_data=macro_dict)
+                # 봉 시가 가치 기록 → 체결 후 가치 기록 순서는 replay_engine.replay가
+                # 그대로 재현함 (순서를 바꾸면 replay도 함께 고쳐야 함)
+                await self.portfolio_manager.update_portfolio_ratio(
+                    price_data=macro_tick
+                )
 
                 order_report = await self.micro_analysis_team.order_tactician.decide(
                     macro_report=macro_report, pulse_report=None
@@ -167,16 +328,17 @@ class TradingSystem:
                 print(f"Order Report: {order_report}")
 
                 await self.trade_executor.execute(
-                    price_data=macro_dict,
+                    price_data=macro_tick,
                     coin=self.coin,
                     micro_report={"order_report": order_report},
                 )
 
                 trade_report = {
-                    "datetime": macro_dict["datetime"],
+                    "datetime": macro_tick["datetime"],
+                    **order_report,
                     **self.portfolio_manager.get_performance(),
                 }
-                self.trade_recode_manager.record_step(trade_report)
+                await self.trade_recode_manager.arecord_step(trade_report)
 
             else:
                 # 4. 해당 매크로 단위 캔들에 속해있는 마이크로 데이터만 필터, self.df_micro와 구분됨
@@ -184,52 +346,50 @@ class TradingSystem:
                 # 5. 마이크로 시장 분석 및 투자 진행
                 # 이전 마이크로 분석 리포트 초기화(시가에 구매를 위해)
                 micro_report = None
-                for index, micro_tick in df_micro.iterrows():
-                    micro_dict = micro_tick.to_dict()
-
-                    self.portfolio_manager.update_portfolio_ratio(price_data=micro_dict)
+                micro_ticks = TickStream(df_micro)
+                for m, micro_tick in enumerate(micro_ticks):
+                    for ahead in micro_ticks[m : m + 1 + self.scheduler.lookahead]:
+                        self._prefetch_micro(ahead)
+
+                    # 주문이 없는 봉(매크로 틱의 첫 분봉)도 시가 가치는 기록
+                    # (replay_engine.replay와 같은 순서)
+                    await self.portfolio_manager.update_portfolio_ratio(
+                        price_data=micro_tick
+                    )
 
                     # 5.1 시가에 대해서 매도/매수/보유 결정
                     await self.trade_executor.execute(
-                        price_data=micro_dict,
+                        price_data=micro_tick,
                         coin=self.coin,
                         micro_report=micro_report,
                     )
 
                     trade_report = {
-                        "datetime": micro_dict["datetime"],
+                        "datetime": micro_tick["datetime"],
+                        **(micro_report["order_report"] if micro_report else {}),
                         **self.portfolio_manager.get_performance(),
                     }
-                    self.trade_recode_manager.record_step(trade_report)
+                    await self.trade_recode_manager.arecord_step(trade_report)
 
                     print(f"## {micro_tick['datetime']} 틱 ##")
 
-                    # 6. 현재까지의 마이크로 단위 데이터를 활용, 가격적 분석 지표 추가 및 차트 생성
-                    price_data, fig = self.data_preprocessor.update_and_get_price_data(
-                        row=micro_dict,
-                        timeframe="micro",
-                        save_path=f"data/close_charts/{self.trend}/{index+1}_micro_chart",
+                    # 6. 가격 지표/차트 생성 및 펄스 감지 (prefetch 결과)
+                    pulse_report = await self.scheduler.result(
+                        ("micro", micro_tick.index)
                     )
 
-                    if self.system_mode == "micro":
-                        # 7. 마이크로 시장 분석 및 주문 결정
-                        micro_report = (
-                            await self.micro_analysis_team.pulse_detector.detect(
-                                price_data=price_data, fig=fig
-                            )
-                        )
-                        micro_report = (
-                            await self.micro_analysis_team.order_tactician.decide(
-                                macro_report=None, pulse_report=micro_report
-                            )
-                        )
-                    else:
-                        # 7. 마이크로 시장 분석 및 주문 결정
-                        micro_report = await self.micro_analysis_team.analyze(
-                            price_data=price_data,
-                            fig=fig,
-                            macro_report=macro_report,
-                        )
+                    # 7. 주문 결정 (포트폴리오에 의존하므로 순서대로)
+                    tactician = self.micro_analysis_team.order_tactician
+                    order_report = await tactician.decide(
+                        macro_report=(
+                            None if self.system_mode == "micro" else macro_report
+                        ),
+                        pulse_report=pulse_report,
+                    )
+                    micro_report = {
+                        "pulse_report": pulse_report,
+                        "order_report": order_report,
+                    }
 
                     print(f"Micro Report: {micro_report}")
                     micro_report_tmp = {
@@ -239,7 +399,7 @@ class TradingSystem:
                         "order": micro_report["order_report"]["order"],
                         "amount": micro_report["order_report"]["amount"],
                     }
-                    self.micro_recode_manager.record_step(micro_report_tmp)
+                    await self.micro_recode_manager.arecord_step(micro_report_tmp)
 
                 macro_end_time = time()
                 print(
@@ -247,14 +407,80 @@ class TradingSystem:
                 )
         end_time = time()
         print(f"Total time taken for backtest: {end_time - start_time:.2f} seconds")
-
-        await self.portfolio_manager.sell_all(
-            price_data=self.df_macro.iloc[-1].to_dict(),
+        if self.data_preprocessor.chart_cache is not None:
+            print(f"Chart cache: {self.data_preprocessor.chart_cache.stats()}")
+        print(f"Agent output repair: {get_output_repair_stats().stats()}")
+        token_report = self.token_ledger.report()
+        if not token_report.empty:
+            print(f"Token usage ({get_token_counter().encoding_name}):")
+            print(token_report.to_string())
+
+    async def _save_checkpoint(self, next_tick: int) -> None:
+        """next_tick 이전의 매크로 틱이 모두 끝난 시점의 실행 상태 저장"""
+        # 기록 flush를 먼저 예약하고 (큐가 가득 차면 여기서 기다림)
+        # 나머지 상태는 기다림 없이 한 번에 직렬화해 서로 어긋나지 않게 함
+        records = {
+            "macro": await self.macro_recode_manager.acheckpoint(),
+            "micro": await self.micro_recode_manager.acheckpoint(),
+            "trade": await self.trade_recode_manager.acheckpoint(),
+        }
+        await self.checkpointer.asave(
+            {
+                "next_tick": next_tick,
+                "portfolio": self.portfolio_manager.get_state(),
+                "preprocessor": self.data_preprocessor.get_state(),
+                "last_macro_report": self.last_macro_report,
+                # 이미 끝난 prefetch 결과 (재개 시 같은 모델 호출을 다시 보내지 않음)
+                "prefetched": self.scheduler.completed(),
+                # 기록 파일은 체크포인트보다 먼저 writer 큐에 들어가 먼저 확정됨
+                "records": records,
+            }
         )
 
-        print("Backtest completed.")
-        print(f"Portfolio performance: {self.portfolio_manager.get_performance()}")
-        return self.portfolio_manager.get_performance()
+    def _prefetch_macro(self, tick: Tick) -> None:
+        """
+        매크로 틱의 추세 분석을 예약 (이미 예약됐으면 무시)
+        - 가격 지표/차트는 작업이 실제로 실행될 때 만듦
+          (lookahead로 예약만 하고 끝난 틱은 차트를 그리지 않음)
+        """
+        key = ("macro", tick.index)
+        if key in self.scheduler:
+            return
+
+        async def job():
+            # 현재까지의 매크로 단위 데이터를 활용, 가격적 분석 지표 추가 및 차트 생성
+            price_data, chart = await self.data_preprocessor.update_and_get_price_data(
+                row=tick,
+                timeframe="macro",
+                save_path=f"data/close_charts/{self.trend}/{tick.index+1}_macro_chart",
+            )
+            trend_report = await self.macro_analysis_team.trend_analyzer.analyze(
+                price_data=price_data, chart=chart
+            )
+            return price_data, trend_report
+
+        self.scheduler.prefetch(key, job)
+
+    def _prefetch_micro(self, tick: Tick) -> None:
+        """
+        마이크로 틱의 펄스 감지를 예약 (이미 예약됐으면 무시)
+        - 가격 지표/차트는 작업이 실제로 실행될 때 만듦
+        """
+        key = ("micro", tick.index)
+        if key in self.scheduler:
+            return
+
+        async def job():
+            price_data, chart = await self.data_preprocessor.update_and_get_price_data(
+                row=tick,
+                timeframe="micro",
+                save_path=f"data/close_charts/{self.trend}/{tick.index+1}_micro_chart",
+            )
+            return await self.micro_analysis_team.pulse_detector.detect(
+                price_data=price_data, chart=chart
+            )
+
+        self.scheduler.prefetch(key, job)
 
     def get_micro_data_for_day(self, macro_tick) -> pd.DataFrame:
         """
@@ -266,26 +492,43 @@ class TradingSystem:
                 day or period.
 
         Returns:
-            pd.DataFrame: Micro timeframe data for the specified period.
+            pd.DataFrame: Micro timeframe data for the specified period, as a
+                zero-copy row slice of ``self.df_micro`` (bucketed once in
+                ``__init__``).
+        """
+        day_start = pd.to_datetime(macro_tick["datetime"])
+        bounds = self._micro_buckets.get(day_start)
+        if bounds is None:
+            # df_macro에 없는 시각이면 그 자리에서 경계를 찾음
+            lows, highs = self._micro_bounds(pd.DatetimeIndex([day_start]))
+            bounds = (int(lows[0]), int(highs[0]))
+        return self.df_micro.iloc[bounds[0] : bounds[1]]
+
+    def _micro_bounds(
+        self, day_starts: pd.DatetimeIndex
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        매크로 구간 [day_start, day_end) 마다 속한 분봉의 위치 범위 [lo, hi)
+        - day_end는 macro_tick에 따라 다음 달 첫날 또는 day_start + N일
         """
         days = {
             "week1": 7,
             "day1": 1,
         }
 
-        day_start = pd.to_datetime(macro_tick["datetime"])
-
         if self.macro_tick == "month1":
             # Move to the first day of next month, then use it as exclusive upper bound
-            day_end = (day_start + MonthEnd(1)) + pd.Timedelta(days=1)
+            day_ends = (day_starts + MonthEnd(1)) + pd.Timedelta(days=1)
         else:
-            day_end = day_start + pd.Timedelta(days=days[self.macro_tick])
+            day_ends = day_starts + pd.Timedelta(days=days[self.macro_tick])
 
-        micro_slice = self.df_micro[
-            (pd.to_datetime(self.df_micro["datetime"]) >= day_start)
-            & (pd.to_datetime(self.df_micro["datetime"]) < day_end)
-        ]
-        return micro_slice
+        lows = np.searchsorted(
+            self._micro_datetimes, day_starts.to_numpy("datetime64[ns]"), side="left"
+        )
+        highs = np.searchsorted(
+            self._micro_datetimes, day_ends.to_numpy("datetime64[ns]"), side="left"
+        )
+        return lows, highs
 
 
 class AsyncTradingSystem(TradingSystem):
@@ -298,6 +541,14 @@ class AsyncTradingSystem(TradingSystem):
         macro_tick: str,
         micro_tick: str,
         system_mode: str = "full",  # macro, micro, full
+        use_feature_store: bool = False,
+        use_chart_cache: bool = True,
+        agent_concurrency: int = 1,
+        run_id: str | None = None,
+        record_format: str = "csv",
+        resume: bool = False,
+        checkpoint_every: int = 1,
+        checkpoint_interval: float = 60.0,
     ):
         super().__init__(
             trend=trend,
@@ -307,10 +558,25 @@ class AsyncTradingSystem(TradingSystem):
             macro_tick=macro_tick,
             micro_tick=micro_tick,
             system_mode=system_mode,
+            use_feature_store=use_feature_store,
+            use_chart_cache=use_chart_cache,
+            agent_concurrency=agent_concurrency,
+            run_id=run_id,
+            record_format=record_format,
+            resume=resume,
+            checkpoint_every=checkpoint_every,
+            checkpoint_interval=checkpoint_interval,
         )
 
     def run(self) -> dict:
-        return asyncio.run(super().run())
+        return asyncio.run(self._run_and_close())
+
+    async def _run_and_close(self) -> dict:
+        try:
+            return await super().run()
+        finally:
+            # 이 이벤트 루프에서 연 모델 클라이언트 연결 풀을 루프가 끝나기 전에 닫음
+            await get_model_client_registry().aclose()
 
 
 def create_system(
@@ -321,6 +587,14 @@ def create_system(
     macro_tick: str,
     micro_tick: str,
     system_mode: str = "full",  # macro, micro, full
+    use_feature_store: bool = False,
+    use_chart_cache: bool = True,
+    agent_concurrency: int = 1,
+    run_id: str | None = None,
+    record_format: str = "csv",
+    resume: bool = False,
+    checkpoint_every: int = 1,
+    checkpoint_interval: float = 60.0,
 ):
     import warnings
 
@@ -336,4 +610,12 @@ def create_system(
         macro_tick=macro_tick,
         micro_tick=micro_tick,
         system_mode=system_mode,
+        use_feature_store=use_feature_store,
+        use_chart_cache=use_chart_cache,
+        agent_concurrency=agent_concurrency,
+        run_id=run_id,
+        record_format=record_format,
+        resume=resume,
+        checkpoint_every=checkpoint_every,
+        checkpoint_interval=checkpoint_interval,
     )
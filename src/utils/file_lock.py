@@ -0,0 +1,23 @@
+import contextlib
+import fcntl
+import os
+from typing import Iterator
+
+
+@contextlib.contextmanager
+def file_lock(path: str, shared: bool = False) -> Iterator[None]:
+    """
+    f"{path}.lock" 파일에 flock을 걸어 여러 프로세스의 접근을 직렬화
+    - shared=True면 공유 잠금 (읽기끼리는 동시에, 쓰기와는 배타적)
+    - 한 프로세스 안에서도 열 때마다 잠금이 따로라서 같은 경로를 중첩해 잠그면 멈춤
+    """
+    lock_path = f"{path}.lock"
+    directory = os.path.dirname(lock_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(lock_path, "a+b") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -1,13 +1,101 @@
+import base64
 import io
-from typing import Any
+import os
+from typing import Any, Optional
 
+import numpy as np
 import PIL
 from autogen_core import Image
 
 
-def get_agentic_image(fig: Any) -> Image:
-    img_buffer = io.BytesIO()
-    fig.savefig(img_buffer, format="png")
-    img_buffer.seek(0)
-    pil_image = PIL.Image.open(img_buffer)
-    return Image(pil_image)
+class ChartImage:
+    """
+    - 렌더링된 차트를 한 번만 래스터화한 불변 이미지
+    - RGBA 버퍼를 보관하고 PNG 바이트는 처음 필요할 때 한 번만 인코딩
+    - 캐시에서 읽은 경우 PNG 바이트만 보관하고 RGBA는 필요할 때 디코딩
+    - 디스크 저장(save)과 에이전트 입력(get_agentic_image)이 같은 PNG를 공유
+    """
+
+    def __init__(
+        self, rgba: Optional[np.ndarray] = None, png: Optional[bytes] = None
+    ):
+        if rgba is None and png is None:
+            raise ValueError("[ChartImage] rgba 또는 png 중 하나가 필요합니다.")
+        if rgba is not None:
+            rgba = np.array(rgba, dtype=np.uint8, copy=True)
+            rgba.setflags(write=False)
+        self._rgba = rgba
+        self._png = png
+        self._base64: Optional[str] = None
+
+    @classmethod
+    def from_figure(cls, fig: Any) -> "ChartImage":
+        """이미 draw()된 Agg Figure의 캔버스 버퍼를 복사"""
+        return cls(rgba=np.asarray(fig.canvas.buffer_rgba()))
+
+    @classmethod
+    def from_png(cls, png: bytes) -> "ChartImage":
+        return cls(png=png)
+
+    @property
+    def rgba(self) -> np.ndarray:
+        if self._rgba is None:
+            pil_image = PIL.Image.open(io.BytesIO(self._png)).convert("RGBA")
+            rgba = np.asarray(pil_image)
+            rgba.setflags(write=False)
+            self._rgba = rgba
+        return self._rgba
+
+    @property
+    def size(self) -> tuple:
+        height, width = self.rgba.shape[:2]
+        return width, height
+
+    def to_pil(self) -> PIL.Image.Image:
+        return PIL.Image.fromarray(self.rgba, mode="RGBA").convert("RGB")
+
+    @property
+    def png(self) -> bytes:
+        if self._png is None:
+            buffer = io.BytesIO()
+            self.to_pil().save(buffer, format="PNG")
+            self._png = buffer.getvalue()
+        return self._png
+
+    def to_base64(self) -> str:
+        if self._base64 is None:
+            self._base64 = base64.b64encode(self.png).decode("utf-8")
+        return self._base64
+
+    def save(self, path: str) -> str:
+        """
+        PNG 바이트를 그대로 파일로 기록
+        - 확장자가 없으면 matplotlib savefig와 같이 .png를 붙임
+        """
+        if not os.path.splitext(path)[1]:
+            path = f"{path}.png"
+        with open(path, "wb") as f:
+            f.write(self.png)
+        return path
+
+
+class AgenticChartImage(Image):
+    """ChartImage의 PNG 인코딩 결과를 재사용하는 autogen Image"""
+
+    def __init__(self, chart: ChartImage):
+        self.chart = chart
+        self._image: Optional[PIL.Image.Image] = None
+
+    @property
+    def image(self) -> PIL.Image.Image:
+        # 모델 클라이언트가 크기 계산 등에 접근할 때만 PIL 이미지 생성
+        if self._image is None:
+            self._image = self.chart.to_pil()
+        return self._image
+
+    def to_base64(self) -> str:
+        return self.chart.to_base64()
+
+
+def get_agentic_image(chart: ChartImage) -> Image:
+    return AgenticChartImage(chart)
@@ -0,0 +1,62 @@
+import glob
+import os
+from typing import Any, List
+
+import pytest
+
+from src.dataset_registry import get_dataset_registry
+from tests.ollama_stub import StubEndpoint
+from tests.trading_stub import StubTeam, write_market_data
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def endpoints():
+    """endpoints(*delays): 지연이 delays인 스텁 Ollama 엔드포인트들 (테스트 뒤 종료)"""
+    created: List[StubEndpoint] = []
+
+    def make(*delays: float) -> List[StubEndpoint]:
+        created.extend(StubEndpoint(delay) for delay in delays)
+        return created[-len(delays) :]
+
+    yield make
+    for endpoint in created:
+        endpoint.close()
+
+
+@pytest.fixture
+def trading_system(tmp_path, monkeypatch):
+    """
+    trading_system(**kwargs): 합성 시간봉/일봉과 StubTeam 에이전트로 만든 TradingSystem
+    - tmp_path에서 실행 (캔들/차트/체크포인트는 tmp_path/data 아래)
+    - 기록 파일은 패키지 data/ 아래에 run_id별로 남으므로 테스트 뒤 지움
+    """
+    import src.trading_system
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(src.trading_system, "MacroAnalysisTeam", StubTeam)
+    monkeypatch.setattr(src.trading_system, "MicroAnalysisTeam", StubTeam)
+    write_market_data("data", "eth", "2024-01-01 09:00:00", days=4)
+    registry = get_dataset_registry()
+    registry.clear()
+    run_id = f"pytest_{tmp_path.name}"
+
+    def make(**kwargs: Any) -> src.trading_system.TradingSystem:
+        config = {
+            "trend": "bull",
+            "start_date": "2024-01-01 09:00:00",
+            "end_date": "2024-01-05 09:00:00",
+            "coin": "eth",
+            "macro_tick": "day1",
+            "micro_tick": "hour1",
+            "run_id": run_id,
+            **kwargs,
+        }
+        return src.trading_system.TradingSystem(**config)
+
+    yield make
+    registry.clear()
+    records = os.path.join(PACKAGE_DIR, "data", "*", "bull", "*")
+    for path in glob.glob(os.path.join(records, f"eth_bull_{run_id}.*")):
+        os.remove(path)
@@ -0,0 +1,65 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List
+
+
+class StubEndpoint:
+    """
+    Ollama /api/chat 스텁 엔드포인트
+    - delay초 뒤 응답 (테스트 중에 바꿀 수 있음)
+    - 응답을 쓰기 전에 클라이언트가 연결을 끊으면 aborted로 셈 (취소된 hedging 요청)
+    - ports: 요청을 보낸 클라이언트 포트 (keep-alive 연결 재사용 확인용)
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.requests = 0
+        self.aborted = 0
+        self.ports: List[int] = []
+        self._lock = threading.Lock()
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with endpoint._lock:
+                    endpoint.requests += 1
+                    endpoint.ports.append(self.client_address[1])
+                time.sleep(endpoint.delay)
+                out = json.dumps(
+                    {
+                        "model": body["model"],
+                        "created_at": "2024-01-01T00:00:00Z",
+                        "message": {"role": "assistant", "content": "ok"},
+                        "done": True,
+                        "done_reason": "stop",
+                        "prompt_eval_count": 1,
+                        "eval_count": 1,
+                    }
+                ).encode()
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(out)))
+                    self.end_headers()
+                    self.wfile.write(out)
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    with endpoint._lock:
+                        endpoint.aborted += 1
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.host = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
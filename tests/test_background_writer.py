@@ -0,0 +1,24 @@
+import asyncio
+import threading
+
+from src.background_writer import BackgroundWriter
+
+
+def test_asubmit_waits_for_room_without_blocking_loop():
+    writer = BackgroundWriter(max_pending=1)
+    release = threading.Event()
+    done = []
+
+    async def main():
+        # 첫 작업이 멈춰 있는 동안 큐(1칸)가 차서 이후 예약은 자리를 기다림
+        await writer.asubmit(release.wait)
+        submits = asyncio.gather(*(writer.asubmit(done.append, i) for i in range(3)))
+        # 예약이 기다리는 동안에도 이벤트 루프는 다른 작업을 진행
+        await asyncio.sleep(0.1)
+        assert not submits.done()
+        release.set()
+        await submits
+        await writer.aclose()
+
+    asyncio.run(main())
+    assert sorted(done) == [0, 1, 2]
@@ -0,0 +1,32 @@
+import asyncio
+import threading
+
+import numpy as np
+
+from src.chart_cache import ChartCache
+from src.utils.image_utils import ChartImage
+
+
+def test_aget_reads_disk_entries_off_the_loop(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "chart_cache")
+    chart = ChartImage(rgba=np.zeros((4, 4, 4), dtype=np.uint8))
+    ChartCache(cache_dir).put("ab" * 20, chart)
+
+    reads = []
+    open_file = open
+
+    def recording_open(*args, **kwargs):
+        reads.append(threading.current_thread() is threading.main_thread())
+        return open_file(*args, **kwargs)
+
+    # 새 인스턴스는 메모리가 비어 있어 디스크에서 읽음
+    cache = ChartCache(cache_dir)
+    monkeypatch.setattr("builtins.open", recording_open)
+    found = asyncio.run(cache.aget("ab" * 20))
+    missing = asyncio.run(cache.aget("cd" * 20))
+    monkeypatch.undo()
+
+    assert found.png == chart.png
+    assert missing is None
+    assert reads == [False, False]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
@@ -0,0 +1,46 @@
+import asyncio
+
+import httpx
+from autogen_core.models import UserMessage
+
+from src.agents.client_pool import get_model_client_registry
+from src.agents.model_client import DEFAULT_MODEL, MODEL_INFO, create_model_client
+
+MESSAGES = [UserMessage(content="ping", source="user")]
+
+
+def test_agents_share_pooled_transport(endpoints, monkeypatch):
+    (stub,) = endpoints(0.0)
+    monkeypatch.setenv("OLLAMA_HOST", stub.host)
+    monkeypatch.delenv("OLLAMA_HOSTS", raising=False)
+    monkeypatch.setenv("LLM_CACHE_MODE", "off")
+    monkeypatch.setenv("LLM_MAX_CONNECTIONS", "3")
+    registry = get_model_client_registry()
+    registry.clear()
+
+    async def main():
+        first = create_model_client("first_agent")
+        second = create_model_client("second_agent")
+        for _ in range(3):
+            for client in (first, second):
+                result = await client.create(MESSAGES)
+                assert result.content == "ok"
+        pooled = registry.get(DEFAULT_MODEL, MODEL_INFO["gemma3"], host=stub.host)
+        transport = pooled.client._client._client
+        try:
+            return transport, pooled.client
+        finally:
+            await registry.aclose()
+
+    try:
+        transport, ollama_client = asyncio.run(main())
+    finally:
+        registry.clear()
+
+    # 두 에이전트의 호출이 레지스트리가 만든 httpx 풀 하나로 나감
+    assert isinstance(transport, httpx.AsyncClient)
+    assert transport._transport._pool._max_connections == 3
+    assert ollama_client.actual_usage().prompt_tokens == 6
+    # keep-alive 연결 하나를 계속 재사용
+    assert stub.requests == 6
+    assert len(set(stub.ports)) == 1
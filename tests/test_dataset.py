@@ -0,0 +1,78 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.dataset import OHLCVDataset
+
+
+def _write_csv(data_dir: str, rows: int, seed: int = 0) -> pd.DataFrame:
+    """시간순이 아닌 합성 OHLCV CSV (data_dir/eth_minute1.csv)"""
+    rng = np.random.default_rng(seed)
+    close = 1000.0 + np.cumsum(rng.normal(0.0, 1.0, rows))
+    df = pd.DataFrame(
+        {
+            "datetime": pd.date_range("2022-01-01", periods=rows, freq="min"),
+            "open": close,
+            "high": close + 1.0,
+            "low": close - 1.0,
+            "close": close,
+            "volume": rng.uniform(1.0, 10.0, rows),
+        }
+    )
+    df = df.iloc[rng.permutation(rows)]
+    df.to_csv(os.path.join(data_dir, "eth_minute1.csv"), index=False)
+    return df
+
+
+def _open_and_sum(args) -> float:
+    data_dir, cache_dir = args
+    dataset = OHLCVDataset.open("eth", "minute1", data_dir, cache_dir)
+    return float(np.sum(dataset.select()["close"]))
+
+
+def test_concurrent_open_converts_once(tmp_path):
+    data_dir, cache_dir = str(tmp_path), str(tmp_path / "columnar")
+    df = _write_csv(data_dir, 200_000)
+
+    with multiprocessing.get_context("spawn").Pool(8) as pool:
+        sums = pool.map(_open_and_sum, [(data_dir, cache_dir)] * 16)
+
+    assert sums == pytest.approx([df["close"].sum()] * 16)
+    # 임시/이전 변환본이 남지 않음
+    assert sorted(os.listdir(cache_dir)) == ["eth_minute1", "eth_minute1.lock"]
+
+
+def test_reconvert_keeps_open_memmaps_readable(tmp_path):
+    data_dir, cache_dir = str(tmp_path), str(tmp_path / "columnar")
+    _write_csv(data_dir, 1_000)
+    first = OHLCVDataset.open("eth", "minute1", data_dir, cache_dir)
+    before = np.array(first.select()["close"])
+
+    # 원본이 바뀌면 다시 변환되고, 먼저 연 변환본은 그대로 읽힘
+    df = _write_csv(data_dir, 1_200, seed=1)
+    os.utime(os.path.join(data_dir, "eth_minute1.csv"), (0, 0))
+    second = OHLCVDataset.open("eth", "minute1", data_dir, cache_dir)
+
+    assert len(second) == 1_200
+    assert float(np.sum(second.select()["close"])) == pytest.approx(df["close"].sum())
+    np.testing.assert_array_equal(first.select()["close"], before)
+
+
+def test_to_frame_index_is_csv_row_number(tmp_path):
+    data_dir, cache_dir = str(tmp_path), str(tmp_path / "columnar")
+    _write_csv(data_dir, 500)
+    csv = pd.read_csv(os.path.join(data_dir, "eth_minute1.csv"))
+    dataset = OHLCVDataset.open("eth", "minute1", data_dir, cache_dir)
+
+    frame = dataset.to_frame("2022-01-01 01:00:00", "2022-01-01 03:00:00")
+    assert frame["datetime"].is_monotonic_increasing
+    assert len(frame) == 120
+    # 정렬된 행마다 원본 CSV의 같은 행을 가리킴
+    expected = csv.loc[frame.index]
+    np.testing.assert_array_equal(frame["close"], expected["close"])
+    np.testing.assert_array_equal(
+        pd.to_datetime(expected["datetime"]).values, frame["datetime"].values
+    )
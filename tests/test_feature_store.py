@@ -0,0 +1,33 @@
+import json
+import multiprocessing
+import os
+
+import numpy as np
+
+from src.dataset import OHLCVDataset
+from src.feature_store import FeatureStore
+from tests.test_dataset import _write_csv
+
+
+def _load_or_build(_) -> float:
+    feature_store = FeatureStore.load_or_build("eth", "minute1", "micro", "2022-01-01")
+    return float(np.nansum(feature_store.store.column("close")))
+
+
+def test_concurrent_load_or_build_keeps_array_and_meta_in_step(tmp_path, monkeypatch):
+    # 기본 경로(data/, data/features)를 tmp_path 아래로 (spawn 워커도 같은 cwd)
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data")
+    _write_csv("data", 5_000)
+
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        sums = pool.map(_load_or_build, range(8))
+    assert len(set(sums)) == 1
+
+    # 임시 파일이 남지 않고, meta의 원본 정보가 지금 CSV와 같음
+    names = sorted(os.listdir("data/features"))
+    assert [os.path.splitext(name)[1] for name in names] == [".json", ".npy", ".lock"]
+    with open(os.path.join("data/features", names[0]), encoding="utf-8") as f:
+        meta = json.load(f)
+    assert meta["source"] == OHLCVDataset.open("eth", "minute1").source
+    assert _load_or_build(None) == sums[0]
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.indicator_engine import INDICATOR_PARAMS, verify_talib_parity
+
+
+def _ohlcv(close: np.ndarray, seed: int = 0) -> pd.DataFrame:
+    """종가 시리즈로 고가/저가/거래량을 만든 고정 합성 OHLCV"""
+    rng = np.random.default_rng(seed)
+    spread = np.abs(close) * rng.uniform(0.0, 0.02, len(close))
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.uniform(1.0, 1000.0, len(close)),
+        }
+    )
+
+
+def _random_walk(n: int, start: float, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return start * np.exp(np.cumsum(rng.normal(0.0, 0.02, n)))
+
+
+SERIES = {
+    "random_walk": _ohlcv(_random_walk(300, 100.0)),
+    "flat": _ohlcv(np.full(120, 2500.0), seed=1).assign(
+        high=2500.0, low=2500.0
+    ),
+    # 가장 긴 워밍업(SMA20/MACD 등)보다 짧은 구간
+    "short": _ohlcv(_random_walk(15, 100.0, seed=2), seed=2),
+    # KRW BTC 가격대
+    "large_magnitude": _ohlcv(_random_walk(300, 80_000_000.0, seed=3), seed=3),
+}
+
+
+@pytest.mark.parametrize("timeframe", sorted(INDICATOR_PARAMS))
+@pytest.mark.parametrize("name", sorted(SERIES))
+def test_streaming_engine_matches_talib(name: str, timeframe: str):
+    # NaN 구간이 다르거나 허용 오차를 넘으면 ValueError
+    max_errors = verify_talib_parity(SERIES[name], timeframe)
+    assert max_errors
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+
+from autogen_core.models import UserMessage
+
+from src.agents.client_pool import get_model_client_registry
+from src.agents.llm_cache import LLMResponseCache
+from src.agents.model_client import create_model_client
+
+MESSAGES = [UserMessage(content="ping", source="user")]
+
+
+def test_replays_recorded_response_off_the_loop(endpoints, monkeypatch, tmp_path):
+    (stub,) = endpoints(0.0)
+    monkeypatch.setenv("OLLAMA_HOST", stub.host)
+    monkeypatch.delenv("OLLAMA_HOSTS", raising=False)
+    monkeypatch.setenv("LLM_CACHE_DIR", str(tmp_path))
+    registry = get_model_client_registry()
+    registry.clear()
+
+    lookups = []
+    get = LLMResponseCache.get
+
+    def recording_get(self, agent_name, key):
+        lookups.append(threading.current_thread() is threading.main_thread())
+        return get(self, agent_name, key)
+
+    monkeypatch.setattr(LLMResponseCache, "get", recording_get)
+
+    async def main():
+        try:
+            monkeypatch.setenv("LLM_CACHE_MODE", "record_missing")
+            recorded = await create_model_client("agent").create(MESSAGES)
+            monkeypatch.setenv("LLM_CACHE_MODE", "replay")
+            replayed = await create_model_client("agent").create(MESSAGES)
+            stream = create_model_client("agent").create_stream(MESSAGES)
+            streamed = [chunk async for chunk in stream]
+            return recorded, replayed, streamed
+        finally:
+            await registry.aclose()
+
+    try:
+        recorded, replayed, streamed = asyncio.run(main())
+    finally:
+        registry.clear()
+
+    assert stub.requests == 1
+    assert not recorded.cached
+    assert replayed.cached and replayed.content == recorded.content
+    assert len(streamed) == 1 and streamed[0].content == recorded.content
+    # 캐시 파일 조회는 모두 이벤트 루프(메인 스레드) 밖에서
+    assert lookups == [False, False, False]
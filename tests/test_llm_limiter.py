@@ -0,0 +1,82 @@
+import asyncio
+import multiprocessing
+import threading
+
+import pytest
+
+from src.agents.llm_limiter import LLMConcurrencyLimiter
+
+SEMAPHORES = {
+    "asyncio": lambda n: asyncio.Semaphore(n),
+    "threading": lambda n: threading.BoundedSemaphore(n),
+    "multiprocessing": lambda n: multiprocessing.get_context().BoundedSemaphore(n),
+}
+
+
+@pytest.mark.parametrize("kind", sorted(SEMAPHORES))
+def test_limits_concurrent_holders(kind):
+    async def main():
+        limiter = LLMConcurrencyLimiter(SEMAPHORES[kind](2))
+        active = peak = 0
+
+        async def call():
+            nonlocal active, peak
+            async with limiter:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.02)
+                active -= 1
+
+        await asyncio.gather(*(call() for _ in range(8)))
+        return peak
+
+    assert asyncio.run(main()) == 2
+
+
+@pytest.mark.parametrize("kind", ["threading", "multiprocessing"])
+def test_waiter_wakes_on_release_without_polling(kind):
+    semaphore = SEMAPHORES[kind](1)
+    acquires = 0
+    original = semaphore.acquire
+
+    class Counting:
+        def acquire(self, *args, **kwargs):
+            nonlocal acquires
+            acquires += 1
+            return original(*args, **kwargs)
+
+        def release(self):
+            semaphore.release()
+
+    async def main():
+        limiter = LLMConcurrencyLimiter(Counting())
+        async with limiter:
+            waiter = asyncio.ensure_future(limiter.__aenter__())
+            await asyncio.sleep(0.2)
+            assert not waiter.done()
+        await asyncio.wait_for(waiter, timeout=1.0)
+        await limiter.__aexit__(None, None, None)
+
+    asyncio.run(main())
+    # 처음 획득 1번 + 대기자의 non-blocking 시도 1번 + executor의 blocking 획득 1번
+    assert acquires == 3
+
+
+def test_cancelled_waiter_returns_permit():
+    semaphore = threading.BoundedSemaphore(1)
+
+    async def main():
+        limiter = LLMConcurrencyLimiter(semaphore)
+        async with limiter:
+            waiter = asyncio.ensure_future(limiter.__aenter__())
+            await asyncio.sleep(0.05)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        # executor 스레드가 얻은 한도가 반납될 때까지 기다림
+        await asyncio.wait_for(limiter.__aenter__(), timeout=1.0)
+        await limiter.__aexit__(None, None, None)
+
+    asyncio.run(main())
+    assert semaphore.acquire(False)
+    semaphore.release()
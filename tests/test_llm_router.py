@@ -0,0 +1,147 @@
+import asyncio
+import gc
+import time
+import weakref
+from typing import Any, Dict, List
+
+from autogen_core import CancellationToken
+from autogen_core.models import UserMessage
+
+from src.agents import llm_router
+from src.agents.client_pool import ModelClientRegistry
+from src.agents.model_client import MODEL_INFO
+from tests.ollama_stub import StubEndpoint
+
+MODEL = "gemma3:12b"
+MESSAGES = [UserMessage(content="ping", source="user")]
+
+
+def _run(endpoints: List[StubEndpoint], scenario: Any, **options: Any) -> Dict:
+    async def main() -> Dict:
+        registry = ModelClientRegistry()
+        router = registry.router(
+            MODEL,
+            [endpoint.host for endpoint in endpoints],
+            model_info=MODEL_INFO["gemma3"],
+            **options,
+        )
+        try:
+            result = await scenario(router)
+            # 취소된 시도가 정리될 때까지 기다림
+            for _ in range(100):
+                if not any(router.outstanding):
+                    break
+                await asyncio.sleep(0.01)
+            return {"result": result, "outstanding": list(router.outstanding)}
+        finally:
+            await registry.aclose()
+
+    return asyncio.run(main())
+
+
+def test_routes_concurrent_calls_by_outstanding_count(endpoints):
+    stubs = endpoints(0.2, 0.2, 0.2)
+
+    async def scenario(router):
+        return await asyncio.gather(*(router.create(MESSAGES) for _ in range(6)))
+
+    run = _run(stubs, scenario, hedge_percentile=None)
+    assert all(result.content == "ok" for result in run["result"])
+    assert [stub.requests for stub in stubs] == [2, 2, 2]
+    assert run["outstanding"] == [0, 0, 0]
+
+
+def test_sequential_calls_prefer_fast_endpoint(endpoints):
+    fast, slow = endpoints(0.05, 1.5)
+
+    async def scenario(router):
+        for _ in range(10):
+            await router.create(MESSAGES)
+        return router.hedges
+
+    run = _run([fast, slow], scenario, hedge_percentile=0.95, min_samples=5)
+    # 처음 한 번씩 시도한 뒤로는 예상 지연이 짧은 엔드포인트만 씀
+    assert slow.requests <= 1
+    assert fast.requests >= 9
+    assert run["outstanding"] == [0, 0]
+
+
+def test_hedges_slow_primary_and_cancels_loser(endpoints):
+    stubs = endpoints(0.05, 0.05)
+
+    async def scenario(router):
+        for _ in range(12):
+            await router.create(MESSAGES)
+        assert router.hedges == 0
+        # 두 엔드포인트 모두 빠르게 보인 뒤 주로 쓰던 쪽이 느려짐
+        primary = max(range(2), key=lambda i: stubs[i].requests)
+        stubs[primary].delay = 1.5
+        start = time.perf_counter()
+        result = await router.create(MESSAGES)
+        elapsed = time.perf_counter() - start
+        # 진 요청의 지연이 반영되어 다음 호출은 빠른 엔드포인트로 감
+        before = stubs[1 - primary].requests
+        await router.create(MESSAGES)
+        return {
+            "content": result.content,
+            "elapsed": elapsed,
+            "hedges": router.hedges,
+            "primary": primary,
+            "moved": stubs[1 - primary].requests - before,
+        }
+
+    run = _run(stubs, scenario, hedge_percentile=0.95, min_samples=3)
+    result = run["result"]
+    assert result["content"] == "ok"
+    assert result["hedges"] == 1
+    assert result["elapsed"] < 1.0
+    assert result["moved"] == 1
+    assert run["outstanding"] == [0, 0]
+    # 서버가 응답을 쓰려 할 때 연결이 이미 끊겨 있음
+    deadline = time.monotonic() + 3.0
+    while stubs[result["primary"]].aborted == 0 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert stubs[result["primary"]].aborted == 1
+
+
+def test_fails_over_when_first_attempt_errors(endpoints):
+    dead, live = endpoints(0.0, 0.0)
+    dead.close()
+
+    async def scenario(router):
+        results = [await router.create(MESSAGES) for _ in range(4)]
+        return {
+            "contents": [result.content for result in results],
+            "failovers": router.failovers,
+        }
+
+    # hedging 없이도 연결이 거부된 시도는 다른 엔드포인트로 넘어감
+    run = _run([dead, live], scenario, hedge_percentile=None)
+    assert run["result"]["contents"] == ["ok"] * 4
+    assert run["result"]["failovers"] >= 1
+    assert live.requests == 4
+    assert run["outstanding"] == [0, 0]
+
+
+def test_caller_token_does_not_keep_calls_alive(endpoints, monkeypatch):
+    stubs = endpoints(0.0, 0.0)
+    created = []
+
+    class TrackedToken(CancellationToken):
+        def __init__(self):
+            super().__init__()
+            created.append(weakref.ref(self))
+
+    monkeypatch.setattr(llm_router, "CancellationToken", TrackedToken)
+    caller_token = CancellationToken()
+
+    async def scenario(router):
+        for _ in range(5):
+            await router.create(MESSAGES, cancellation_token=caller_token)
+
+    _run(stubs, scenario, hedge_percentile=None)
+    gc.collect()
+    # 호출이 끝나면 호출마다 만든 토큰(과 거기 묶인 시도)은 해제됨
+    assert len(created) == 10
+    assert all(ref() is None for ref in created)
+    caller_token.cancel()
@@ -0,0 +1,98 @@
+from typing import Any, Iterator, List, Literal
+
+import pytest
+from pydantic import BaseModel, Field
+
+from src.agents.macro.investment_rate_adjuster import InvestmentRateAdjusterResponse
+from src.agents.macro.trend_analyzer import TrendAnalyzerResponse
+from src.agents.micro.order_tactician import OrderTacticianResponse
+from src.agents.micro.pulse_detector import PulseDetectorResponse
+from src.agents.output_schema import StructuredOutputSchema, StructuredResponse
+
+
+class Inner(BaseModel):
+    label: Literal["a", "b"]
+    fraction: float = Field(ge=0.0, le=1.0)
+    note: str = ""
+
+
+class Outer(StructuredResponse):
+    thoughts: str
+    inner: Inner
+    history: List[Inner] = []
+
+
+MODELS = [
+    Outer,
+    TrendAnalyzerResponse,
+    InvestmentRateAdjusterResponse,
+    PulseDetectorResponse,
+    OrderTacticianResponse,
+]
+
+
+def _walk(node: Any) -> Iterator[Any]:
+    yield node
+    if isinstance(node, dict):
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk(value)
+
+
+@pytest.fixture(autouse=True)
+def strict_mode(monkeypatch):
+    monkeypatch.setenv("LLM_OUTPUT_SCHEMA", "strict")
+
+
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: model.__name__)
+def test_no_refs_remain(model):
+    schema = model.model_json_schema()
+    for node in _walk(schema):
+        if isinstance(node, dict):
+            assert "$ref" not in node
+            assert "$defs" not in node
+
+
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: model.__name__)
+def test_objects_are_closed_and_fully_required(model):
+    schema = model.model_json_schema()
+    objects = [
+        node
+        for node in _walk(schema)
+        if isinstance(node, dict) and node.get("type") == "object"
+    ]
+    assert objects
+    for node in objects:
+        assert node["additionalProperties"] is False
+        assert sorted(node["required"]) == sorted(node["properties"])
+
+
+def test_field_bounds_and_literals_are_kept():
+    schema = Outer.model_json_schema()
+    inner = schema["properties"]["inner"]
+    assert inner["properties"]["fraction"]["minimum"] == 0.0
+    assert inner["properties"]["fraction"]["maximum"] == 1.0
+    assert inner["properties"]["label"]["enum"] == ["a", "b"]
+    # 기본값이 있는 필드도 required
+    assert "note" in inner["required"]
+    assert "history" in schema["required"]
+    assert schema["properties"]["history"]["items"] == inner
+
+
+def test_generator_is_usable_directly():
+    schema = Inner.model_json_schema(schema_generator=StructuredOutputSchema)
+    assert schema["additionalProperties"] is False
+    assert schema["required"] == ["label", "fraction", "note"]
+
+
+def test_plain_mode_uses_pydantic_default(monkeypatch):
+    monkeypatch.setenv("LLM_OUTPUT_SCHEMA", "plain")
+    assert "$defs" in Outer.model_json_schema()
+
+
+def test_unknown_mode_is_rejected(monkeypatch):
+    monkeypatch.setenv("LLM_OUTPUT_SCHEMA", "loose")
+    with pytest.raises(ValueError):
+        Outer.model_json_schema()
@@ -0,0 +1,22 @@
+import pytest
+
+from src.param_sweep import METRIC_KEYS, sweep
+from src.replay_engine import replay_records
+from tests.test_replay_engine import make_run, run_portfolio_manager
+
+
+@pytest.mark.parametrize("max_workers", [0, 1])
+def test_single_cell_sweep_matches_replay_and_portfolio_manager(max_workers):
+    prices, records = make_run()
+    final_price = float(prices["close"].iloc[-1])
+
+    # 0: 현재 프로세스에서 평가, 1: 워커 프로세스가 공유 메모리 가격에 붙어 평가
+    table = sweep({"run": records}, prices, final_price, max_workers=max_workers)
+    replayed = replay_records(records, prices, final_price)
+    expected = run_portfolio_manager(prices, records, final_price)
+
+    assert len(table) == 1
+    row = table.iloc[0]
+    for key in METRIC_KEYS:
+        assert row[key] == float(replayed[key]) == expected[key], key
+    assert row["final_value"] == float(replayed["equity"][-1])
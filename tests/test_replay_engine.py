@@ -0,0 +1,81 @@
+import asyncio
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.portfoilo_manager import PortfolioManager
+from src.replay_engine import replay_records
+from src.trade_executor import TradeExecutor
+
+METRICS = ["return", "mdd", "sharpe", "sortino", "calmar", "volatility"]
+
+
+def make_run(bars: int = 96, seed: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    합성 15분봉과 trade 기록 (datetime/order/amount)
+    - 매크로 봉마다 첫 마이크로 봉처럼 주문이 없는 기록(NaN)을 섞음
+    """
+    rng = np.random.default_rng(seed)
+    close = 2000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, bars)))
+    prices = pd.DataFrame(
+        {
+            "datetime": pd.date_range("2024-01-01", periods=bars, freq="15min"),
+            "open": np.r_[2000.0, close[:-1]],
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+        }
+    )
+    orders = rng.choice(["buy", "sell", "hold"], bars).astype(object)
+    orders[::8] = np.nan
+    records = pd.DataFrame(
+        {
+            "datetime": prices["datetime"],
+            "order": orders,
+            "amount": np.where(
+                pd.isna(orders), np.nan, rng.uniform(0.0, 0.5, bars).round(2)
+            ),
+        }
+    )
+    return prices, records
+
+
+def run_portfolio_manager(
+    prices: pd.DataFrame, records: pd.DataFrame, final_price: float
+) -> Dict[str, float]:
+    """TradingSystem의 틱 순서대로 PortfolioManager를 직접 구동"""
+
+    async def main() -> Dict[str, float]:
+        portfolio = PortfolioManager("eth", 10_000_000, interval_minutes=15)
+        executor = TradeExecutor()
+        with portfolio.activate():
+            for (_, bar), (_, record) in zip(prices.iterrows(), records.iterrows()):
+                price_data = bar.to_dict()
+                await portfolio.update_portfolio_ratio(price_data)
+                micro_report = None
+                if isinstance(record["order"], str):
+                    micro_report = {
+                        "order_report": {
+                            "order": record["order"],
+                            "amount": record["amount"],
+                        }
+                    }
+                await executor.execute(price_data, "eth", micro_report)
+            last = prices.iloc[-1].to_dict()
+            await portfolio.sell_all({**last, "close": final_price})
+        return portfolio.get_performance()
+
+    return asyncio.run(main())
+
+
+def test_replay_matches_portfolio_manager():
+    prices, records = make_run()
+    final_price = float(prices["close"].iloc[-1])
+
+    expected = run_portfolio_manager(prices, records, final_price)
+    result = replay_records(records, prices, final_price)
+
+    # 주문이 없는 봉의 시가 가치까지 같은 순서로 기록되어 비트 단위로 일치
+    for key in METRICS:
+        assert float(result[key]) == expected[key], key
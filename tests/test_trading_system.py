@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from src.replay_engine import load_records, replay_records
+
+METRICS = ["return", "mdd", "sharpe", "sortino", "calmar", "volatility"]
+
+
+@pytest.mark.parametrize("system_mode", ["full", "macro"])
+def test_trade_records_replay_to_live_performance(trading_system, system_mode):
+    system = trading_system(system_mode=system_mode)
+    performance = asyncio.run(system.run())
+
+    # 기록된 주문을 다시 실행하면 실행 중 PortfolioManager의 지표와 같음
+    records = load_records(system.trade_recode_manager.file_path)
+    prices = system.df_macro if system_mode == "macro" else system.df_micro
+    result = replay_records(
+        records,
+        prices,
+        float(system.df_macro["close"].iloc[-1]),
+        interval_minutes=system.portfolio_manager.interval_minutes,
+    )
+    for key in METRICS:
+        assert float(result[key]) == performance[key], key
+
+
+def _records(system):
+    return {
+        name: load_records(manager.file_path)
+        for name, manager in (
+            ("macro", system.macro_recode_manager),
+            ("micro", system.micro_recode_manager),
+            ("trade", system.trade_recode_manager),
+        )
+    }
+
+
+def test_resume_after_crash_matches_uninterrupted_run(trading_system):
+    reference = trading_system(checkpoint_interval=0)
+    expected = asyncio.run(reference.run())
+    expected_records = _records(reference)
+
+    # 세 번째 매크로 틱(일봉) 도중에 에이전트 호출이 실패
+    crashed = trading_system(checkpoint_interval=0)
+    tactician = crashed.micro_analysis_team.order_tactician
+    adjuster = crashed.macro_analysis_team.investment_rate_adjuster
+    decide, adjust = tactician.decide, adjuster.adjust_rate_limit
+    macro_reports = []
+    decisions = 0
+
+    async def failing_decide(**kwargs):
+        nonlocal decisions
+        decisions += 1
+        if decisions > 24 * 2 + 5:
+            raise RuntimeError("model endpoint went away")
+        return await decide(**kwargs)
+
+    async def recording_adjust(*args):
+        macro_reports.append(await adjust(*args))
+        return macro_reports[-1]
+
+    tactician.decide = failing_decide
+    adjuster.adjust_rate_limit = recording_adjust
+    with pytest.raises(RuntimeError, match="went away"):
+        asyncio.run(crashed.run())
+
+    resumed = trading_system(checkpoint_interval=0, resume=True)
+    # 마지막 체크포인트(두 번째 틱까지 끝난 시점)의 상태로 복원
+    assert resumed.start_tick == 2
+    assert resumed.last_macro_report == macro_reports[1]
+    performance = asyncio.run(resumed.run())
+
+    assert performance == expected
+    for name, records in _records(resumed).items():
+        assert records["datetime"].is_unique, name
+        assert records.equals(expected_records[name]), name
+    # 체크포인트 이전 틱은 다시 실행하지 않음
+    assert resumed.macro_analysis_team.calls < reference.macro_analysis_team.calls
@@ -0,0 +1,101 @@
+import os
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from src.portfoilo_manager import PortfolioManager
+
+
+def write_market_data(
+    data_dir: str, coin: str, start: str, days: int, seed: int = 0
+) -> None:
+    """
+    data_dir에 합성 시간봉/일봉 CSV ({coin}_hour1.csv, {coin}_day1.csv) 작성
+    - 일봉은 시간봉을 하루 단위로 묶은 값
+    """
+    rng = np.random.default_rng(seed)
+    hours = days * 24
+    close = 2_000_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, hours)))
+    hourly = pd.DataFrame(
+        {
+            "datetime": pd.date_range(start, periods=hours, freq="h"),
+            "open": np.r_[2_000_000.0, close[:-1]],
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": rng.uniform(1.0, 10.0, hours),
+        }
+    )
+    daily = hourly.groupby(np.arange(hours) // 24).agg(
+        datetime=("datetime", "first"),
+        open=("open", "first"),
+        high=("high", "max"),
+        low=("low", "min"),
+        close=("close", "last"),
+        volume=("volume", "sum"),
+    )
+    os.makedirs(data_dir, exist_ok=True)
+    hourly.to_csv(os.path.join(data_dir, f"{coin}_hour1.csv"), index=False)
+    daily.to_csv(os.path.join(data_dir, f"{coin}_day1.csv"), index=False)
+
+
+class _Agent:
+    def __init__(self, team: "StubTeam"):
+        self.team = team
+
+
+class _TrendAnalyzer(_Agent):
+    async def analyze(self, price_data: Dict, chart: Any) -> Dict:
+        self.team.calls += 1
+        up = price_data["close"] >= price_data["open"]
+        return {"trend": "상승장" if up else "하락장", "confidence": 0.7}
+
+
+class _RateAdjuster(_Agent):
+    async def adjust_rate_limit(self, trend_report: Dict, price_data: Dict) -> Dict:
+        self.team.calls += 1
+        rate_limit = 0.8 if trend_report["trend"] == "상승장" else 0.3
+        return {
+            "trend_report": trend_report,
+            "limit_report": {"rate_limit": rate_limit},
+        }
+
+
+class _PulseDetector(_Agent):
+    async def detect(self, price_data: Dict, chart: Any) -> Dict:
+        self.team.calls += 1
+        change = price_data["close"] / price_data["open"] - 1
+        return {"pulse": "up" if change >= 0 else "down", "strength": abs(change)}
+
+
+class _OrderTactician(_Agent):
+    async def decide(
+        self, macro_report: Dict | None, pulse_report: Dict | None
+    ) -> Dict:
+        """한도와 현재 코인 비율, 펄스 방향으로 정하는 결정적 주문"""
+        self.team.calls += 1
+        portfolio = PortfolioManager.get_instance()
+        coin_ratio = portfolio.get_portfolio_ratio()[portfolio.coin]
+        limit = macro_report["limit_report"]["rate_limit"] if macro_report else 1.0
+        if pulse_report is None or pulse_report["pulse"] == "up":
+            if coin_ratio < limit:
+                return {"order": "buy", "amount": round((limit - coin_ratio) / 2, 4)}
+        elif coin_ratio > 0:
+            return {"order": "sell", "amount": round(coin_ratio / 2, 4)}
+        return {"order": "hold", "amount": 0.0}
+
+
+class StubTeam:
+    """
+    MacroAnalysisTeam/MicroAnalysisTeam 대신 쓰는 결정적 에이전트 팀 (모델 호출 없음)
+    - 같은 가격/포트폴리오면 같은 보고서를 돌려주므로 재개한 실행과 비교 가능
+    - calls: 팀 전체의 에이전트 호출 수
+    """
+
+    def __init__(self, pool_size: int = 1):
+        self.calls = 0
+        self.trend_analyzer = _TrendAnalyzer(self)
+        self.investment_rate_adjuster = _RateAdjuster(self)
+        self.pulse_detector = _PulseDetector(self)
+        self.order_tactician = _OrderTactician(self)